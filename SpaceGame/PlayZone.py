@@ -1,17 +1,29 @@
 import datetime
+import math
+import os
 from typing import Optional, Tuple
 from dataclasses import dataclass
 
 import arcade
+import numpy as np
+import pymunk
 
-from SpaceGame.gametypes.PlayZoneTypes import Wall, SpaceObject, Background
+from SpaceGame.gametypes.PlayZoneTypes import Wall, BoundarySensor, CollisionTypes, SpaceObject, Background, BackgroundQuad, TiledBackground, sprite_dimensions
+from SpaceGame.gametypes.Bullet import BULLET_EDGE_MARGIN
 from SpaceGame.gametypes.SpaceStations import stations_small, stations_big
 
-from SpaceGame.gametypes.UFOs import DEFAULT_UFO_GEN_RANGES, UFO, UFOS, UFOGeneratorData
+from SpaceGame.gametypes.UFOs import DEFAULT_UFO_GEN_RANGES, UFO, UFO_DIFFICULTY, UFO_RES_DIR, UFO_SCALE, UFOS, UFOGeneratorData, UFOSquadron, random_name
 
 import random
 
-from SpaceGame.gametypes.enemies.Bug import Bug
+from SpaceGame.gametypes.enemies.Bug import BUG_DIFFICULTY, Bug, BugSteering
+from SpaceGame.gametypes.enemies.BugSwarm import BugSwarm
+from SpaceGame.shared.lod import LodScheduler
+from SpaceGame.shared.sight import LineOfSight
+from SpaceGame.shared.spawning import SPAWN_MAX_ATTEMPTS, SpawnDirector, SpawnPlacer
+
+import logging
+logger = logging.getLogger('space_game')
 
 
 @dataclass
@@ -60,8 +72,23 @@ class PlayZone:
         self.ufos: Optional[SpaceObject] = None
         self.play_zone_width_height = dimension
         self.dimensions = self.calculate_dimensions_pixels()
-        self.bg_sprite_list = []
+        self.background_layer = None
         self.walls = []
+        self.bullet_sensor = None
+        self.damaged = set()
+        self.sleep_timer = None
+        self.lod = LodScheduler(settings['LOD_NEAR_RADIUS'],
+                                settings['LOD_FAR_RADIUS'],
+                                settings['LOD_MID_INTERVAL'])
+        self.squadron = None
+        self.swarm = None
+        self.bug_steering = BugSteering()
+        self.director = None
+        self.director_timer = None
+        self.director_rng = None
+        # Kinds of enemy the director spawns
+        self.director_kinds = ()
+        self.sight = LineOfSight(self.space, settings['LOS_CACHE_TICKS'])
         self.seed = seed
         self._seed
 
@@ -84,13 +111,15 @@ class PlayZone:
         else:
             self._seed = seed
 
-    def seed_seed(self):
-        random.seed(self._seed)
-
     def setup_playzone_boundry(self):
         self.create_playzone_walls()
         self.add_walls_to_pymunk_space()
 
+    def setup_bullet_sensor(self):
+        self.bullet_sensor = BoundarySensor(self.width, self.height, BULLET_EDGE_MARGIN,
+                                            self.main.collision_type_id(CollisionTypes.BOUNDARY.value))
+        self.bullet_sensor.add_to_space(self.space)
+
     def setup_ufo(self):
         ufos = self.generator.generate_ufos()
         if ufos is not None:
@@ -101,8 +130,14 @@ class PlayZone:
               boundry=True,
               spacejunk=True,
               ufo=True,
-              bugs=True):
-        self.generator = SpaceJunkGenerator(self.main, self)
+              bugs=True,
+              keep_out=()):
+        """
+        ``keep_out`` are positions (the players' start positions) nothing is
+        generated within SPAWN_KEEP_OUT_RADIUS of.
+        """
+        self.placer = self.create_placer(keep_out)
+        self.generator = SpaceJunkGenerator(self.main, self, seed=self.seed, placer=self.placer)
 
         self.setup_spritelists()
         if background:
@@ -110,42 +145,91 @@ class PlayZone:
 
         if boundry:
             self.setup_playzone_boundry()
+        self.setup_bullet_sensor()
+
+        # The director spawns the enemies during the match instead
+        spawn_ufos = ufo and self.director is None
+        spawn_bugs = bugs and self.director is None
+
+        if spawn_bugs:
+            for position in self.bug_positions():
+                self.placer.reserve(position[0], position[1], BUG_SPAWN_RADIUS)
+            if self.swarm is not None:
+                self.placer.reserve(self.width / 2.0, self.height / 2.0, self.swarm_radius())
 
         if spacejunk:
             self.generate_spacejunk()
 
-        if ufo:
+        if spawn_ufos:
             self.setup_ufo()
 
-        if bugs:
+        if spawn_bugs:
             self.setup_bugs()
 
+        self.setup_sleeping()
+        self.setup_director(ufo, bugs)
+        self.placer.report()
+
+    def create_placer(self, keep_out=()) -> SpawnPlacer:
+        placer = SpawnPlacer((0.0, 0.0, self.width, self.height))
+        for x, y in keep_out:
+            placer.keep_out(x, y, self.settings['SPAWN_KEEP_OUT_RADIUS'])
+        return placer
+
+    def bug_positions(self):
+        return [((self.width / 2.0) + i * 5.0, (self.height / 2.0) + i * 5.0) for i in range(0, 1)]
+
     def setup_bugs(self):
-        for i in range(0, 1):
+        for position in self.bug_positions():
             bug = Bug(self.main)
-            bug.position = ((self.width / 2.0) + i * 5.0, (self.height / 2.0) + i * 5.0)
+            bug.position = position
             bug.setup()
             bug.shape.sensor = False
             self.bugs.append(bug)
 
+        if self.swarm is not None:
+            self.swarm.spawn(self.swarm_positions(self.settings['BUG_SWARM_SIZE']))
+
+    def swarm_radius(self) -> float:
+        """Radius of the disk the swarm spawns in, the bugs start about SWARM_SPAWN_SPACING apart."""
+        return SWARM_SPAWN_SPACING * math.sqrt(self.settings['BUG_SWARM_SIZE'] / math.pi)
+
+    def swarm_positions(self, n: int):
+        """``n`` positions spread over a disk around the center of the play zone."""
+        rng = derive_random(self.seed, 'bug_swarm')
+        radius = self.swarm_radius()
+        center_x = self.width / 2.0
+        center_y = self.height / 2.0
+
+        positions = []
+        for _ in range(n):
+            distance = radius * math.sqrt(rng.random())
+            angle = rng.uniform(0.0, 2.0 * math.pi)
+            positions.append((center_x + distance * math.cos(angle),
+                              center_y + distance * math.sin(angle)))
+        return positions
 
     def setup_spritelists(self):
-        self.bg_sprite_list = arcade.SpriteList()
         self.spacejunk = arcade.SpriteList()
         self.ufos = arcade.SpriteList()
         self.bugs = arcade.SpriteList()
+        if self.settings['UFO_SQUADRON']:
+            self.squadron = UFOSquadron(self.main, self.ufos)
+        if self.settings['BUG_SWARM_SIZE'] > 0:
+            self.swarm = BugSwarm(self.main)
+        if self.settings['SPAWN_DIRECTOR']:
+            self.director = SpawnDirector(self.settings['SPAWN_ENTITY_BUDGET'],
+                                          self.settings['SPAWN_TARGET_TICK_TIME'])
 
     def calculate_dimensions_pixels(self) -> Tuple[float, float]:
         return (self.play_zone_width_height[0] * self.background.width,
                 self.play_zone_width_height[1] * self.background.height)
 
     def tile_background(self):
-        for i in range(-2, self.play_zone_width_height[0] + 3):
-            for j in range(-2, self.play_zone_width_height[1] + 3):
-                tile = arcade.Sprite(self.background.image,
-                                     center_x=(i * self.background.width),
-                                     center_y=(j * self.background.height))
-                self.bg_sprite_list.append(tile)
+        if self.settings['BACKGROUND_MODE'] == 'quad':
+            self.background_layer = BackgroundQuad(self.background, self.play_zone_width_height)
+        else:
+            self.background_layer = TiledBackground(self.background, self.play_zone_width_height)
 
     def create_playzone_walls(self):
         left_wall = Wall((0.0, 0.0),
@@ -174,48 +258,295 @@ class PlayZone:
             pv2 = body.position + wall.segment.b.rotated(body.angle)
             arcade.draw_line(pv1.x, pv1.y, pv2.x, pv2.y, arcade.color.WHITE, 2)
 
-    def draw_background(self):
-        self.bg_sprite_list.draw()
+    def draw_background(self, culler=None, view=0):
+        if self.background_layer is None:
+            return
+
+        if culler is not None and view < len(culler.view_rects):
+            self.background_layer.draw(culler.view_rects[view], view)
+        else:
+            self.background_layer.draw()
+
+    def draw_spacejunk(self, culler=None, view=0):
+        if culler is None:
+            self.spacejunk.draw()
+        else:
+            culler.draw(self.spacejunk, view)
 
-    def draw_spacejunk(self):
-        self.spacejunk.draw()
+    def draw_ufos(self, culler=None, view=0):
+        if culler is None:
+            self.ufos.draw()
+        else:
+            culler.draw(self.ufos, view)
 
-    def draw_ufos(self):
-        self.ufos.draw()
+    def draw_bugs(self, culler=None, view=0):
+        if culler is None:
+            self.bugs.draw()
+        else:
+            culler.draw(self.bugs, view)
 
-    def draw_bugs(self):
-        self.bugs.draw()
+        if self.swarm is not None:
+            if culler is None:
+                self.swarm.bugs.draw()
+            else:
+                culler.draw(self.swarm.bugs, view)
 
-    def draw(self):
-        self.draw_background()
+    def draw(self, culler=None, view=0):
+        self.draw_background(culler, view)
         self.draw_walls()
-        self.draw_spacejunk()
-        self.draw_ufos()
-        self.draw_bugs()
+        self.draw_spacejunk(culler, view)
+        self.draw_ufos(culler, view)
+        self.draw_bugs(culler, view)
+
+    def in_bounds(self, x: float, y: float, margin: float = 0.0) -> bool:
+        return (margin <= x <= self.width - margin
+                and margin <= y <= self.height - margin)
+
+    def setup_sleeping(self):
+        if self.settings['SLEEPING']:
+            self.sleep_timer = self.main.scheduler.schedule(self.settings['SLEEP_CHECK_INTERVAL'],
+                                                            self.update_sleeping,
+                                                            repeat=True)
+
+    def update_sleeping(self):
+        """
+        Put the idle space junk far from every player to sleep straight
+        away, rather than waiting for pymunk to notice, and wake the junk
+        near them. Junk drifting faster than IDLE_SPEED_THRESHOLD is left
+        moving. Sleeping bodies cost pymunk nothing and are woken by pymunk
+        when something touches them.
+        """
+        players = self.main.players
+        if not players or not len(self.spacejunk):
+            return
+
+        junk = list(self.spacejunk)
+        positions = np.array([(obj.center_x, obj.center_y) for obj in junk])
+        focus = np.array([(player.center_x, player.center_y) for player in players])
+        # Squared distance to the nearest player
+        distances = ((positions[:, None, :] - focus[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+        near = distances < self.settings['SLEEP_RADIUS'] ** 2
+        idle_speed_squared = self.settings['IDLE_SPEED_THRESHOLD'] ** 2
+
+        for obj, is_near in zip(junk, near.tolist()):
+            body = obj.body
+            if is_near:
+                if body.is_sleeping:
+                    body.activate()
+            elif (not body.is_sleeping
+                  and body.velocity.get_length_sqrd() < idle_speed_squared
+                  and not is_touching(body)):
+                # pymunk crashes when a body in contact is forced to sleep
+                body.sleep()
+
+    def setup_director(self, ufo=True, bugs=True):
+        if self.director is None:
+            return
+
+        self.director_kinds = tuple(kind for kind, enabled in (('ufos', ufo), ('bugs', bugs)) if enabled)
+        self.director.set_min_capacity(sum(self.spawn_minimums().values()))
+        self.director_rng = derive_random(self.seed, 'director')
+        self.director_timer = self.main.scheduler.schedule(self.settings['SPAWN_INTERVAL'],
+                                                           self.direct_spawns,
+                                                           repeat=True)
+
+    def difficulty_level(self) -> int:
+        """Index into the difficulty tables, the middle one when no difficulty was picked."""
+        if not isinstance(self.difficulty, int):
+            return DEFAULT_DIFFICULTY - 1
+        return min(max(self.difficulty, 1), len(UFO_DIFFICULTY)) - 1
+
+    def spawn_targets(self) -> dict:
+        """Enemies of each kind the director works towards."""
+        level = self.difficulty_level()
+        if self.swarm is not None:
+            num_bugs = self.settings['BUG_SWARM_SIZE']
+        else:
+            num_bugs = BUG_DIFFICULTY[level]
+        targets = {'ufos': UFO_DIFFICULTY[level].num_ufos[1],
+                   'bugs': num_bugs}
+        return {kind: targets[kind] for kind in self.director_kinds}
+
+    def spawn_minimums(self) -> dict:
+        """Enemies of each kind the difficulty starts with, the director never backs off below them."""
+        level = self.difficulty_level()
+        minimums = {'ufos': UFO_DIFFICULTY[level].num_ufos[0],
+                    'bugs': BUG_DIFFICULTY[level]}
+        return {kind: minimums[kind] for kind in self.director_kinds}
+
+    def enemies(self, kind: str) -> list:
+        if kind == 'ufos':
+            return list(self.ufos)
+        if self.swarm is not None:
+            return list(self.swarm.bugs)
+        return list(self.bugs)
+
+    def direct_spawns(self):
+        counts = {kind: len(self.enemies(kind)) for kind in self.director_kinds}
+        changes = self.director.plan(self.spawn_targets(), counts)
+        spawned = 0
+        despawned = 0
+        for kind, change in changes.items():
+            if change > 0:
+                spawned += self.spawn_enemies(kind, change)
+            elif change < 0:
+                despawned += self.despawn_enemies(kind, -change)
+        self.director.record_changes(spawned, despawned)
+
+    def director_position(self) -> Optional[Tuple[float, float]]:
+        """
+        A position out of the players' sight, between SPAWN_MIN_DISTANCE and
+        SPAWN_MAX_DISTANCE from one of them and clear of everything else.
+        None if one wasn't found.
+        """
+        rng = self.director_rng
+        players = self.main.players
+        if players:
+            focus = [(player.center_x, player.center_y) for player in players]
+        else:
+            focus = [(self.width / 2.0, self.height / 2.0)]
+        min_distance = self.settings['SPAWN_MIN_DISTANCE']
+        max_distance = self.settings['SPAWN_MAX_DISTANCE']
+
+        for _ in range(SPAWN_MAX_ATTEMPTS):
+            fx, fy = rng.choice(focus)
+            distance = rng.uniform(min_distance, max_distance)
+            angle = rng.uniform(0.0, 2.0 * math.pi)
+            x = fx + distance * math.cos(angle)
+            y = fy + distance * math.sin(angle)
+            if not self.in_bounds(x, y, BUG_SPAWN_RADIUS):
+                continue
+            if any(math.dist((x, y), position) < min_distance for position in focus):
+                continue
+            hits = self.space.point_query((x, y), BUG_SPAWN_RADIUS, pymunk.ShapeFilter())
+            if any(not hit.shape.sensor for hit in hits):
+                continue
+            return (x, y)
+        return None
+
+    def spawn_enemies(self, kind: str, n: int) -> int:
+        """Add up to ``n`` enemies of ``kind``, returns how many found a place."""
+        positions = []
+        for _ in range(n):
+            position = self.director_position()
+            if position is not None:
+                positions.append(position)
+
+        if kind == 'ufos':
+            for position in positions:
+                ufo = UFO(self.director_rng.choice(UFOS), self.main, name=random_name(self.director_rng))
+                ufo.position = position
+                ufo.setup()
+                self.ufos.append(ufo)
+        elif self.swarm is not None:
+            self.swarm.spawn(positions)
+        else:
+            for position in positions:
+                bug = Bug(self.main)
+                bug.position = position
+                bug.setup()
+                self.bugs.append(bug)
+        return len(positions)
+
+    def despawn_enemies(self, kind: str, n: int) -> int:
+        """Quietly remove the ``n`` enemies of ``kind`` furthest from the players, returns how many went."""
+        enemies = self.enemies(kind)
+        players = self.main.players
+        if not enemies or not players:
+            return 0
+
+        positions = np.array([(enemy.center_x, enemy.center_y) for enemy in enemies])
+        focus = np.array([(player.center_x, player.center_y) for player in players])
+        distances = ((positions[:, None, :] - focus[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+        furthest = np.argsort(distances)[::-1][:n]
+        for i in furthest:
+            enemies[i].despawn()
+        return len(furthest)
+
+    def update(self, delta_time: float = 1 / 60):
+        if self.director is not None:
+            # How long the previous tick took
+            self.director.record(self.main.tick_time)
+        self.sight.begin_tick()
+
+        # Space junk has nothing to do until it is damaged
+        damaged, self.damaged = self.damaged, set()
+        for junk in damaged:
+            junk.update(delta_time)
+
+        if self.squadron is not None:
+            self.squadron.update(delta_time)
+            enemies = (self.bugs,)
+        else:
+            enemies = (self.ufos, self.bugs)
 
-    def update(self):
-        self.spacejunk.update()
-        self.ufos.update()
-        self.bugs.update()
+        if self.settings['LOD']:
+            players = self.main.players or []
+            focus = [(player.center_x, player.center_y) for player in players]
+            self.lod.update(enemies, focus, delta_time)
+        else:
+            # Don't hold on to entities from when LOD was last on
+            self.lod.clear()
+            for spritelist in enemies:
+                spritelist.update(delta_time)
+
+        # The PID steered bugs queued their controllers while updating
+        self.bug_steering.apply()
+
+        # Swarm bugs are steered together, they are never LOD updated
+        if self.swarm is not None:
+            self.swarm.update(delta_time)
+
+    def touch(self, enemy):
+        """``enemy`` was damaged, update it straight away."""
+        if self.swarm is not None and enemy in self.swarm:
+            self.swarm.touch(enemy)
+            return
+        if self.settings['LOD']:
+            self.lod.touch(enemy)
+        if self.squadron is not None and isinstance(enemy, UFO):
+            self.squadron.touch(enemy)
 
     def reset(self):
         pass
 
     def generate_spacejunk(self):
-        spacejunks = self.generator.generate_spacejunk()
+        if self.settings['BATCH_GENERATION']:
+            spacejunks = self.generator.generate_spacejunk_batch()
+        else:
+            spacejunks = self.generator.generate_spacejunk()
 
         if spacejunks is not None:
             for junk in spacejunks:
                 self.spacejunk.append(junk)
 
 
+BUG_SPAWN_RADIUS = 100.0
+# Difficulty used when none was picked, the one DEFAULT_UFO_GEN_RANGES matches
+DEFAULT_DIFFICULTY = 3
+# Average distance (pixels) between swarm bugs when they spawn
+SWARM_SPAWN_SPACING = 30.0
+
+
 @dataclass
 class SpaceJunkGenerateData:
     num_stations_big: int
     num_stations_small: int
 
 
-# Class to randomly select space junk and give it random position and velocity
+def derive_random(seed, *keys) -> random.Random:
+    """
+    Independent random stream for ``seed`` and ``keys``. Seeding with a
+    string hashes it with sha512, so the stream is the same on every run and
+    in every process whatever PYTHONHASHSEED is.
+    """
+    return random.Random(":".join(str(key) for key in (seed,) + keys))
+
+
+# Class to randomly select space junk and give it random position and velocity.
+# Each category of object draws from its own stream derived from the seed,
+# so changing how many UFOs there are doesn't move the space junk, and
+# nothing else in the game can perturb generation by using ``random``.
 class SpaceJunkGenerator:
     def __init__(self,
                  main,
@@ -224,14 +555,19 @@ class SpaceJunkGenerator:
                  spacejunk_data=None,
                  ufo_data=None,
                  spacejunk_ranges=DEFAULT_SPACEJUNK_GEN_RANGES,
-                 ufo_ranges=DEFAULT_UFO_GEN_RANGES):
+                 ufo_ranges=DEFAULT_UFO_GEN_RANGES,
+                 placer: Optional[SpawnPlacer] = None):
 
         self.main = main
         self.playzone = playzone
+        if placer is None:
+            placer = SpawnPlacer((0.0, 0.0, playzone.width, playzone.height))
+        self.placer = placer
         self.spacejunk_ranges = spacejunk_ranges
         self.ufo_ranges = ufo_ranges
         self.objects = []
         self.seed = seed
+        self._streams = {}
 
         if spacejunk_data:
             self.spacejunk_data = spacejunk_data
@@ -244,34 +580,47 @@ class SpaceJunkGenerator:
         else:
             self.ufo_data = self.generateUFOData()
 
-        self.seed_seed()
+    def stream(self, category: str) -> random.Random:
+        rng = self._streams.get(category)
+        if rng is None:
+            rng = derive_random(self._seed, category)
+            self._streams[category] = rng
+        return rng
+
+    def random_x(self, rng):
+        return rng.randrange(0, self.playzone.width)
 
-    def random_x(self):
-        return random.randrange(0, self.playzone.width)
+    def random_y(self, rng):
+        return rng.randrange(0, self.playzone.height)
 
-    def random_y(self):
-        return random.randrange(0, self.playzone.height)
+    def random_position(self, rng, radius=None):
+        if radius is None:
+            return (self.random_x(rng), self.random_y(rng))
+        return self.placer.place(radius, rng)
 
-    def random_position(self):
-        return (self.random_x(), self.random_y())
+    def random_velocity(self, range, rng):
+        return (rng.randrange(range[0], range[1]),
+                rng.randrange(range[0], range[1]))
 
-    def random_velocity(self, range):
-        return (random.randrange(range[0], range[1]),
-                random.randrange(range[0], range[1]))
+    def random_angular_velocity(self, range, rng):
+        return rng.randrange(range[0], range[1])
 
-    def random_angular_velocity(self, range):
-        return random.randrange(range[0], range[1])
+    def initalize_space_object(self, object, velocity_range, angular_velocity_range, rng) -> bool:
+        # Half the diagonal, so rotating objects can't overlap
+        position = self.random_position(rng, math.hypot(object.width, object.height) / 2.0)
+        if position is None:
+            return False
 
-    def initalize_space_object(self, object, velocity_range, angular_velocity_range):
-        object.position = self.random_position()
+        object.position = position
         object.setup()
-        object.body.velocity = (self.random_velocity(velocity_range))
-        object.body.angular_velocity = self.random_angular_velocity(angular_velocity_range)
+        object.body.velocity = (self.random_velocity(velocity_range, rng))
+        object.body.angular_velocity = self.random_angular_velocity(angular_velocity_range, rng)
+        return True
 
-    def select_n_rand_objs(self, dataObjects: [], n_objects: int) -> []:
+    def select_n_rand_objs(self, dataObjects: [], n_objects: int, rng) -> []:
         objects = []
         for i in range(0, n_objects):
-            objects.append(random.choice(dataObjects))
+            objects.append(rng.choice(dataObjects))
 
         return objects
 
@@ -280,15 +629,23 @@ class SpaceJunkGenerator:
                                           Object,
                                           data_list,
                                           velocity_range,
-                                          angular_velocity_range):
-        selected_data = self.select_n_rand_objs(data_list, n_objects)
+                                          angular_velocity_range,
+                                          category):
+        rng = self.stream(category)
+        selected_data = self.select_n_rand_objs(data_list, n_objects, rng)
+        # UFOs are named from their own stream, not the global random
+        names = self.stream('ufo_names') if Object is UFO else None
         objects = []
         for data in selected_data:
-            object = Object(data, self.main)
-            self.initalize_space_object(object,
-                                        velocity_range,
-                                        angular_velocity_range)
-            objects.append(object)
+            if names is not None:
+                object = Object(data, self.main, name=random_name(names))
+            else:
+                object = Object(data, self.main)
+            if self.initalize_space_object(object,
+                                           velocity_range,
+                                           angular_velocity_range,
+                                           rng):
+                objects.append(object)
 
         return objects
 
@@ -297,41 +654,102 @@ class SpaceJunkGenerator:
                                                       SpaceObject,
                                                       stations_small,
                                                       self.spacejunk_ranges.stations_small_velocity,
-                                                      self.spacejunk_ranges.stations_small_angular_velocity)
+                                                      self.spacejunk_ranges.stations_small_angular_velocity,
+                                                      'stations_small')
 
     def generate_stations_big(self):
         return self.select_and_initalize_space_object(self.spacejunk_data.num_stations_big,
                                                       SpaceObject,
                                                       stations_big,
                                                       self.spacejunk_ranges.stations_big_velocity,
-                                                      self.spacejunk_ranges.stations_big_angular_velocity)
+                                                      self.spacejunk_ranges.stations_big_angular_velocity,
+                                                      'stations_big')
 
     def generate_spacejunk(self):
         small_stations = self.generate_stations_small()
         big_stations = self.generate_stations_big()
         return small_stations + big_stations
 
+    def numpy_stream(self, category: str) -> np.random.Generator:
+        return np.random.default_rng(self.stream(category).getrandbits(128))
+
+    def generate_batch(self,
+                       n_objects,
+                       Object,
+                       data_list,
+                       velocity_range,
+                       angular_velocity_range,
+                       category):
+        """
+        Vectorized ``select_and_initalize_space_object``: picks the data,
+        positions, velocities and spins for all ``n_objects`` as arrays,
+        places them with the generator's ``SpawnPlacer`` and adds the bodies
+        to pymunk in bulk.
+        """
+        rng = self.numpy_stream(f"batch:{category}")
+
+        choices = rng.integers(0, len(data_list), n_objects)
+        velocities = rng.integers(velocity_range[0], velocity_range[1], (n_objects, 2))
+        spins = rng.integers(angular_velocity_range[0], angular_velocity_range[1], n_objects)
+
+        # Half the diagonal of each sprite, so rotating objects can't overlap
+        half_diagonals = np.array([math.hypot(*sprite_dimensions(data.spritefile)) * data.scale / 2.0
+                                   for data in data_list])
+        positions = self.placer.place_many(half_diagonals[choices], rng)
+
+        objects = []
+        moments = []
+        placed = []
+        for i in np.flatnonzero(~np.isnan(positions[:, 0])):
+            object = Object(data_list[choices[i]], self.main)
+            object.position = (float(positions[i, 0]), float(positions[i, 1]))
+            objects.append(object)
+            moments.append(pymunk.moment_for_box(object.mass, (object.width, object.height)))
+            placed.append(i)
+
+        self.main.add_sprites_to_pymunk(objects, moments)
+        for object, i in zip(objects, placed):
+            object.body.velocity = (float(velocities[i, 0]), float(velocities[i, 1]))
+            object.body.angular_velocity = float(spins[i])
+
+        return objects
+
+    def generate_spacejunk_batch(self):
+        # Big stations first, they are the hardest to fit
+        big_stations = self.generate_batch(self.spacejunk_data.num_stations_big,
+                                           SpaceObject,
+                                           stations_big,
+                                           self.spacejunk_ranges.stations_big_velocity,
+                                           self.spacejunk_ranges.stations_big_angular_velocity,
+                                           'stations_big')
+        small_stations = self.generate_batch(self.spacejunk_data.num_stations_small,
+                                             SpaceObject,
+                                             stations_small,
+                                             self.spacejunk_ranges.stations_small_velocity,
+                                             self.spacejunk_ranges.stations_small_angular_velocity,
+                                             'stations_small')
+        return small_stations + big_stations
+
     def generate_ufos(self):
         ufo_objects = self.select_and_initalize_space_object(self.ufo_data.num_ufos,
                                                              UFO,
                                                              UFOS,
                                                              self.ufo_ranges.velocity,
-                                                             self.ufo_ranges.angular_velocity)
-
+                                                             self.ufo_ranges.angular_velocity,
+                                                             'ufos')
         return ufo_objects
 
     def generateUFOData(self):
-        return UFOGeneratorData(num_ufos=self.generate_int(self.ufo_ranges.num_ufos))
+        return UFOGeneratorData(num_ufos=self.generate_int(self.ufo_ranges.num_ufos, 'num_ufos'))
 
     def generateSpaceJunkData(self):
-        return SpaceJunkGenerateData(num_stations_small=self.generate_int(self.spacejunk_ranges.num_stations_small),
-                                     num_stations_big=self.generate_int(self.spacejunk_ranges.num_stations_big))
-
-    def generate_int(self, range):
-        return random.randint(range[0], range[1])
+        return SpaceJunkGenerateData(num_stations_small=self.generate_int(self.spacejunk_ranges.num_stations_small,
+                                                                          'num_stations_small'),
+                                     num_stations_big=self.generate_int(self.spacejunk_ranges.num_stations_big,
+                                                                        'num_stations_big'))
 
-    def seed_seed(self):
-        random.seed(self._seed)
+    def generate_int(self, range, category):
+        return self.stream(category).randint(range[0], range[1])
 
     @property
     def seed(self) -> int:
@@ -343,3 +761,287 @@ class SpaceJunkGenerator:
             self._seed = datetime.datetime.now().timestamp()
         else:
             self._seed = seed
+
+
+@dataclass
+class ChunkGeneratorRanges:
+    num_stations_small: Tuple[int, int]
+    num_stations_big: Tuple[int, int]
+    num_ufos: Tuple[int, int]
+
+
+DEFAULT_CHUNK_GEN_RANGES = ChunkGeneratorRanges(
+    num_stations_small=(0, 3),
+    num_stations_big=(0, 2),
+    num_ufos=(0, 1)
+)
+
+# Every kind of object a chunk can hold, the index into this list is what
+# gets stored for a frozen object.
+CHUNK_OBJECT_KINDS = ([(SpaceObject, data) for data in stations_small]
+                      + [(SpaceObject, data) for data in stations_big]
+                      + [(UFO, data) for data in UFOS])
+_CHUNK_KIND_INDEX = {id(data): kind for kind, (_, data) in enumerate(CHUNK_OBJECT_KINDS)}
+
+
+"""
+ Open world play zone. Space is split into square chunks, the chunks
+ around the players are generated from the seed and the chunk coordinates
+ (so a chunk always holds the same objects), and objects that end up far
+ from every player are taken out of pymunk and kept as compact tuples
+ until a player comes back.
+ """
+
+
+class ChunkedPlayZone(PlayZone):
+    def __init__(self,
+                 game,
+                 settings,
+                 background: Background,
+                 dimension: Tuple[int, int] = (4, 4),
+                 seed='time',
+                 chunk_ranges=DEFAULT_CHUNK_GEN_RANGES):
+        super().__init__(game, settings, background, dimension, seed)
+        self.chunk_size = settings['CHUNK_SIZE']
+        self.load_radius = settings['CHUNK_LOAD_RADIUS']
+        # One more ring is kept than is loaded, so objects near the edge of
+        # the loaded area don't flip between frozen and live
+        self.unload_radius = self.load_radius + 1
+        self.stream_interval = settings['CHUNK_STREAM_INTERVAL']
+        self.chunk_ranges = chunk_ranges
+
+        self.loaded = set()
+        self.generated = set()
+        # chunk -> [(kind, x, y, angle, vx, vy, angular velocity, health, hitpoints, name)]
+        self.frozen = {}
+        # chunk object kind -> half its diagonal
+        self._kind_radii = {}
+        self._updates = 0
+
+    def setup(self, background=True,
+              boundry=False,
+              spacejunk=True,
+              ufo=True,
+              bugs=True,
+              keep_out=()):
+        self.setup_spritelists()
+        if background:
+            self.background_layer = TiledBackground(self.background, None)
+
+        # There are no walls in an open world, boundry is ignored
+        self._spawn_spacejunk = spacejunk
+        # The director spawns the enemies during the match instead
+        self._spawn_ufos = ufo and self.director is None
+        spawn_bugs = bugs and self.director is None
+        self.keep_out = list(keep_out)
+        if spawn_bugs:
+            self.keep_out += self.bug_positions()
+        self.placer = SpawnPlacer((0.0, 0.0, self.chunk_size, self.chunk_size))
+
+        if spawn_bugs:
+            self.setup_bugs()
+
+        self.stream()
+        self.setup_sleeping()
+        self.setup_director(ufo, bugs)
+
+    def in_bounds(self, x: float, y: float, margin: float = 0.0) -> bool:
+        return True
+
+    def draw_background(self, culler=None, view=0):
+        # Unbounded, so only ever drawn for a camera
+        if self.background_layer is not None and culler is not None and view < len(culler.view_rects):
+            self.background_layer.draw(culler.view_rects[view], view)
+
+    def chunk_of(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.chunk_size), math.floor(y / self.chunk_size))
+
+    def chunks_around(self, positions, radius: int) -> set:
+        chunks = set()
+        for x, y in positions:
+            cx, cy = self.chunk_of(x, y)
+            for i in range(cx - radius, cx + radius + 1):
+                for j in range(cy - radius, cy + radius + 1):
+                    chunks.add((i, j))
+        return chunks
+
+    def focus_positions(self):
+        players = self.main.players
+        if players is not None and len(players) > 0:
+            return [player.position for player in players]
+        return [(self.width / 2.0, self.height / 2.0)]
+
+    def update(self, delta_time: float = 1 / 60):
+        super().update(delta_time)
+
+        self._updates += 1
+        if self._updates % self.stream_interval == 0:
+            self.stream()
+
+    def stream(self):
+        positions = self.focus_positions()
+        wanted = self.chunks_around(positions, self.load_radius)
+        keep = self.chunks_around(positions, self.unload_radius)
+
+        for spritelist in (self.spacejunk, self.ufos):
+            for obj in list(spritelist):
+                chunk = self.chunk_of(obj.center_x, obj.center_y)
+                if chunk not in keep:
+                    self.freeze(obj, chunk)
+
+        self.loaded &= keep
+        for chunk in wanted - self.loaded:
+            self.load_chunk(chunk)
+
+    def load_chunk(self, chunk: Tuple[int, int]):
+        if chunk not in self.generated:
+            self.generate_chunk(chunk)
+            self.generated.add(chunk)
+
+        for state in self.frozen.pop(chunk, []):
+            self.thaw(state)
+
+        self.loaded.add(chunk)
+
+    def chunk_random(self, chunk: Tuple[int, int], category: str) -> random.Random:
+        return derive_random(self.seed, chunk[0], chunk[1], category)
+
+    def chunk_placer(self, chunk: Tuple[int, int]) -> SpawnPlacer:
+        # Objects near a border can reach into the next chunk, so the live
+        # and frozen objects of the chunks around it are reserved as well.
+        left = chunk[0] * self.chunk_size
+        bottom = chunk[1] * self.chunk_size
+        placer = SpawnPlacer((left, bottom, left + self.chunk_size, bottom + self.chunk_size))
+        for x, y in self.keep_out:
+            placer.keep_out(x, y, self.settings['SPAWN_KEEP_OUT_RADIUS'])
+
+        around = self.chunks_around([(left + self.chunk_size / 2.0, bottom + self.chunk_size / 2.0)], 1)
+        for neighbour in around:
+            for state in self.frozen.get(neighbour, ()):
+                placer.reserve(state[1], state[2], self.chunk_kind_radius(state[0]))
+        for spritelist in (self.spacejunk, self.ufos):
+            for obj in spritelist:
+                if self.chunk_of(obj.center_x, obj.center_y) in around:
+                    placer.reserve(obj.center_x, obj.center_y, math.hypot(obj.width, obj.height) / 2.0)
+        return placer
+
+    def chunk_kind_radius(self, kind: int) -> float:
+        """Half the diagonal of a chunk object of ``kind``, the radius it was placed with."""
+        radius = self._kind_radii.get(kind)
+        if radius is None:
+            Object, data = CHUNK_OBJECT_KINDS[kind]
+            if Object is UFO:
+                spritefile, scale = os.path.join(UFO_RES_DIR, data.color), UFO_SCALE
+            else:
+                spritefile, scale = data.spritefile, data.scale
+            radius = math.hypot(*sprite_dimensions(spritefile)) * scale / 2.0
+            self._kind_radii[kind] = radius
+        return radius
+
+    def generate_chunk(self, chunk: Tuple[int, int]):
+        ranges = self.chunk_ranges
+        placer = self.chunk_placer(chunk)
+        junk_ranges = DEFAULT_SPACEJUNK_GEN_RANGES
+
+        if self._spawn_spacejunk:
+            rng = self.chunk_random(chunk, 'stations_small')
+            for _ in range(rng.randint(*ranges.num_stations_small)):
+                self.spawn(placer, rng, SpaceObject, rng.choice(stations_small),
+                           junk_ranges.stations_small_velocity,
+                           junk_ranges.stations_small_angular_velocity,
+                           self.spacejunk)
+
+            rng = self.chunk_random(chunk, 'stations_big')
+            for _ in range(rng.randint(*ranges.num_stations_big)):
+                self.spawn(placer, rng, SpaceObject, rng.choice(stations_big),
+                           junk_ranges.stations_big_velocity,
+                           junk_ranges.stations_big_angular_velocity,
+                           self.spacejunk)
+
+        if self._spawn_ufos:
+            rng = self.chunk_random(chunk, 'ufos')
+            names = self.chunk_random(chunk, 'ufo_names')
+            for _ in range(rng.randint(*ranges.num_ufos)):
+                self.spawn(placer, rng, UFO, rng.choice(UFOS),
+                           DEFAULT_UFO_GEN_RANGES.velocity,
+                           DEFAULT_UFO_GEN_RANGES.angular_velocity,
+                           self.ufos,
+                           name=random_name(names))
+
+    def spawn(self, placer, rng, Object, data, velocity_range, angular_velocity_range, spritelist, **kwargs):
+        obj = Object(data, self.main, **kwargs)
+        obj.chunk_kind = _CHUNK_KIND_INDEX[id(data)]
+        position = placer.place(math.hypot(obj.width, obj.height) / 2.0, rng)
+        if position is None:
+            return None
+
+        obj.position = position
+        obj.setup()
+        obj.body.velocity = (rng.randrange(velocity_range[0], velocity_range[1]),
+                             rng.randrange(velocity_range[0], velocity_range[1]))
+        obj.body.angular_velocity = rng.randrange(angular_velocity_range[0], angular_velocity_range[1])
+        spritelist.append(obj)
+        return obj
+
+    def freeze(self, obj, chunk: Tuple[int, int]):
+        body = obj.body
+        self.frozen.setdefault(chunk, []).append((obj.chunk_kind,
+                                                  body.position.x,
+                                                  body.position.y,
+                                                  body.angle,
+                                                  body.velocity.x,
+                                                  body.velocity.y,
+                                                  body.angular_velocity,
+                                                  obj.health,
+                                                  getattr(obj, 'hitpoints', None),
+                                                  getattr(obj, 'name', None)))
+        # Also takes it out of the physics engine and the pymunk space
+        obj.remove_from_sprite_lists()
+        self.damaged.discard(obj)
+
+    def thaw(self, state):
+        kind, x, y, angle, vx, vy, angular_velocity, health, hitpoints, name = state
+        Object, data = CHUNK_OBJECT_KINDS[kind]
+
+        if Object is UFO:
+            obj = Object(data, self.main, name=name)
+        else:
+            obj = Object(data, self.main)
+        obj.chunk_kind = kind
+        obj._data.health = health
+        if hitpoints is not None:
+            obj.hitpoints = hitpoints
+        obj.position = (x, y)
+        obj.setup()
+        obj.body.angle = angle
+        obj.body.velocity = (vx, vy)
+        obj.body.angular_velocity = angular_velocity
+
+        if Object is UFO:
+            self.ufos.append(obj)
+        else:
+            self.spacejunk.append(obj)
+        return obj
+
+    def num_frozen(self) -> int:
+        return sum(len(states) for states in self.frozen.values())
+
+
+def is_touching(body: pymunk.Body) -> bool:
+    arbiters = []
+    body.each_arbiter(arbiters.append)
+    return len(arbiters) > 0
+
+
+def create_play_zone(game, settings, seed='time') -> PlayZone:
+    """Build the play zone selected by the PLAY_ZONE_MODE setting."""
+    if settings['PLAY_ZONE_MODE'] == 'chunked':
+        PlayZoneClass = ChunkedPlayZone
+    else:
+        PlayZoneClass = PlayZone
+
+    return PlayZoneClass(game,
+                         settings,
+                         settings['DEFAULT_BACKGROUND'],
+                         settings['PLAY_ZONE'],
+                         seed=seed)
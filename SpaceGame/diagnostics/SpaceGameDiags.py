@@ -34,3 +34,15 @@ class SpaceGameDiagnostics(DiagnosticsController):
         self.add_diagnostic(arcade.key.P,
                             lambda game: f"Position: P1: {game.players[0].position} P2: {game.players[1].position}))",
                             display_at_start=False)
+
+        self.add_diagnostic(arcade.key.B,
+                            lambda game: f"Bullet Pool: {len(game.bullet_pool)} free - Hits: {game.bullet_pool.hits} Misses: {game.bullet_pool.misses}",
+                            display_at_start=False)
+
+        self.add_diagnostic(arcade.key.L,
+                            lambda game: f"LOD: {game.play_zone.lod.counts['near']} near, {game.play_zone.lod.counts['mid']} mid, {game.play_zone.lod.counts['far']} far",
+                            display_at_start=False)
+
+        self.add_diagnostic(arcade.key.K,
+                            lambda game: f"Spawn Director: {game.play_zone.director.stats()}" if game.play_zone.director else "Spawn Director: off",
+                            display_at_start=False)
@@ -1,4 +1,3 @@
-import math
 from typing import Optional, Tuple
 
 import logging
@@ -10,43 +9,124 @@ from SpaceGame.gametypes.Ship import ShipData
 import arcade
 
 from SpaceGame.gametypes.Bullet import Bullet
-from SpaceGame.gametypes.Explosion import Explosion
+from SpaceGame.gametypes.Explosion import ExplosionSize
 import SpaceGame.menus.pause_menu
 from SpaceGame.gametypes.HealthBar import HealthBar
 from SpaceGame.gametypes.Player import Player
+from SpaceGame.gamemodes.simulation import Simulation
 from SpaceGame.settings import ALIVE, PLAYER_ONE, PLAYER_TWO, CONTROLLER, KEYBOARD, DEAD, Setting, SettingsManager
-from SpaceGame.gametypes.PlayZoneTypes import CollisionTypes
-from SpaceGame.shared.maths import squared_distance_sprite, x_y_distance_sprite
-from SpaceGame.shared.physics import bullet_bug_hit_handler, bullet_bullet_hit_handler, bullet_ufo_hit_handler, ship_bullet_hit_handler, spaceObject_bullet_hit_handler
+from SpaceGame.shared.culling import Culler
 
 
 class BaseGame(arcade.View):
+    """
+    Window side of a game mode: cameras, viewports, input and drawing. All
+    of the game state and per-frame logic lives in ``self.simulation``, the
+    world attributes below (``physics_engine``, ``players``, ``bullets``...)
+    are forwarded to it so sprites can keep using ``main.<attribute>``.
+    """
+    # Game modes set this to override the BULLETS_COLLIDE setting
+    bullets_collide: Optional[bool] = None
+
     def __init__(self, settings):
         self.settings : SettingsManager = settings
+        self.simulation = Simulation(settings, bullets_collide=self.bullets_collide)
+        self.culler = Culler(self.settings['CULL_CELL_SIZE'], enabled=self.settings['CULLING'])
         print(self.settings, type(self.settings))
         self.time = self.settings['Time']
         self.difficulty = self.settings['Difficulty']
         self.default_camera = None
         self.divider_sprite = None
         self.divider = None
-        self.play_zone = None
         self.cameras = None
         self.players_viewports = []
-        self.players_list = []
         self.screen_width: int = self.settings['SCREEN_WIDTH']
         self.screen_height: int = self.settings['SCREEN_HEIGHT']
 
-        # Sprite Lists
-        self.players: Optional[Player] = None
-        self.bullets: Optional[Bullet] = None
-        self.explosions: Optional[Explosion] = None
-        self.healthBars: Optional[HealthBar] = None
-
         super().__init__()
-        self.physics_engine: Optional[arcade.PymunkPhysicsEngine] = None
         arcade.set_background_color(self.settings['BACKGROUND_COLOR'])
         self.register_with_settings()
 
+    @property
+    def physics_engine(self) -> Optional[arcade.PymunkPhysicsEngine]:
+        return self.simulation.physics_engine
+
+    @physics_engine.setter
+    def physics_engine(self, physics_engine: arcade.PymunkPhysicsEngine):
+        self.simulation.physics_engine = physics_engine
+
+    @property
+    def bullet_pool(self):
+        return self.simulation.bullet_pool
+
+    @property
+    def collisions(self):
+        return self.simulation.collisions
+
+    @property
+    def scheduler(self):
+        return self.simulation.scheduler
+
+    @property
+    def tick_time(self) -> float:
+        return self.simulation.tick_time
+
+    @property
+    def play_zone(self):
+        return self.simulation.play_zone
+
+    @play_zone.setter
+    def play_zone(self, play_zone):
+        self.simulation.play_zone = play_zone
+
+    @property
+    def scoreboard(self):
+        return self.simulation.scoreboard
+
+    @scoreboard.setter
+    def scoreboard(self, scoreboard):
+        self.simulation.scoreboard = scoreboard
+
+    @property
+    def players(self) -> Optional[arcade.SpriteList]:
+        return self.simulation.players
+
+    @players.setter
+    def players(self, players: arcade.SpriteList):
+        self.simulation.players = players
+
+    @property
+    def players_list(self) -> list:
+        return self.simulation.players_list
+
+    @players_list.setter
+    def players_list(self, players_list: list):
+        self.simulation.players_list = players_list
+
+    @property
+    def bullets(self) -> Optional[arcade.SpriteList]:
+        return self.simulation.bullets
+
+    @bullets.setter
+    def bullets(self, bullets: arcade.SpriteList):
+        self.simulation.bullets = bullets
+
+    @property
+    def explosions(self) -> Optional[arcade.SpriteList]:
+        return self.simulation.explosions
+
+    @explosions.setter
+    def explosions(self, explosions: arcade.SpriteList):
+        self.simulation.explosions = explosions
+
+    @property
+    def healthBars(self) -> Optional[arcade.SpriteList]:
+        return self.simulation.healthBars
+
+    @healthBars.setter
+    def healthBars(self, healthBars: arcade.SpriteList):
+        self.simulation.healthBars = healthBars
+
     def setup(self):
         logger.debug("Setting up screen dimensions")
         self.screen_width = self.window.width
@@ -59,49 +139,34 @@ class BaseGame(arcade.View):
         self.setup_collision_handlers()
 
     def setup_spritelists(self):
-        self.players = arcade.SpriteList()
-        self.bullets = arcade.SpriteList()
-        self.explosions = arcade.SpriteList()
-        self.healthBars = arcade.SpriteList()
+        self.simulation.setup_spritelists()
 
     def setup_collision_handlers(self):
-        self.physics_engine.add_collision_handler(CollisionTypes.BULLET.value,
-                                                  CollisionTypes.SHIP.value,
-                                                  post_handler=ship_bullet_hit_handler,
-                                                  )
-
-        self.physics_engine.add_collision_handler(CollisionTypes.BULLET.value,
-                                                  CollisionTypes.SPACE_JUNK.value,
-                                                  post_handler=spaceObject_bullet_hit_handler,
-                                                  )
-
-        self.physics_engine.add_collision_handler(CollisionTypes.BULLET.value,
-                                                  CollisionTypes.UFO.value,
-                                                  post_handler=bullet_ufo_hit_handler,
-                                                  )
-                                                  
-        self.physics_engine.add_collision_handler(CollisionTypes.BULLET.value,
-                                                  CollisionTypes.BUG.value,
-                                                  post_handler=bullet_bug_hit_handler,
-                                                  )
-
-        self.physics_engine.add_collision_handler(CollisionTypes.BULLET.value,
-                                                  CollisionTypes.BULLET.value,
-                                                  post_handler=bullet_bullet_hit_handler,
-                                                  )
-
+        self.simulation.setup_collision_handlers()
 
     def setup_physics_engine(self):
-        self.physics_engine = arcade.PymunkPhysicsEngine(damping=self.settings['DEFAULT_DAMPING'],
-                                                         gravity=(self.settings['GRAVITY_X'], 
-                                                                  self.settings['GRAVITY_Y']))
+        self.simulation.setup_physics_engine()
 
     def on_update(self, delta_time):
-        self.physics_engine.step()
-        self.play_zone.update()
-        self.explosions.update()
-        self.bullets.update()
-        self.players.update(delta_time)
+        self.simulation.view_rects = self.camera_rects()
+        self.simulation.advance(delta_time)
+
+    def begin_draw(self):
+        """Center the cameras on the (interpolated) ships and cull for each of them."""
+        for player in range(len(self.players_list)):
+            if self.players_list[player].status != DEAD:
+                self.center_camera_on_player(player)
+        self.culler.begin_frame(self.camera_rects())
+
+    def camera_rects(self):
+        # World (left, bottom, right, top) rectangle seen by each camera
+        rects = []
+        for camera in self.cameras or []:
+            half_width = camera.viewport_width / (2.0 * camera.zoom)
+            half_height = camera.viewport_height / (2.0 * camera.zoom)
+            x, y = camera.position
+            rects.append((x - half_width, y - half_height, x + half_width, y + half_height))
+        return rects
 
     def resize_divider(self, width, height):
         if self.divider:
@@ -183,31 +248,12 @@ class BaseGame(arcade.View):
             raise ValueError("Too many players expected! Can only handle 1 or 2 players.")
 
     def add_player_class(self, player: Player):
-        player.visible = True
-        self.add_player_to_pymunk(player)
-        player.setup()
+        self.simulation.add_player_class(player)
 
     def add_player(self, player : Player,
                          start_position : pymunk.Vec2d,
                          input_source: str):
-        
-        logger.debug(f"Adding player ({player.player_number}, {player.player_name}) at position {start_position} with input source {input_source}")
-        player.start_position = start_position
-        player.position = start_position
-        player.movement_speed = self.settings['MOVEMENT_SPEED']
-        player.rotation_speed = self.settings['ROTATION_SPEED']
-
-        player.input_source = input_source
-        self.players.append(player)
-        self.physics_engine.add_sprite(self.players[player.player_number],
-                                       friction=self.players[player.player_number].friction,
-                                       elasticity=self.players[player.player_number].elasticity,
-                                       mass=self.players[player.player_number].mass,
-                                       moment_of_inertia=arcade.PymunkPhysicsEngine.MOMENT_INF,
-                                       collision_type=CollisionTypes.SHIP.value)
-
-        self.players_list.append(player)
-        self.players[player.player_number].setup()
+        self.simulation.add_player(player, start_position, input_source)
 
     def save_players(self):
         logger.debug("Saving Players")
@@ -269,28 +315,14 @@ class BaseGame(arcade.View):
         elif key == arcade.key.NUM_ADD or key == arcade.key.EQUAL:
             self.zoom_camera_in()
 
-    # Given an object and n spritelists, find the nearest sprite to the object found
-    # within the spritelists
     def find_nearest_sprite(self, object, *spritelists):
-        sprites = []
-        for s in spritelists:
-            sprites += s
-
-        min_distance = float('inf')
-        nearest_sprite = None
-        for sprite in sprites:
-            if object == sprite:
-                continue
+        return self.simulation.find_nearest_sprite(object, *spritelists)
 
-            dis = squared_distance_sprite(object, sprite)
-            if dis < min_distance:
-                min_distance = dis
-                nearest_sprite = sprite
+    def find_nearest_sprites(self, object, k, *spritelists):
+        return self.simulation.find_nearest_sprites(object, k, *spritelists)
 
-        if len(sprites) == 1:
-            nearest_sprite = sprite
-
-        return nearest_sprite, math.sqrt(min_distance), x_y_distance_sprite(object, nearest_sprite)
+    def find_sprites_in_radius(self, object, radius, *spritelists):
+        return self.simulation.find_sprites_in_radius(object, radius, *spritelists)
 
     def reset(self):
         logger.debug("Resetting Game")
@@ -305,24 +337,18 @@ class BaseGame(arcade.View):
         self.setup_spritelists()
         self.setup_players()
 
-    def add_explosion(self, position: Tuple, scale: float):
-        self.explosions.append(Explosion(position, scale))
+    def add_explosion(self, position: Tuple, scale: ExplosionSize):
+        self.simulation.add_explosion(position, scale)
 
     def add_sprite_to_pymunk(self, object,
                              moment_of_inertia=arcade.PymunkPhysicsEngine.MOMENT_INF):
-        self.physics_engine.add_sprite(object,
-                                       friction=object.friction,
-                                       elasticity=object.elasticity,
-                                       radius=object._data.radius,
-                                       mass=object.mass,
-                                       moment_of_inertia=moment_of_inertia,
-                                       collision_type=object.type,
-                                       )
+        self.simulation.add_sprite_to_pymunk(object, moment_of_inertia=moment_of_inertia)
+
+    def collision_type_id(self, collision_type: str) -> int:
+        return self.simulation.collision_type_id(collision_type)
+
+    def add_sprites_to_pymunk(self, objects, moments):
+        self.simulation.add_sprites_to_pymunk(objects, moments)
 
     def add_player_to_pymunk(self, player):
-        self.physics_engine.add_sprite(player,
-                                       friction=player.friction,
-                                       elasticity=player.elasticity,
-                                       mass=player.mass,
-                                       moment_of_inertia=arcade.PymunkPhysicsEngine.MOMENT_INF,
-                                       collision_type=CollisionTypes.SHIP.value)
+        self.simulation.add_player_to_pymunk(player)
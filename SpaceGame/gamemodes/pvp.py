@@ -12,7 +12,8 @@ import arcade
 from SpaceGame.gametypes.Ship import ShipData
 import SpaceGame.menus.game_over_view
 from SpaceGame.gamemodes.basegame import BaseGame
-from SpaceGame.PlayZone import PlayZone
+from SpaceGame.gamemodes.simulation import PVP_START_POSITIONS
+from SpaceGame.PlayZone import PlayZone, create_play_zone
 from SpaceGame.scoreboard.scoreboard import PvPScoreboard, Scoreboard
 from SpaceGame.settings import ALIVE, PLAYER_ONE, PLAYER_TWO, CONTROLLER, KEYBOARD, DEAD
 from SpaceGame.gametypes.PlayZoneTypes import CollisionTypes
@@ -36,7 +37,7 @@ class PvpGame(BaseGame):
         self.player_two_viewport = None
         self.scoreboard = None
         self.respawning_players = {}
-        self.timers = TimerManager()
+        self.timers = TimerManager(self.simulation.scheduler)
         self.player_info = players  # Store the player info passed in
 
     def setup(self):
@@ -65,14 +66,12 @@ class PvpGame(BaseGame):
         self.score = self.scoreboard
 
     def setup_playzone(self):
-        self.play_zone = PlayZone(self,
-                                  self.settings,
-                                  self.settings['DEFAULT_BACKGROUND'],
-                                  self.settings['PLAY_ZONE'])
+        self.play_zone = create_play_zone(self, self.settings)
         self.play_zone.setup(background=True,
                              boundry=True,
                              spacejunk=True,
-                             ufo=True
+                             ufo=True,
+                             keep_out=PVP_START_POSITIONS
                             )
 
     def setup_players(self):
@@ -89,7 +88,7 @@ class PvpGame(BaseGame):
                 scaling=self.settings['SHIP_SCALING'],
                 movement_speed=self.settings['MOVEMENT_SPEED'],
                 rotation_speed=self.settings['ROTATION_SPEED'],
-                max_speed=sd.settings['MAX_SPEED']
+                max_speed=self.settings['MAX_SPEED']
             )
 
             # Update player attributes
@@ -100,7 +99,7 @@ class PvpGame(BaseGame):
             player.player_number = i  # Set player number based on order
 
             # Add player to the game
-            position = Vec2d(200, 200) if i == 0 else Vec2d(300, 300)  # Different start positions for each player
+            position = PVP_START_POSITIONS[i]  # Different start positions for each player
             input_source = KEYBOARD if i == 0 else CONTROLLER  # First player keyboard, second controller
             
             self.add_player(player,
@@ -142,16 +141,18 @@ class PvpGame(BaseGame):
         pass
 
     def on_draw(self):
-        for player in range(len(self.players_list)):
-            self.cameras[player].use()
-            self.clear()
-            self.play_zone.draw()
-            self.players.draw()
-            self.players_list[player].draw()
-            self.healthBars.draw()
-            self.bullets.draw()
-            self.explosions.draw()
-            self.scoreboard.on_draw()
+        with self.simulation.interpolated():
+            self.begin_draw()
+            for player in range(len(self.players_list)):
+                self.cameras[player].use()
+                self.clear()
+                self.play_zone.draw(self.culler, player)
+                self.culler.draw(self.players, player)
+                self.players_list[player].draw()
+                self.culler.draw(self.healthBars, player)
+                self.culler.draw(self.bullets, player)
+                self.culler.draw(self.explosions, player)
+                self.scoreboard.on_draw()
 
         self.default_camera.use()
         self.divider.draw()
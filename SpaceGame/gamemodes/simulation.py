@@ -0,0 +1,399 @@
+import math
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+import logging
+logger = logging.getLogger('space_game')
+
+import arcade
+from arcade.pymunk_physics_engine import PymunkPhysicsObject
+import pymunk
+from pymunk import Vec2d
+
+from SpaceGame.PlayZone import create_play_zone
+from SpaceGame.gametypes.Bullet import BulletPool
+from SpaceGame.gametypes.Explosion import ExplosionPool, ExplosionSize
+from SpaceGame.gametypes.PlayZoneTypes import OBJECT_FILTER, CollisionTypes
+from SpaceGame.gametypes.Ship import Ship, ShipData
+from SpaceGame.scoreboard.scoreboard import HeadlessScoreboard
+from SpaceGame.settings import ALIVE, SettingsManager
+from SpaceGame.shared.maths import x_y_distance_sprite
+from SpaceGame.shared.spatial import SpatialGrid
+from SpaceGame.shared.timer import Scheduler
+from SpaceGame.shared.physics import CollisionQueue, bullet_boundary_handler, bullet_bug_hit_handler, bullet_bullet_hit_handler, bullet_ufo_hit_handler, ship_bullet_hit_handler, spaceObject_bullet_hit_handler
+
+PVP_START_POSITIONS = [Vec2d(200, 200), Vec2d(300, 300)]
+SINGLE_PLAYER_START_POSITION = Vec2d(200, 200)
+HEADLESS_SHIP_SPRITES = [":sprites:png/sprites/Ships/playerShip1_blue.png",
+                         ":sprites:png/sprites/Ships/playerShip1_green.png"]
+
+
+class Simulation:
+    """
+    The game world without a window attached to it.
+
+    Holds the physics engine, the play zone and the sprite lists and steps
+    all of them forward in time. Nothing in here needs an ``arcade.Window``,
+    an OpenGL context or the pyglet clock, so a match can be stepped as fast
+    as the CPU allows (bot matches, balancing runs, regression tests).
+
+    Game views (see ``BaseGame``) own a ``Simulation`` and call ``advance``
+    with the frame time from ``on_update``, which runs as many fixed
+    ``TICK_RATE`` steps as fit in it. Headless runs call ``step`` or ``run``
+    directly.
+    """
+    def __init__(self, settings: SettingsManager, bullets_collide: Optional[bool] = None):
+        self.settings = settings
+        # Game modes can override the BULLETS_COLLIDE setting
+        if bullets_collide is None:
+            bullets_collide = settings['BULLETS_COLLIDE']
+        self.bullets_collide = bullets_collide
+        self.physics_engine: Optional[arcade.PymunkPhysicsEngine] = None
+        self.bullet_pool: Optional[BulletPool] = None
+        self.collisions = CollisionQueue()
+        self.play_zone = None
+        self.scoreboard = None
+
+        # Sprite Lists
+        self.players: Optional[arcade.SpriteList] = None
+        self.bullets: Optional[arcade.SpriteList] = None
+        self.explosions: Optional[arcade.SpriteList] = None
+        self.healthBars: Optional[arcade.SpriteList] = None
+        self.players_list = []
+        self.explosion_pool: Optional[ExplosionPool] = None
+
+        # World (left, bottom, right, top) rectangles of the cameras looking
+        # at the simulation, empty when running headless.
+        self.view_rects = []
+
+        # One spatial index per group of spritelists queried, rebuilt the
+        # first time it is queried in each step.
+        self.spatial_indices = {}
+
+        # Shared by every TimerManager in the match and advanced by ``step``.
+        self.scheduler = Scheduler()
+
+        self.ticks = 0
+        self.elapsed_time = 0.0
+        # Wall clock seconds the last step took
+        self.tick_time = 0.0
+
+        # Fixed timestep state: frame time not yet simulated, how far (0-1)
+        # we are between the last two ticks and where the moving sprites
+        # were before the last tick.
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self._previous_positions = []
+
+    def setup(self):
+        logger.debug("Setting up sprite lists")
+        self.setup_spritelists()
+        logger.debug("Setting up physics engine")
+        self.setup_physics_engine()
+        logger.debug("Setting up collision handlers")
+        self.setup_collision_handlers()
+
+    def setup_spritelists(self):
+        self.players = arcade.SpriteList()
+        self.bullets = arcade.SpriteList()
+        self.explosions = arcade.SpriteList()
+        self.healthBars = arcade.SpriteList()
+        self.explosion_pool = ExplosionPool(self, capacity=self.settings['EXPLOSION_POOL_SIZE'])
+
+    def setup_physics_engine(self):
+        self.physics_engine = arcade.PymunkPhysicsEngine(damping=self.settings['DEFAULT_DAMPING'],
+                                                         gravity=(self.settings['GRAVITY_X'],
+                                                                  self.settings['GRAVITY_Y']))
+        if self.settings['SLEEPING']:
+            self.physics_engine.space.sleep_time_threshold = self.settings['SLEEP_TIME_THRESHOLD']
+            self.physics_engine.space.idle_speed_threshold = self.settings['IDLE_SPEED_THRESHOLD']
+        self.setup_bullet_pool()
+
+    def setup_bullet_pool(self):
+        # The pooled bullets are registered with the physics engine, so the
+        # pool is rebuilt along with it.
+        self.bullet_pool = BulletPool(self,
+                                      capacity=self.settings['BULLET_POOL_SIZE'],
+                                      bullets_collide=self.bullets_collide)
+
+    def collision_type_id(self, collision_type: str) -> int:
+        """The pymunk collision type arcade uses for ``collision_type``."""
+        collision_types = self.physics_engine.collision_types
+        if collision_type not in collision_types:
+            collision_types.append(collision_type)
+        return collision_types.index(collision_type)
+
+    def setup_collision_handlers(self):
+        # Not through arcade, the boundary sensor has no sprite
+        handler = self.physics_engine.space.add_collision_handler(
+            self.collision_type_id(CollisionTypes.BULLET.value),
+            self.collision_type_id(CollisionTypes.BOUNDARY.value))
+        handler.begin = bullet_boundary_handler
+        handler.data['simulation'] = self
+
+        self.physics_engine.add_collision_handler(CollisionTypes.BULLET.value,
+                                                  CollisionTypes.SHIP.value,
+                                                  post_handler=ship_bullet_hit_handler,
+                                                  )
+
+        self.physics_engine.add_collision_handler(CollisionTypes.BULLET.value,
+                                                  CollisionTypes.SPACE_JUNK.value,
+                                                  post_handler=spaceObject_bullet_hit_handler,
+                                                  )
+
+        self.physics_engine.add_collision_handler(CollisionTypes.BULLET.value,
+                                                  CollisionTypes.UFO.value,
+                                                  post_handler=bullet_ufo_hit_handler,
+                                                  )
+
+        self.physics_engine.add_collision_handler(CollisionTypes.BULLET.value,
+                                                  CollisionTypes.BUG.value,
+                                                  post_handler=bullet_bug_hit_handler,
+                                                  )
+
+        if self.bullets_collide:
+            self.physics_engine.add_collision_handler(CollisionTypes.BULLET.value,
+                                                      CollisionTypes.BULLET.value,
+                                                      post_handler=bullet_bullet_hit_handler,
+                                                      )
+
+    @property
+    def tick_delta_time(self) -> float:
+        return 1.0 / self.settings['TICK_RATE']
+
+    def advance(self, frame_time: float) -> int:
+        """
+        Add ``frame_time`` to the accumulator and run the fixed ticks that
+        fit in it, at most ``MAX_SUBSTEPS``. Returns the number of ticks run.
+        """
+        tick = self.tick_delta_time
+        max_substeps = self.settings['MAX_SUBSTEPS']
+
+        self.accumulator += frame_time
+        substeps = min(int(self.accumulator / tick), max_substeps)
+        for i in range(substeps):
+            if i == substeps - 1:
+                self._store_previous_positions()
+            self.step(tick)
+        self.accumulator -= substeps * tick
+
+        if self.accumulator >= tick:
+            # Too far behind, drop the time instead of spiralling
+            logger.debug(f"Dropping {self.accumulator:.3f}s of simulation time")
+            self.accumulator %= tick
+
+        self.alpha = self.accumulator / tick
+        return substeps
+
+    def _store_previous_positions(self):
+        self._previous_positions = [(sprite, sprite.center_x, sprite.center_y)
+                                    for sprite in self.physics_engine.non_static_sprite_list]
+
+    @contextmanager
+    def interpolated(self):
+        """
+        Move the physics sprites to where they are ``alpha`` of the way
+        between the last two ticks for drawing, then put them back.
+        """
+        if not self.settings['INTERPOLATE'] or not self._previous_positions:
+            yield
+            return
+
+        alpha = self.alpha
+        current = []
+        for sprite, x, y in self._previous_positions:
+            cx, cy = sprite.center_x, sprite.center_y
+            current.append((sprite, cx, cy))
+            sprite.position = (x + (cx - x) * alpha, y + (cy - y) * alpha)
+        try:
+            yield
+        finally:
+            for sprite, cx, cy in current:
+                sprite.position = (cx, cy)
+
+    def step(self, delta_time: Optional[float] = None):
+        if delta_time is None:
+            delta_time = self.tick_delta_time
+        start = time.perf_counter()
+        self.physics_engine.step(delta_time)
+        self.collisions.resolve(self)
+        self.scheduler.advance(delta_time)
+        if self.play_zone is not None:
+            self.play_zone.update(delta_time)
+        self.explosions.update(delta_time)
+        self.players.update(delta_time)
+
+        self.ticks += 1
+        self.elapsed_time += delta_time
+        self.tick_time = time.perf_counter() - start
+
+    def run(self, steps: int, delta_time: Optional[float] = None):
+        for _ in range(steps):
+            self.step(delta_time)
+
+    def num_players(self):
+        return len(self.players)
+
+    def add_player(self, player,
+                         start_position: pymunk.Vec2d,
+                         input_source: Optional[str]):
+
+        logger.debug(f"Adding player ({player.player_number}) at position {start_position} with input source {input_source}")
+        player.start_position = start_position
+        player.position = start_position
+        player.movement_speed = self.settings['MOVEMENT_SPEED']
+        player.rotation_speed = self.settings['ROTATION_SPEED']
+
+        player.input_source = input_source
+        self.players.append(player)
+        self.add_player_to_pymunk(player)
+
+        self.players_list.append(player)
+        player.setup()
+
+    def add_player_class(self, player):
+        player.visible = True
+        self.add_player_to_pymunk(player)
+        player.setup()
+
+    def spatial_index(self, *spritelists) -> SpatialGrid:
+        key = tuple(id(spritelist) for spritelist in spritelists)
+        entry = self.spatial_indices.get(key)
+        if entry is None:
+            entry = [SpatialGrid(self.settings['SPATIAL_CELL_SIZE']), -1]
+            self.spatial_indices[key] = entry
+
+        grid, built_at = entry
+        if built_at != self.ticks:
+            grid.clear()
+            for spritelist in spritelists:
+                for sprite in spritelist:
+                    grid.insert(sprite, sprite.center_x, sprite.center_y)
+            entry[1] = self.ticks
+
+        return grid
+
+    # Given an object and n spritelists, find the nearest sprite to the object found
+    # within the spritelists
+    def find_nearest_sprite(self, object, *spritelists):
+        nearest = self.spatial_index(*spritelists).nearest(object.center_x, object.center_y, exclude=object)
+        if not nearest:
+            return None, float('inf'), (0.0, 0.0)
+
+        distance_sq, nearest_sprite = nearest[0]
+        return nearest_sprite, math.sqrt(distance_sq), x_y_distance_sprite(object, nearest_sprite)
+
+    def find_nearest_sprites(self, object, k, *spritelists):
+        """Return the ``k`` nearest (sprite, distance) pairs, nearest first."""
+        nearest = self.spatial_index(*spritelists).nearest(object.center_x, object.center_y, k=k, exclude=object)
+        return [(sprite, math.sqrt(distance_sq)) for distance_sq, sprite in nearest]
+
+    def find_sprites_in_radius(self, object, radius, *spritelists):
+        return self.spatial_index(*spritelists).query_radius(object.center_x, object.center_y, radius, exclude=object)
+
+    def add_explosion(self, position: Tuple, scale: ExplosionSize):
+        self.explosion_pool.spawn(position, scale)
+
+    def add_sprite_to_pymunk(self, object,
+                             moment_of_inertia=arcade.PymunkPhysicsEngine.MOMENT_INF):
+        self.physics_engine.add_sprite(object,
+                                       friction=object.friction,
+                                       elasticity=object.elasticity,
+                                       radius=object._data.radius,
+                                       mass=object.mass,
+                                       moment_of_inertia=moment_of_inertia,
+                                       collision_type=object.type,
+                                       )
+        self.physics_engine.get_physics_object(object).shape.filter = OBJECT_FILTER
+
+    def add_sprites_to_pymunk(self, objects, moments):
+        """
+        Add many space objects to the physics engine in one go, the same
+        bodies and shapes ``add_sprite_to_pymunk`` makes but added to the
+        pymunk space with a single call. The bodies keep pymunk's own
+        velocity function, arcade's python callback only matters for custom
+        damping, gravity or max velocities, which space objects don't use.
+        """
+        engine = self.physics_engine
+        polys = {}
+        items = []
+        for object, moment in zip(objects, moments):
+            key = (id(object.texture), object.scale_x)
+            poly = polys.get(key)
+            if poly is None:
+                poly = [(x * object.scale_x, y * object.scale_x) for x, y in object.hit_box.points]
+                polys[key] = poly
+
+            body = pymunk.Body(object.mass, moment)
+            body.position = (object.center_x, object.center_y)
+            body.angle = math.radians(object.angle)
+            shape = pymunk.Poly(body, poly, radius=object._data.radius)
+            shape.collision_type = self.collision_type_id(object.type)
+            shape.elasticity = object.elasticity
+            shape.friction = object.friction
+            shape.filter = OBJECT_FILTER
+
+            engine.sprites[object] = PymunkPhysicsObject(body, shape)
+            engine.non_static_sprite_list.append(object)
+            object.register_physics_engine(engine)
+            object.body = body
+            object.shape = shape
+            items.append(body)
+            items.append(shape)
+
+        engine.space.add(*items)
+
+    def add_player_to_pymunk(self, player):
+        self.physics_engine.add_sprite(player,
+                                       friction=player.friction,
+                                       elasticity=player.elasticity,
+                                       mass=player.mass,
+                                       moment_of_inertia=arcade.PymunkPhysicsEngine.MOMENT_INF,
+                                       collision_type=CollisionTypes.SHIP.value)
+        self.physics_engine.get_physics_object(player).shape.filter = OBJECT_FILTER
+
+
+def ship_data_from_settings(settings: SettingsManager, sprite: str) -> ShipData:
+    return ShipData(
+        status=ALIVE,
+        sprite=sprite,
+        hitpoints=settings['SHIP_STARTING_HITPOINTS'],
+        mass=settings['SHIP_MASS'],
+        friction=settings['SHIP_FRICTION'],
+        elasticity=settings['SHIP_ELASTICITY'],
+        scaling=settings['SHIP_SCALING'],
+        movement_speed=settings['MOVEMENT_SPEED'],
+        rotation_speed=settings['ROTATION_SPEED'],
+        max_speed=settings['MAX_SPEED']
+    )
+
+
+def setup_headless_pvp(settings: SettingsManager, seed='time', num_players=2) -> Simulation:
+    """
+    Build a PvP match (play zone, space junk, UFOs, bugs and ``num_players``
+    ships) that can be stepped without a window. The ships have no input
+    source, drive them by applying forces to ``ship.body`` and calling
+    ``ship.shoot()``.
+    """
+    simulation = Simulation(settings)
+    simulation.setup()
+
+    simulation.play_zone = create_play_zone(simulation, settings, seed=seed)
+    start_positions = [PVP_START_POSITIONS[i % len(PVP_START_POSITIONS)] for i in range(num_players)]
+    simulation.play_zone.setup(background=False,
+                               boundry=True,
+                               spacejunk=True,
+                               ufo=True,
+                               keep_out=start_positions)
+
+    for i, start_position in enumerate(start_positions):
+        ship = Ship(simulation,
+                    start_position,
+                    ship_data_from_settings(settings, HEADLESS_SHIP_SPRITES[i % len(HEADLESS_SHIP_SPRITES)]))
+        ship.player_number = i
+        simulation.add_player(ship, start_position, None)
+
+    simulation.scoreboard = HeadlessScoreboard(simulation.players_list, settings['Time'])
+    simulation.scoreboard.setup()
+    return simulation
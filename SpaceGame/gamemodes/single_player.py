@@ -14,7 +14,8 @@ from SpaceGame.gametypes.Player import Player
 import arcade
 
 from SpaceGame.gamemodes.basegame import BaseGame
-from SpaceGame.PlayZone import PlayZone
+from SpaceGame.PlayZone import PlayZone, create_play_zone
+from SpaceGame.gamemodes.simulation import SINGLE_PLAYER_START_POSITION
 from SpaceGame.gametypes.Ship import ShipData
 from SpaceGame.scoreboard.scoreboard import Scoreboard, SinglePlayerScoreboard
 from SpaceGame.settings import ALIVE, PLAYER_ONE, PLAYER_TWO, CONTROLLER, KEYBOARD, DEAD
@@ -61,14 +62,12 @@ class SinglePlayer(BaseGame):
         self.scoreboard.setup()
 
     def setup_playzone(self):
-        self.play_zone = PlayZone(self, 
-                                  self.settings,
-                                  self.settings['DEFAULT_BACKGROUND'],
-                                  self.settings['PLAY_ZONE'])
+        self.play_zone = create_play_zone(self, self.settings)
         self.play_zone.setup(background=True,
                              boundry=True,
                              spacejunk=True,
-                             ufo=True
+                             ufo=True,
+                             keep_out=[SINGLE_PLAYER_START_POSITION]
                             )
 
     def setup_players(self):
@@ -100,7 +99,7 @@ class SinglePlayer(BaseGame):
         player.player_number = 0  # Set player number based on order
 
         self.add_player(player,
-                        pymunk.Vec2d(200, 200),
+                        SINGLE_PLAYER_START_POSITION,
                         KEYBOARD,
                         )
 
@@ -130,15 +129,17 @@ class SinglePlayer(BaseGame):
         pass
 
     def on_draw(self):
-        for player in range(len(self.players)):
-            self.cameras[player].use()
-            self.clear()
-            self.play_zone.draw()
-            self.players_list[player].draw()
-            self.players.draw()
-            self.healthBars.draw()
-            self.bullets.draw()
-            self.explosions.draw()
+        with self.simulation.interpolated():
+            self.begin_draw()
+            for player in range(len(self.players)):
+                self.cameras[player].use()
+                self.clear()
+                self.play_zone.draw(self.culler, player)
+                self.players_list[player].draw()
+                self.culler.draw(self.players, player)
+                self.culler.draw(self.healthBars, player)
+                self.culler.draw(self.bullets, player)
+                self.culler.draw(self.explosions, player)
 
         self.scoreboard.on_draw()
 
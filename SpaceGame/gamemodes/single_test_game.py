@@ -82,14 +82,16 @@ class SinglePlayerTest(BaseGame):
         pass
 
     def on_draw(self):
-        for player in range(len(self.players)):
-            self.cameras[player].use()
-            self.clear()
-            self.play_zone.draw()
-            self.players.draw()
-            self.healthBars.draw()
-            self.bullets.draw()
-            self.explosions.draw()
+        with self.simulation.interpolated():
+            self.begin_draw()
+            for player in range(len(self.players)):
+                self.cameras[player].use()
+                self.clear()
+                self.play_zone.draw(self.culler, player)
+                self.culler.draw(self.players, player)
+                self.culler.draw(self.healthBars, player)
+                self.culler.draw(self.bullets, player)
+                self.culler.draw(self.explosions, player)
 
     def reset(self):
         for player in self.players:
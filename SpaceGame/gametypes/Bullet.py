@@ -1,48 +1,199 @@
 import arcade
 import math
+import weakref
 
-from SpaceGame.gametypes.PlayZoneTypes import CollisionTypes
+import pymunk
 
+from SpaceGame.gametypes.PlayZoneTypes import BOUNDARY_CATEGORY, BULLET_CATEGORY, CollisionTypes
+
+BULLET_SPRITE_FILE = ":sprites:png/sprites/Lasers/laserBlue01.png"
 BULLET_MASS = 0.005
 BULLET_FRICTION = 0.0
 BULLET_VELOCITY = 500.0
+# Muzzle speed (pixels a second), what one tick of BULLET_VELOCITY force gave at 60 ticks a second
+BULLET_SPEED = BULLET_VELOCITY / BULLET_MASS / 60.0
 BULLET_ROTATION_OFFSET = math.pi / 2.0
 BULLET_SPAWN_OFFSET = 65.0
 BULLET_DAMAGE = 1
+# Bullets within this distance of the play zone's edge are retired
+BULLET_EDGE_MARGIN = 29.0
+
+BULLET_POOL_SIZE = 128
+
+ALL_CATEGORIES = pymunk.ShapeFilter.ALL_CATEGORIES()
 
 
 class Bullet(arcade.Sprite):
-    def __init__(self, main, start_position, angle, start_dx, start_dy, creator, spawn_offset=BULLET_SPAWN_OFFSET):
-        self.sprite_file = ":sprites:png/sprites/Lasers/laserBlue01.png"
+    """
+    A bullet and its pymunk body/shape. Bullets are created once by a
+    ``BulletPool`` and then fired and deactivated over and over. While
+    inactive the body and shape are kept but taken out of the pymunk space
+    and the physics engine.
+
+    Nothing checks bullets every frame. They are retired when they hit
+    something, touch the play zone's boundary sensor or when their lifetime
+    timer on the shared scheduler runs out.
+    """
+    def __init__(self, main, pool=None):
+        self.sprite_file = BULLET_SPRITE_FILE
         super().__init__(self.sprite_file)
         self.main = main
-        self.creator = creator
+        self.pool = pool
+        self.creator = None
+        self.active = False
         self.mass = BULLET_MASS
         self.damage = BULLET_DAMAGE
         self.friction = BULLET_FRICTION
-        self.center_x = start_position[0] + spawn_offset * math.cos(angle + BULLET_ROTATION_OFFSET)
-        self.center_y = start_position[1] + spawn_offset * math.sin(angle + BULLET_ROTATION_OFFSET)
+        self.dx = 0.0
+        self.dy = 0.0
+        self.expiry = None
+
         self.main.physics_engine.add_sprite(self,
                                             friction=self.friction,
                                             mass=self.mass,
                                             moment_of_inertia=arcade.PymunkPhysicsEngine.MOMENT_INF,
                                             collision_type=CollisionTypes.BULLET.value)
 
-        self.body = self.main.physics_engine.get_physics_object(self).body
-        self.shape = self.main.physics_engine.get_physics_object(self).shape
+        self.physics_object = self.main.physics_engine.get_physics_object(self)
+        self.body = self.physics_object.body
+        self.shape = self.physics_object.shape
+        if self.pool is not None:
+            self.pool.by_shape[self.shape] = self
+        self._park()
+
+    def _park(self):
+        # Removes us from main.bullets and from the physics engine (and so
+        # the pymunk space), self.body and self.shape are kept for reuse.
+        self.remove_from_sprite_lists()
+
+    def _unpark(self):
+        engine = self.main.physics_engine
+        engine.sprites[self] = self.physics_object
+        engine.non_static_sprite_list.append(self)
+        engine.space.add(self.body, self.shape)
+        self.register_physics_engine(engine)
+        self.main.bullets.append(self)
+
+    def fire(self, start_position, angle, creator, spawn_offset=BULLET_SPAWN_OFFSET, shape_filter=None):
+        self.creator = creator
+        if shape_filter is not None:
+            self.shape.filter = shape_filter
+        self.center_x = start_position[0] + spawn_offset * math.cos(angle + BULLET_ROTATION_OFFSET)
+        self.center_y = start_position[1] + spawn_offset * math.sin(angle + BULLET_ROTATION_OFFSET)
+        self.angle = -math.degrees(angle)
 
-        self.angle = angle
+        self.body.position = (self.center_x, self.center_y)
         self.body.angle = angle
+        self.dy = (math.cos(angle) * BULLET_SPEED)
+        self.dx = - (math.sin(angle) * BULLET_SPEED)
+        self.body.velocity = (self.dx, self.dy)
+        self.body.angular_velocity = 0.0
 
-        self.dy = (math.cos(angle) * BULLET_VELOCITY)
-        self.dx = - (math.sin(angle) * BULLET_VELOCITY)
-        self.body.apply_force_at_world_point((self.dx, self.dy), (self.center_x, self.center_y))
+        self._unpark()
+        self.active = True
+        self.expiry = self.main.scheduler.schedule(self.main.settings['BULLET_LIFETIME'], self.deactivate)
 
-        self.main.bullets.append(self)
+    def deactivate(self):
+        if not self.active:
+            return
+
+        self.active = False
+        if self.expiry is not None:
+            self.main.scheduler.cancel(self.expiry)
+            self.expiry = None
+        # Don't keep a dead shooter alive from the pool
+        self.creator = None
+        self._park()
+
+        if self.pool is not None:
+            self.pool.release(self)
+
+
+class BulletPool:
+    """
+    Fixed capacity pool of ``Bullet`` sprites with their pymunk bodies
+    already created. ``fire`` reuses an inactive bullet (a hit) or creates a
+    new one when the pool is empty (a miss). Deactivated bullets go back to
+    the pool until it holds ``capacity`` bullets, the rest are dropped.
+
+    Each shooter gets a pymunk collision group shared by its own shape and
+    its bullets, so pymunk never reports a shooter hitting itself, and with
+    ``bullets_collide`` off bullet pairs are filtered out as well. Shooters
+    are only weakly referenced, their group is handed out again once a
+    shooter is gone (its bullets hold on to it while they fly).
+    """
+    def __init__(self, main, capacity=BULLET_POOL_SIZE, bullets_collide=True):
+        self.main = main
+        self.capacity = capacity
+        self.bullets_collide = bullets_collide
+        self.hits = 0
+        self.misses = 0
+        # pymunk shape -> bullet, for handlers registered with pymunk directly
+        self.by_shape = {}
+        self._groups = weakref.WeakKeyDictionary()
+        self._filters = weakref.WeakKeyDictionary()
+        self._sight_filters = weakref.WeakKeyDictionary()
+        self._next_group = 1
+        self._free_groups = []
+        self._free = [Bullet(main, pool=self) for _ in range(capacity)]
+
+    def shooter_filter(self, creator) -> pymunk.ShapeFilter:
+        """The filter for ``creator``'s bullets, putting ``creator`` in the same group."""
+        group = self._groups.get(creator)
+        if group is None:
+            group = self._new_group(creator)
+            self._groups[creator] = group
+            mask = ALL_CATEGORIES if self.bullets_collide else ALL_CATEGORIES ^ BULLET_CATEGORY
+            self._filters[creator] = pymunk.ShapeFilter(group=group, categories=BULLET_CATEGORY, mask=mask)
+
+        # The shooter's shape is replaced when it respawns, so check every shot
+        physics_object = self.main.physics_engine.sprites.get(creator)
+        shape = physics_object.shape if physics_object is not None else None
+        if shape is not None and shape.filter.group != group:
+            shape.filter = pymunk.ShapeFilter(group=group,
+                                              categories=shape.filter.categories,
+                                              mask=shape.filter.mask)
+
+        return self._filters[creator]
+
+    def _new_group(self, creator) -> int:
+        if self._free_groups:
+            group = self._free_groups.pop()
+        else:
+            group = self._next_group
+            self._next_group += 1
+        weakref.finalize(creator, self._free_groups.append, group)
+        return group
+
+    def sight_filter(self, creator) -> pymunk.ShapeFilter:
+        """A query filter that sees what ``creator``'s bullets would hit, but not bullets or sensors."""
+        shape_filter = self._sight_filters.get(creator)
+        if shape_filter is None:
+            group = self.shooter_filter(creator).group
+            shape_filter = pymunk.ShapeFilter(group=group,
+                                              categories=BULLET_CATEGORY,
+                                              mask=ALL_CATEGORIES ^ BULLET_CATEGORY ^ BOUNDARY_CATEGORY)
+            self._sight_filters[creator] = shape_filter
+        return shape_filter
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def fire(self, start_position, angle, creator, spawn_offset=BULLET_SPAWN_OFFSET) -> Bullet:
+        if self._free:
+            bullet = self._free.pop()
+            self.hits += 1
+        else:
+            bullet = Bullet(self.main, pool=self)
+            self.misses += 1
+
+        bullet.fire(start_position, angle, creator,
+                    spawn_offset=spawn_offset,
+                    shape_filter=self.shooter_filter(creator))
+        return bullet
 
-    def update(self, delta_t):
-        # This should be a collision handler, but for now just remove
-        # it when it gets close to the edges
-        if (self.center_y < 29.0 or self.center_y > 4065.0
-                or self.center_x < 29.0 or self.center_x > 4065.0):
-            self.remove_from_sprite_lists()
+    def release(self, bullet: Bullet):
+        if len(self._free) < self.capacity:
+            self._free.append(bullet)
+        else:
+            del self.by_shape[bullet.shape]
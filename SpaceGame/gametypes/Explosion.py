@@ -32,18 +32,91 @@ explosion_texture = arcade.load_spritesheet(sprite,
 """
 
 
+EXPLOSION_FPS = 60.0
+EXPLOSION_POOL_SIZE = 64
+
+
 class Explosion(arcade.Sprite):
-    def __init__(self, position: Tuple, scale: ExplosionSize):
+    """
+    Explosion animation. Explosions are reused through an ``ExplosionPool``
+    and all of them share the same texture grid. The current frame follows
+    the time since ``start`` (``EXPLOSION_FPS``) rather than the number of
+    updates, so the animation length does not depend on the frame rate.
+    """
+    def __init__(self, pool=None):
         super().__init__(explosion_texture_list[0])
         self.textures = explosion_texture_list
+        self.pool = pool
         self.current_texture = 0
+        self.elapsed = 0.0
+        self.active = False
+
+    def start(self, position: Tuple, scale: ExplosionSize):
         self.center_x = position[0]
         self.center_y = position[1]
         self.scale = scale.value
+        self.elapsed = 0.0
+        self.current_texture = 0
+        self.set_texture(0)
+        self.active = True
+
+    def finish(self):
+        self.active = False
+        self.remove_from_sprite_lists()
+
+        if self.pool is not None:
+            self.pool.release(self)
+
+    def update(self, delta_time=1/60):
+        self.elapsed += delta_time
+        frame = int(self.elapsed * EXPLOSION_FPS)
+        if frame >= len(explosion_texture_list):
+            self.finish()
+            return
 
-    def update(self, dleta):
-        self.current_texture += 1
-        if self.current_texture < len(explosion_texture_list):
-            self.set_texture(self.current_texture)
+        # Swapping textures is only worth it if someone can see us
+        if frame != self.current_texture and (self.pool is None or self.pool.is_visible(self)):
+            self.current_texture = frame
+            self.set_texture(frame)
+
+
+class ExplosionPool:
+    """
+    Pool of ``Explosion`` sprites, works like ``BulletPool``. Explosions
+    outside all of ``main.view_rects`` (the (left, bottom, right, top) world
+    rectangles of the cameras) skip their texture swaps. With no cameras (a
+    headless simulation) no explosion is visible.
+    """
+    def __init__(self, main, capacity=EXPLOSION_POOL_SIZE):
+        self.main = main
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._free = [Explosion(pool=self) for _ in range(capacity)]
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def spawn(self, position: Tuple, scale: ExplosionSize) -> Explosion:
+        if self._free:
+            explosion = self._free.pop()
+            self.hits += 1
         else:
-            self.remove_from_sprite_lists()
+            explosion = Explosion(pool=self)
+            self.misses += 1
+
+        explosion.start(position, scale)
+        self.main.explosions.append(explosion)
+        return explosion
+
+    def release(self, explosion: Explosion):
+        if len(self._free) < self.capacity:
+            self._free.append(explosion)
+
+    def is_visible(self, explosion: Explosion) -> bool:
+        half_size = explosion_width * explosion.scale_x / 2.0
+        for left, bottom, right, top in self.main.view_rects:
+            if (left - half_size <= explosion.center_x <= right + half_size
+                    and bottom - half_size <= explosion.center_y <= top + half_size):
+                return True
+        return False
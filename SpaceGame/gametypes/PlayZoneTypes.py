@@ -1,9 +1,9 @@
 import copy
+import math
 from dataclasses import dataclass
 from enum import Enum
-from typing import Tuple
+from typing import Optional, Tuple
 
-from PIL import Image
 import arcade
 import pymunk
 
@@ -12,11 +12,50 @@ from SpaceGame.gametypes.Explosion import ExplosionSize
 __all__ = [
     "SpaceObjectData",
     "Background",
+    "TiledBackground",
+    "BackgroundQuad",
     "Wall",
+    "BoundarySensor",
+    "BOUNDARY_CATEGORY",
+    "BULLET_CATEGORY",
+    "OBJECT_FILTER",
     "SpaceObject",
-    "CollisionTypes"
+    "CollisionTypes",
+    "resolve_sprite_path",
+    "load_hit_box_texture",
+    "sprite_dimensions"
 ]
 
+HIT_BOX_DETAIL = 10.0
+
+# Process wide caches so creating many space objects from the same few
+# sprite files only decodes each image and computes each hit box once.
+_resolved_paths = {}
+_hit_box_textures = {}
+
+
+def resolve_sprite_path(spritefile: str) -> str:
+    path = _resolved_paths.get(spritefile)
+    if path is None:
+        path = str(arcade.resources.resolve(spritefile))
+        _resolved_paths[spritefile] = path
+    return path
+
+
+def load_hit_box_texture(spritefile: str, detail: float = HIT_BOX_DETAIL) -> arcade.Texture:
+    """Load (once) the texture for ``spritefile`` with its pymunk hit box."""
+    key = (resolve_sprite_path(spritefile), arcade.hitbox.PymunkHitBoxAlgorithm.__name__, detail)
+    texture = _hit_box_textures.get(key)
+    if texture is None:
+        texture = arcade.load_texture(key[0],
+                                      hit_box_algorithm=arcade.hitbox.PymunkHitBoxAlgorithm(detail=detail))
+        _hit_box_textures[key] = texture
+    return texture
+
+
+def sprite_dimensions(spritefile: str) -> Tuple[int, int]:
+    return load_hit_box_texture(spritefile).size
+
 
 @dataclass
 class SpaceObjectData:
@@ -39,6 +78,101 @@ class Background:
     scale: float
 
 
+class TiledBackground:
+    """
+    ``Background`` tiles covering ``tiles`` play zone tiles plus ``padding``
+    tiles around them, tile (i, j) is centered on (i * width, j * height).
+
+    Only the tiles overlapping the rectangle passed to ``draw`` are drawn.
+    Each view keeps a small SpriteList of tile sprites that is repositioned
+    when the view moves onto a different set of tiles, so the cost depends
+    on the size of the view and not on the size of the play zone. With
+    ``tiles`` None the tiles go on forever and ``draw`` needs a rectangle.
+    """
+    def __init__(self, background: Background, tiles: Optional[Tuple[int, int]], padding: int = 2):
+        self.background = background
+        if tiles is None:
+            self.min_tile = (-math.inf, -math.inf)
+            self.max_tile = (math.inf, math.inf)
+        else:
+            self.min_tile = (-padding, -padding)
+            self.max_tile = (tiles[0] + padding, tiles[1] + padding)
+        self._texture = None
+        # Per view [SpriteList, tile range it is laid out for]
+        self._views = []
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        half_width = self.background.width / 2.0
+        half_height = self.background.height / 2.0
+        return (self.min_tile[0] * self.background.width - half_width,
+                self.min_tile[1] * self.background.height - half_height,
+                self.max_tile[0] * self.background.width + half_width,
+                self.max_tile[1] * self.background.height + half_height)
+
+    def tile_range(self, rect) -> Tuple[int, int, int, int]:
+        """Return the (first i, first j, last i, last j) tiles overlapping ``rect``."""
+        left, bottom, right, top = rect
+        width = self.background.width
+        height = self.background.height
+        return (max(math.floor(left / width + 0.5), self.min_tile[0]),
+                max(math.floor(bottom / height + 0.5), self.min_tile[1]),
+                min(math.floor(right / width + 0.5), self.max_tile[0]),
+                min(math.floor(top / height + 0.5), self.max_tile[1]))
+
+    def _layout(self, sprites: arcade.SpriteList, tile_range):
+        i0, j0, i1, j1 = tile_range
+        count = max(i1 - i0 + 1, 0) * max(j1 - j0 + 1, 0)
+
+        if self._texture is None:
+            self._texture = arcade.load_texture(self.background.image)
+        while len(sprites) < count:
+            sprites.append(arcade.Sprite(self._texture))
+        while len(sprites) > count:
+            sprites.pop()
+
+        index = 0
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                sprites[index].position = (i * self.background.width, j * self.background.height)
+                index += 1
+
+    def visible_tiles(self, rect, view: int = 0) -> arcade.SpriteList:
+        while len(self._views) <= view:
+            self._views.append([arcade.SpriteList(), None])
+
+        entry = self._views[view]
+        tile_range = self.tile_range(rect)
+        if tile_range != entry[1]:
+            self._layout(entry[0], tile_range)
+            entry[1] = tile_range
+        return entry[0]
+
+    def draw(self, rect=None, view: int = 0):
+        self.visible_tiles(rect or self.bounds, view).draw()
+
+
+class BackgroundQuad:
+    """
+    The whole padded background as one quad with a repeating texture, its
+    cost is the same whatever the size of the play zone. Needs a window as
+    the texture is uploaded straight to the GPU.
+    """
+    def __init__(self, background: Background, tiles: Tuple[int, int], padding: int = 2):
+        # Only available in newer arcade versions, so imported on use
+        from arcade.future.background import Background as RepeatingBackground
+
+        self.bounds = TiledBackground(background, tiles, padding).bounds
+        left, bottom, right, top = self.bounds
+        self.quad = RepeatingBackground.from_file(background.image,
+                                                  pos=(left, bottom),
+                                                  size=(int(right - left), int(top - bottom)),
+                                                  scale=background.scale)
+
+    def draw(self, rect=None, view: int = 0):
+        self.quad.draw()
+
+
 class Wall:
     def __init__(self,
                  start: Tuple[float, float],
@@ -54,27 +188,51 @@ class Wall:
         self.segment.elasticity = elasticity
 
 
+# Pymunk category bit for bullets. Leaving it out of a bullet's mask stops
+# bullets colliding with each other.
+BULLET_CATEGORY = 1 << 1
+# Pymunk category bit of the boundary sensor, so queries can leave it out
+BOUNDARY_CATEGORY = 1 << 2
+# Ships, space junk and enemies are in every category but those two, so the
+# boundary sensor (masked to bullets) never pairs with them
+OBJECT_FILTER = pymunk.ShapeFilter(categories=pymunk.ShapeFilter.ALL_CATEGORIES() ^ BULLET_CATEGORY ^ BOUNDARY_CATEGORY)
+
+
+class BoundarySensor:
+    """
+    Sensor segments ``margin`` thick just inside the edges of a
+    ``width`` x ``height`` play zone. Nothing bounces off them, pymunk only
+    reports what touches them, so bullets leaving the play zone are retired
+    by a collision handler instead of a per-frame position check.
+    """
+    def __init__(self, width: float, height: float, margin: float, collision_type: int):
+        self.body = pymunk.Body(body_type=pymunk.Body.STATIC)
+        corners = [(0.0, 0.0), (width, 0.0), (width, height), (0.0, height)]
+        self.segments = []
+        for start, end in zip(corners, corners[1:] + corners[:1]):
+            segment = pymunk.Segment(self.body, start, end, margin)
+            segment.sensor = True
+            # Only bullets, so nothing else near the edges makes arbiters
+            segment.filter = pymunk.ShapeFilter(categories=BOUNDARY_CATEGORY, mask=BULLET_CATEGORY)
+            segment.collision_type = collision_type
+            self.segments.append(segment)
+
+    def add_to_space(self, space: pymunk.Space):
+        space.add(self.body, *self.segments)
+
+
 class SpaceObject(arcade.Sprite):
     def __init__(self, properties: SpaceObjectData, main):
         self.shape = None
-        self._data = copy.deepcopy(properties)
+        # Every field is immutable, a shallow copy is enough
+        self._data = copy.copy(properties)
         self.main = main
         self.body = None
-        width, height = self._calulate_sprite_dims(self._data.spritefile)
-        super().__init__(self._data.spritefile,
-                         hit_box_algorithm=arcade.hitbox.PymunkHitBoxAlgorithm(detail=10.0),
-                         width=width,
-                         height=height,
+        self.last_hit_by = None
+        super().__init__(load_hit_box_texture(self._data.spritefile),
                          scale=self._data.scale)
         self.sync_hit_box_to_texture()
 
-    def _calulate_sprite_dims(self, spritefile):
-        image = Image.open(arcade.resources.resolve(spritefile))
-        width = image.width
-        height = image.height
-        image.close()
-        return width, height
-
     def setup(self):
         self.main.add_sprite_to_pymunk(self,
                                        moment_of_inertia=pymunk.moment_for_box(self.mass, (self.width, self.height)))
@@ -88,13 +246,24 @@ class SpaceObject(arcade.Sprite):
     def damage(self, bullet):
         self._data.health -= bullet.damage
         self.last_hit_by = bullet.creator
+        # Only damaged space junk is updated
+        self.main.play_zone.damaged.add(self)
+
+    def hit_by_player(self) -> bool:
+        # UFO bullets blow things up too, but only players keep score
+        return getattr(self.last_hit_by, 'player_number', None) is not None
 
     def explode(self):
         self.remove_from_sprite_lists()
         self.main.add_explosion(self.position, ExplosionSize.NORMAL)
-        self.main.scoreboard.add_score(self.last_hit_by, self.score)
-        self.last_hit_by.add_score(self.score)  
-        self.last_hit_by.add_space_junk_blown_up()
+        if self.hit_by_player():
+            self.main.scoreboard.add_score(self.last_hit_by, self.score)
+            self.last_hit_by.add_score(self.score)
+            self.last_hit_by.add_space_junk_blown_up()
+
+    def despawn(self):
+        """Take it out of the match without an explosion or a score."""
+        self.remove_from_sprite_lists()
 
     @property
     def score(self) -> int:
@@ -136,3 +305,4 @@ class CollisionTypes(Enum):
     ASTROID = "ASTROID"
     UFO = "UFO"
     BUG = "BUG"
+    BOUNDARY = "BOUNDARY"
@@ -160,7 +160,8 @@ class Player(Ship):
                          self._playerData.shipData
                          )
 
-        self.timers = TimerManager()
+        # Created in setup, once we know which simulation clock to run on.
+        self.timers: Optional[TimerManager] = None
 
     def register_with_settings(self):
         super().register_with_settings()
@@ -182,6 +183,7 @@ class Player(Ship):
     def setup(self):
         logger.debug(f"Setting up Player: ({self.player_name}, {self.player_name})")
         super().setup()
+        self.timers = TimerManager(self.main.scheduler)
         self.damping_text = arcade.Text(
             text=f"Damping Text",
             x=self.position[0],
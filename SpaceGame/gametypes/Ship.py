@@ -2,7 +2,6 @@ from dataclasses import dataclass
 import arcade
 import pymunk
 
-from SpaceGame.gametypes.Bullet import Bullet
 from SpaceGame.gametypes.Explosion import ExplosionSize
 from SpaceGame.gametypes.HealthBar import HealthBar
 from SpaceGame.settings import ALIVE, DEAD, Setting
@@ -137,12 +136,9 @@ class Ship(arcade.Sprite):
 
     def shoot(self):
         if self.status is ALIVE:
-            Bullet(self.main,
-                   (self.center_x, self.center_y),
-                   self.body.angle,
-                   self.body.velocity[0],
-                   self.body.velocity[1],
-                   self)
+            self.main.bullet_pool.fire((self.center_x, self.center_y),
+                                       self.body.angle,
+                                       self)
             self.num_shots += 1
 
     def explode(self):
@@ -253,6 +249,9 @@ class Ship(arcade.Sprite):
     def add_ufo_death(self):
         pass
 
+    def add_ufo_kill(self):
+        pass
+
     def add_distance_flown(self, distance):
         pass
     
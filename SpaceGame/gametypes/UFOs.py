@@ -5,9 +5,12 @@ import math
 import random
 from typing import Tuple
 
-from SpaceGame.gametypes.Bullet import Bullet
+import numpy as np
+
+from SpaceGame.gametypes.Bullet import BULLET_SPEED
 from SpaceGame.gametypes.Explosion import ExplosionSize
 from SpaceGame.gametypes.PlayZoneTypes import CollisionTypes, SpaceObject, SpaceObjectData
+from SpaceGame.shared.maths import lead_points
 
 UFO_HEALTH = 5
 UFO_MASS = 0.5
@@ -16,6 +19,8 @@ UFO_ELASTICITY = 0.9
 UFO_RADIUS = 1.0
 UFO_SCALE = 1.0
 UFO_SHOOT_DISTANCE = 625.0
+# Seconds between shots
+UFO_GUN_COOLDOWN = 5.0
 
 UFO_BULLET_SPAWN_OFFSET = 100.0
 
@@ -108,10 +113,10 @@ UFOS = [RED_UFO, BLUE_UFO, GREEN_UFO, YELLOW_UFO]
 
 UFO_RES_DIR = ":sprites:png/sprites/Ships/"
 
-def random_name():
-    return random.choice(["Bill",
-                          "Bob",
-                          "Steve"])
+def random_name(rng=random):
+    return rng.choice(["Bill",
+                       "Bob",
+                       "Steve"])
 
 
 ALIVE = True
@@ -121,7 +126,7 @@ UFO_SCORE = 75
 
 
 class UFO(SpaceObject):
-    def __init__(self, props: UFOData, main):
+    def __init__(self, props: UFOData, main, name=None):
         self.props = props
         self.main = main
         self.status = ALIVE
@@ -137,10 +142,12 @@ class UFO(SpaceObject):
                          main)
         self.gun_cooldown = 0
         self.range = UFO_SHOOT_DISTANCE
-        self.name = random_name()
+        self.name = name if name is not None else random_name()
         self.cnt = 0
-        self.gun_fired_normal = 300
+        self.gun_fired_normal = UFO_GUN_COOLDOWN
         self.target_angle = 0
+        # Where the shot at the target is aimed
+        self.aim_point = None
         self.hitpoints = 15
 
     def print_diag(self):
@@ -150,13 +157,15 @@ class UFO(SpaceObject):
     def explode(self):
         self.remove_from_sprite_lists()
         self.main.add_explosion(self.position, ExplosionSize.BIG)
-        self.main.scoreboard.add_score(self.last_hit_by, self.score)
-        self.last_hit_by.add_score(self.score)
-        self.last_hit_by.add_ufo_kill()
+        if self.hit_by_player():
+            self.main.scoreboard.add_score(self.last_hit_by, self.score)
+            self.last_hit_by.add_score(self.score)
+            self.last_hit_by.add_ufo_kill()
 
     def damage(self, bullet):
         self.hitpoints -= bullet.damage 
         self.last_hit_by = bullet.creator
+        self.main.play_zone.touch(self)
 
     def update(self, delta_t):
         if self.hitpoints <= 0:
@@ -173,18 +182,30 @@ class UFO(SpaceObject):
         if self.decide_to_move():
             self.move()
 
-        self.gun_cooldown -= 1
+        # Seconds, the LOD scheduler doesn't update us every tick
+        self.gun_cooldown -= delta_t
 
     def find_angle_to_target(self, target):
         return math.atan2((target.center_y - self.center_y), (target.center_x - self.center_x)) - math.pi / 2
 
+    def find_lead_angle_to_target(self, target):
+        """Aim where ``target`` will be when the bullet gets there, that point is kept in ``aim_point``."""
+        offset = [(target.center_x - self.center_x, target.center_y - self.center_y)]
+        velocity = [tuple(target.body.velocity)]
+        aim_x, aim_y = lead_points(offset, velocity, BULLET_SPEED, UFO_BULLET_SPAWN_OFFSET)[0]
+        self.aim_point = (self.center_x + float(aim_x), self.center_y + float(aim_y))
+        return math.atan2(aim_y, aim_x) - math.pi / 2
+
     def find_target(self):
         self.target, self.target_distance, _ = self.main.find_nearest_sprite(self, self.main.players)
 
         if self.target_distance > self.range:
             self.target = None
+        elif self.main.settings['UFO_LEAD_TARGETING']:
+            self.target_angle = self.find_lead_angle_to_target(self.target)
         else:  # Only run find_angle if we have a target
             self.target_angle = self.find_angle_to_target(self.target)
+            self.aim_point = (self.target.center_x, self.target.center_y)
 
     def target_in_range(self):
         return self.target and (self.target_distance < self.range)
@@ -195,10 +216,19 @@ class UFO(SpaceObject):
         return False
 
     def decide_to_shoot(self):
-        if self.target_in_range() and self.gun_cooleddown():
+        if self.target_in_range() and self.gun_cooleddown() and self.target_in_sight():
             return True
         return False
 
+    def target_in_sight(self):
+        # Where the bullet would be fired from
+        angle = self.target_angle + math.pi / 2
+        start = (self.center_x + UFO_BULLET_SPAWN_OFFSET * math.cos(angle),
+                 self.center_y + UFO_BULLET_SPAWN_OFFSET * math.sin(angle))
+        return self.main.play_zone.sight.is_clear(self, self.target, start,
+                                                  self.main.bullet_pool.sight_filter(self),
+                                                  end=self.aim_point)
+
     def decide_to_move(self):
         pass
 
@@ -206,13 +236,10 @@ class UFO(SpaceObject):
         self.gun_cooldown = self.gun_fired_normal
 
         if self.status is ALIVE:
-            Bullet(self.main,
-                   (self.center_x, self.center_y),
-                   self.target_angle,
-                   self.body.velocity[0],
-                   self.body.velocity[1],
-                   self,
-                   spawn_offset=UFO_BULLET_SPAWN_OFFSET)
+            self.main.bullet_pool.fire((self.center_x, self.center_y),
+                                       self.target_angle,
+                                       self,
+                                       spawn_offset=UFO_BULLET_SPAWN_OFFSET)
 
     def move(self):
         pass
@@ -238,6 +265,119 @@ class UFO(SpaceObject):
 
 
 
+class UFOSquadron:
+    """
+    Runs the AI of every UFO in ``ufos`` at once. The UFOs' cooldowns,
+    ranges and reload times are kept in NumPy arrays and each tick the
+    distances to the players, the targets, the firing angles and the
+    cooldowns are worked out for all of them together, only the UFOs that
+    fire are touched from Python. Does the same as calling ``UFO.update`` on
+    each UFO.
+
+    The arrays are rebuilt when the UFOs in ``ufos`` change, the cooldowns
+    are written back to the UFOs first so nothing is lost.
+    """
+    def __init__(self, main, ufos):
+        self.main = main
+        self.ufos = ufos
+        self.members = []
+        self.touched = set()
+        self.cooldowns = np.zeros(0)
+        self.ranges = np.zeros(0)
+        self.reload_times = np.zeros(0)
+
+    def __len__(self):
+        return len(self.members)
+
+    def touch(self, ufo: UFO):
+        """``ufo`` was damaged, check it for death on the next update."""
+        self.touched.add(ufo)
+
+    def sync(self):
+        members = list(self.ufos)
+        if members == self.members:
+            return
+
+        for ufo, cooldown in zip(self.members, self.cooldowns):
+            ufo.gun_cooldown = float(cooldown)
+
+        self.members = members
+        self.cooldowns = np.array([ufo.gun_cooldown for ufo in members], dtype=float)
+        self.ranges = np.array([ufo.range for ufo in members], dtype=float)
+        self.reload_times = np.array([ufo.gun_fired_normal for ufo in members], dtype=float)
+
+    def update(self, delta_time: float):
+        for ufo in self.touched:
+            if ufo.hitpoints <= 0 and ufo.sprite_lists:
+                ufo.explode()
+        self.touched = set()
+
+        self.sync()
+        if not self.members:
+            return
+
+        players = self.main.players
+        if players:
+            self.fire_at(players)
+        self.cooldowns -= delta_time
+
+    def fire_at(self, players):
+        positions = np.array([ufo.position for ufo in self.members])
+        targets = np.array([player.position for player in players])
+
+        # (UFOs, players) offsets, each UFO locks onto its nearest player
+        offsets = targets[None, :, :] - positions[:, None, :]
+        distances = (offsets ** 2).sum(axis=2)
+        nearest = distances.argmin(axis=1)
+        index = np.arange(len(self.members))
+        target_offsets = offsets[index, nearest]
+        target_distances = np.sqrt(distances[index, nearest])
+
+        ready = np.flatnonzero((target_distances < self.ranges) & (self.cooldowns <= 0.0))
+        if len(ready) == 0:
+            return
+
+        # Where each shot is aimed, ahead of a moving target with lead
+        # targeting on
+        if self.main.settings['UFO_LEAD_TARGETING']:
+            velocities = np.array([tuple(player.body.velocity) for player in players])
+            aims = lead_points(target_offsets[ready],
+                               velocities[nearest[ready]],
+                               BULLET_SPEED,
+                               UFO_BULLET_SPAWN_OFFSET)
+        else:
+            aims = target_offsets[ready]
+
+        # Bullets are fired from UFO_BULLET_SPAWN_OFFSET along the aim, only
+        # fire the ones with nothing in the way of the shot
+        lengths = np.sqrt((aims ** 2).sum(axis=1))
+        starts = positions[ready] + UFO_BULLET_SPAWN_OFFSET * aims / np.maximum(lengths, 1e-9)[:, None]
+        ends = positions[ready] + aims
+        pool = self.main.bullet_pool
+        ready_ufos = [self.members[i] for i in ready]
+        in_sight = self.main.play_zone.sight.are_clear(ready_ufos,
+                                                       [players[i] for i in nearest[ready]],
+                                                       starts, ends,
+                                                       [pool.sight_filter(ufo) for ufo in ready_ufos])
+        shooters = ready[in_sight]
+        if len(shooters) == 0:
+            return
+
+        angles = np.arctan2(aims[in_sight, 1], aims[in_sight, 0]) - math.pi / 2
+        self.cooldowns[shooters] = self.reload_times[shooters]
+
+        for i, angle, end in zip(shooters, angles, ends[in_sight]):
+            ufo = self.members[i]
+            ufo.target = players[nearest[i]]
+            ufo.target_distance = float(target_distances[i])
+            ufo.target_angle = float(angle)
+            ufo.aim_point = (float(end[0]), float(end[1]))
+            if ufo.status is ALIVE:
+                self.main.bullet_pool.fire((ufo.center_x, ufo.center_y),
+                                           ufo.target_angle,
+                                           ufo,
+                                           spawn_offset=UFO_BULLET_SPAWN_OFFSET)
+
 
 def UFOGenerator():
     pass
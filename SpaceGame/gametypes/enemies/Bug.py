@@ -4,14 +4,14 @@ from enum import Enum
 from dataclasses import dataclass
 import math
 import random
-from typing import Tuple
+from typing import List, Optional, Tuple
 import numpy as np
 
 from SpaceGame.gametypes.Bullet import Bullet
 from SpaceGame.gametypes.Explosion import ExplosionSize
 from SpaceGame.gametypes.PlayZoneTypes import CollisionTypes, SpaceObject, SpaceObjectData
 from SpaceGame.shared.LQR import Lqr
-from SpaceGame.shared.PID import Pid, PidData, PidInput
+from SpaceGame.shared.PID import PidBank, PidInput
 from SpaceGame.shared.timer import TimerManager
 
 HEALTH = 5
@@ -31,9 +31,87 @@ DEAD = False
 
 BUG_SCORE = 10
 
+# Bugs the spawn director keeps alive, by difficulty
+BUG_DIFFICULTY = [1, 2, 3, 4, 6, 8]
+
+# The PIDs were tuned with a dt of one per 60Hz tick
+PID_TIME_STEP = 1.0 / 60.0
+# Distance (pixels) the bugs' PIDs steer to from their target
+PID_SETPOINT = 100
+
+BUG_PID_INPUT = PidInput(kp=0.5,
+                         ki=0.00002,
+                         kd=75.0,
+                         tau=0.0,
+                         lim_min=-200,
+                         lim_max=200,
+                         lim_min_init=0.0,
+                         lim_max_init=5.0,
+                         )
+
+
+class BugSteering:
+    """
+    The PID controllers of every PID steered bug, an x and a y controller
+    each in one ``PidBank``. ``Bug.move_towards`` queues the bug's distance
+    to its target and ``apply``, called once per tick after the bugs have
+    been updated, steps all the queued controllers in one call and pushes
+    the bugs.
+    """
+    def __init__(self, pid_input: PidInput = BUG_PID_INPUT):
+        self.bank = PidBank(pid_input)
+        self._bugs: List = []
+        self._slots: List[int] = []
+        self._distances: List[float] = []
+        self._delta_times: List[float] = []
+
+    def __len__(self) -> int:
+        """Number of bugs steered."""
+        return len(self.bank) // 2
+
+    def allocate(self) -> Tuple[int, int]:
+        return self.bank.allocate(), self.bank.allocate()
+
+    def release(self, slots: Tuple[int, int]):
+        for slot in slots:
+            self.bank.release(slot)
+
+    def steer(self, bug, x_dist: float, y_dist: float, delta_time: float):
+        self._bugs.append(bug)
+        self._slots.extend(bug.pid_slots)
+        self._distances.extend((x_dist, y_dist))
+        self._delta_times.append(delta_time)
+
+    def apply(self):
+        if not self._bugs:
+            return
+
+        delta_times = np.array(self._delta_times)
+        outputs = self.bank.update(PID_SETPOINT,
+                                   np.array(self._distances),
+                                   np.repeat(delta_times / PID_TIME_STEP, 2),
+                                   index=self._slots)
+
+        # The same momentum as applying the force every tick, however long
+        # it has been since each bug's last update
+        for bug, (dx, dy), dt in zip(self._bugs, outputs.reshape(-1, 2).tolist(), self._delta_times):
+            bug.dx = dx
+            bug.dy = dy
+            bug.body.apply_impulse_at_world_point((dx * dt, dy * dt), (bug.center_x, bug.center_y))
+
+        self._bugs = []
+        self._slots = []
+        self._distances = []
+        self._delta_times = []
+
 
 class Bug(SpaceObject):
-    def __init__(self, main):
+    def __init__(self, main, pid_steering: bool = True):
+        """
+        ``pid_steering`` False leaves out the PID controllers, for bugs
+        steered by a ``BugSwarm``. Otherwise ``setup`` gives the bug a pair
+        of controllers in the play zone's ``BugSteering``.
+        """
         self.main = main
         self.status = ALIVE
         super().__init__(SpaceObjectData(SPRITE_FILE,
@@ -53,52 +131,59 @@ class Bug(SpaceObject):
         self.target_angle = 0
         self.hitpoints = 15
         self.bug_dis = 10
-        self.pid_input = PidInput(kp=0.5,
-                                  ki=0.00002,
-                                  kd=75.0,
-                                  tau=0.0,
-                                  lim_min=-200,
-                                  lim_max=200,
-                                  lim_min_init=0.0,
-                                  lim_max_init=5.0,
-                                  )
-        pid_debug = False
-        self.x_pid = Pid(self.pid_input, debug=pid_debug)
-        self.y_pid = Pid(self.pid_input, debug=pid_debug)
-        self.timers = TimerManager()
+        self.timers = TimerManager(main.scheduler)
         self.dx = 0
         self.dy = 0
+        self.pid_steering = pid_steering
+        # (x, y) slots in the play zone's BugSteering bank
+        self.pid_slots: Optional[Tuple[int, int]] = None
+
+        if pid_steering:
+            self.timers.add('pid', .01, restart=True)
+
+    def setup(self):
+        super().setup()
+        if self.pid_steering:
+            self.pid_slots = self.main.play_zone.bug_steering.allocate()
 
-        self.timers.add('pid', .01, restart=True)
+    def release_pids(self):
+        if self.pid_slots is not None:
+            self.main.play_zone.bug_steering.release(self.pid_slots)
+            self.pid_slots = None
 
     def print_diag(self):
         print(
             f"{self.name} ({self.position}) - Locked onto: '{self.target}' - {self.target_distance} - {self.target_angle}")
 
     def explode(self):
+        self.release_pids()
         self.remove_from_sprite_lists()
         self.main.add_explosion(self.position, ExplosionSize.BIG)
-        self.main.scoreboard.add_score(self.last_hit_by, self.score)
+        if self.hit_by_player():
+            self.main.scoreboard.add_score(self.last_hit_by, self.score)
+
+    def despawn(self):
+        self.timers.remove('pid')
+        self.release_pids()
+        super().despawn()
 
     def damage(self, bullet: Bullet):
         self.hitpoints -= bullet.damage
         self.last_hit_by = bullet.creator
+        self.main.play_zone.touch(self)
 
     def update(self, delta_t):
         if self.hitpoints <= 0:
             self.explode()
         nearest_bug, dis, angle, x_y_dist = self.find_nearest_sprite(self.main.players, 10000000)
         if nearest_bug and dis > self.bug_dis:
-            self.move_towards(nearest_bug, x_y_dist, 1)
+            self.move_towards(nearest_bug, x_y_dist, delta_t)
 
     def move_towards(self, target, xy_dist, dt):
-        x_dist = xy_dist[0]
-        y_dist = xy_dist[1]
-
-        self.dx = self.x_pid.update(100, x_dist, dt)
-        self.dy = self.y_pid.update(100, y_dist, dt)
-
-        self.body.apply_force_at_world_point((self.dx, self.dy), (self.center_x, self.center_y))
+        # Exploded bugs have given their controllers back
+        if self.pid_slots is None:
+            return
+        self.main.play_zone.bug_steering.steer(self, xy_dist[0], xy_dist[1], dt)
 
     def find_angle_to_target(self, target):
         return math.atan2((target.center_y - self.center_y), (target.center_x - self.center_x)) - math.pi / 2
@@ -127,13 +212,10 @@ class Bug(SpaceObject):
         self.gun_cooldown = self.gun_fired_normal
 
         if self.status is ALIVE:
-            Bullet(self.main,
-                   (self.center_x, self.center_y),
-                   self.target_angle,
-                   self.body.velocity[0],
-                   self.body.velocity[1],
-                   self.type,
-                   spawn_offset=BULLET_SPAWN_OFFSET)
+            self.main.bullet_pool.fire((self.center_x, self.center_y),
+                                       self.target_angle,
+                                       self,
+                                       spawn_offset=UFO_BULLET_SPAWN_OFFSET)
 
     def move(self):
         pass
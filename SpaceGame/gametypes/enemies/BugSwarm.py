@@ -0,0 +1,151 @@
+from typing import List
+
+import arcade
+import numpy as np
+import pymunk
+
+from SpaceGame.gametypes.enemies.Bug import Bug
+from SpaceGame.shared.spatial import NeighbourGrid
+
+# Distance (pixels) a bug sees its neighbours from
+SWARM_VIEW_RADIUS = 80.0
+# Neighbours closer than this are steered away from
+SWARM_SEPARATION_RADIUS = 30.0
+SWARM_MAX_SPEED = 250.0
+# Most a bug's velocity can change in a second
+SWARM_MAX_ACCELERATION = 600.0
+
+SWARM_SEPARATION_WEIGHT = 1.5
+SWARM_ALIGNMENT_WEIGHT = 1.0
+SWARM_COHESION_WEIGHT = 1.0
+SWARM_HOMING_WEIGHT = 1.2
+
+# Pymunk category of swarm bugs, left out of their own mask so the swarm
+# doesn't collide with itself (separation keeps them apart)
+SWARM_CATEGORY = 1 << 3
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    lengths = np.sqrt((vectors ** 2).sum(axis=1))
+    return vectors / np.maximum(lengths, 1e-9)[:, None]
+
+
+class BugSwarm:
+    """
+    A flock of bugs steered together with boids rules: separation from
+    close neighbours, alignment with and cohesion towards the neighbours in
+    view, and homing on the nearest player. The neighbours come from a
+    ``NeighbourGrid`` and the steering is worked out with arrays for the
+    whole swarm, so an update costs about the same per bug however many
+    there are. Each rule gives a desired direction, the weighted sum at
+    ``SWARM_MAX_SPEED`` is steered towards by at most
+    ``SWARM_MAX_ACCELERATION``.
+
+    The bugs are kept in ``self.bugs``. They are plain ``Bug`` sprites
+    without their PID controllers and are never updated one by one, a
+    damaged bug is checked for death on the next swarm update.
+    """
+    def __init__(self, main, view_radius: float = SWARM_VIEW_RADIUS):
+        self.main = main
+        self.bugs = arcade.SpriteList()
+        self.grid = NeighbourGrid(view_radius)
+        self.separation_radius = SWARM_SEPARATION_RADIUS
+        self.max_speed = SWARM_MAX_SPEED
+        self.max_acceleration = SWARM_MAX_ACCELERATION
+        self.weights = np.array([SWARM_SEPARATION_WEIGHT,
+                                 SWARM_ALIGNMENT_WEIGHT,
+                                 SWARM_COHESION_WEIGHT,
+                                 SWARM_HOMING_WEIGHT])
+        self.touched = set()
+        self.filter = pymunk.ShapeFilter(categories=SWARM_CATEGORY,
+                                         mask=pymunk.ShapeFilter.ALL_MASKS() ^ SWARM_CATEGORY)
+
+    def __len__(self):
+        return len(self.bugs)
+
+    def __contains__(self, bug):
+        return bug in self.bugs
+
+    def spawn(self, positions) -> List[Bug]:
+        """Add a bug at each of ``positions``, with their bodies added in one go."""
+        bugs = []
+        for x, y in positions:
+            bug = Bug(self.main, pid_steering=False)
+            bug.position = (x, y)
+            bugs.append(bug)
+
+        moments = [pymunk.moment_for_box(bug.mass, (bug.width, bug.height)) for bug in bugs]
+        self.main.add_sprites_to_pymunk(bugs, moments)
+        for bug in bugs:
+            bug.shape.filter = self.filter
+            self.bugs.append(bug)
+        return bugs
+
+    def touch(self, bug: Bug):
+        self.touched.add(bug)
+
+    def steering(self, positions: np.ndarray, velocities: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """Desired velocity of each bug."""
+        n = len(positions)
+        i, j, offsets, distances = self.grid.pairs(positions)
+        neighbours = np.bincount(i, minlength=n)
+        has_neighbours = neighbours > 0
+        count = np.maximum(neighbours, 1)[:, None]
+
+        def total(values):
+            return np.stack([np.bincount(i, weights=values[:, 0], minlength=n),
+                             np.bincount(i, weights=values[:, 1], minlength=n)], axis=1)
+
+        # Away from close neighbours, the closer the harder
+        close = distances < self.separation_radius ** 2
+        away = -offsets[close] / np.maximum(distances[close], 1e-9)[:, None]
+        separation = np.stack([np.bincount(i[close], weights=away[:, 0], minlength=n),
+                               np.bincount(i[close], weights=away[:, 1], minlength=n)], axis=1)
+
+        alignment = total(velocities[j]) / count
+        cohesion = total(offsets) / count
+
+        # Nearest player
+        if len(targets) > 0:
+            target_offsets = targets[None, :, :] - positions[:, None, :]
+            nearest = (target_offsets ** 2).sum(axis=2).argmin(axis=1)
+            homing = target_offsets[np.arange(n), nearest]
+        else:
+            homing = np.zeros((n, 2))
+
+        rules = np.stack([_normalize(separation),
+                          _normalize(alignment) * has_neighbours[:, None],
+                          _normalize(cohesion) * has_neighbours[:, None],
+                          _normalize(homing)])
+        desired = (self.weights[:, None, None] * rules).sum(axis=0)
+        return _normalize(desired) * self.max_speed
+
+    def update(self, delta_time: float):
+        for bug in self.touched:
+            if bug.hitpoints <= 0 and bug.sprite_lists:
+                bug.explode()
+        self.touched = set()
+
+        bugs = list(self.bugs)
+        if not bugs:
+            return
+
+        bodies = [bug.body for bug in bugs]
+        positions = np.array([body.position for body in bodies])
+        velocities = np.array([body.velocity for body in bodies])
+        players = self.main.players or []
+        targets = np.array([player.position for player in players], dtype=float).reshape(-1, 2)
+
+        # Steer towards the desired velocity, limited by the acceleration
+        steer = self.steering(positions, velocities, targets) - velocities
+        max_change = self.max_acceleration * delta_time
+        lengths = np.sqrt((steer ** 2).sum(axis=1))
+        steer *= np.minimum(1.0, max_change / np.maximum(lengths, 1e-9))[:, None]
+        velocities += steer
+
+        speeds = np.sqrt((velocities ** 2).sum(axis=1))
+        velocities *= np.minimum(1.0, self.max_speed / np.maximum(speeds, 1e-9))[:, None]
+
+        for body, velocity in zip(bodies, velocities.tolist()):
+            body.velocity = velocity
+
@@ -95,13 +95,10 @@ class Enemy(SpaceObject):
         self.gun_cooldown = self.gun_fired_normal
 
         if self.status is ALIVE:
-            Bullet(self.main,
-                   (self.center_x, self.center_y),
-                   self.target_angle,
-                   self.body.velocity[0],
-                   self.body.velocity[1],
-                   self.type,
-                   spawn_offset=BULLET_SPAWN_OFFSET)
+            self.main.bullet_pool.fire((self.center_x, self.center_y),
+                                       self.target_angle,
+                                       self,
+                                       spawn_offset=UFO_BULLET_SPAWN_OFFSET)
 
     def move(self):
         pass
\ No newline at end of file
@@ -220,3 +220,28 @@ class SinglePlayerScoreboard(Scoreboard):
 
     def update_score(self):
         self.score_text.text = f"Score: {self.score[self.players[0].player_number]}"
+
+
+class HeadlessScoreboard(Scoreboard):
+    """Scoreboard that keeps score without any text or window. Used by
+    headless simulations (see ``SpaceGame.gamemodes.simulation``)."""
+    def __init__(self, players, time : datetime.timedelta):
+        super().__init__(
+            time,
+            players
+        )
+
+    def setup_timer(self):
+        pass
+
+    def init_score_text(self):
+        pass
+
+    def update_timer(self, delta_time):
+        self.total_time -= datetime.timedelta(seconds=delta_time)
+
+    def update_score(self):
+        pass
+
+    def on_draw(self):
+        pass
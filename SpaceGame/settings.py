@@ -14,7 +14,6 @@ import arcade.gui.widgets
 
 from SpaceGame.gametypes.PlayZoneTypes import Background
 from SpaceGame.menus.Inputs import DEFAULT_FONT, TextInput
-from SpaceGame.menus.buttons import BackButton
 
 # Constants
 PLAYER_ONE = 0
@@ -162,6 +161,72 @@ class SettingsManager:
 
         self.add_setting("PLAYERS", {})
 
+        # Cell size (pixels) of the spatial index shared by the AI queries
+        self.add_setting("SPATIAL_CELL_SIZE", 512.0, show_in_menu=False)
+        # Number of bullets (and their pymunk bodies) created up front
+        self.add_setting("BULLET_POOL_SIZE", 128, show_in_menu=False)
+        self.add_setting("EXPLOSION_POOL_SIZE", 64, show_in_menu=False)
+        # Physics ticks per second, at most MAX_SUBSTEPS ticks are run per
+        # rendered frame, the rest of a long frame is dropped.
+        self.add_setting("TICK_RATE", 60, show_in_menu=False)
+        self.add_setting("MAX_SUBSTEPS", 5, show_in_menu=False)
+        self.add_setting("INTERPOLATE", True, show_in_menu=False)
+        # Only draw the sprites in view of each camera
+        self.add_setting("CULLING", True, show_in_menu=False)
+        self.add_setting("CULL_CELL_SIZE", 512.0, show_in_menu=False)
+        # 'tiles' draws the background tiles in view of each camera, 'quad'
+        # draws a single quad with a repeating texture
+        self.add_setting("BACKGROUND_MODE", "tiles", show_in_menu=False)
+        # 'fixed' is the walled PLAY_ZONE, 'chunked' an open world streamed
+        # in CHUNK_SIZE chunks around the players
+        self.add_setting("PLAY_ZONE_MODE", "fixed", show_in_menu=False)
+        # Generate the space junk with the vectorized batch generator
+        self.add_setting("BATCH_GENERATION", True, show_in_menu=False)
+        # Nothing is generated within this distance of a player's start
+        self.add_setting("SPAWN_KEEP_OUT_RADIUS", 300.0, show_in_menu=False)
+        # Whether bullets hit each other, game modes may override it
+        self.add_setting("BULLETS_COLLIDE", True, show_in_menu=False)
+        self.add_setting("BULLET_LIFETIME", 3.0, show_in_menu=False)
+        # Bodies slower than IDLE_SPEED_THRESHOLD for SLEEP_TIME_THRESHOLD
+        # seconds are put to sleep by pymunk. Idle space junk further than
+        # SLEEP_RADIUS from every player is put to sleep straight away,
+        # checked every SLEEP_CHECK_INTERVAL seconds.
+        self.add_setting("SLEEPING", True, show_in_menu=False)
+        self.add_setting("SLEEP_TIME_THRESHOLD", 0.5, show_in_menu=False)
+        self.add_setting("IDLE_SPEED_THRESHOLD", 5.0, show_in_menu=False)
+        self.add_setting("SLEEP_RADIUS", 2000.0, show_in_menu=False)
+        self.add_setting("SLEEP_CHECK_INTERVAL", 0.5, show_in_menu=False)
+        # UFOs and bugs within LOD_NEAR_RADIUS of a player are updated every
+        # tick, within LOD_FAR_RADIUS every LOD_MID_INTERVAL ticks and
+        # further away not at all
+        self.add_setting("LOD", True, show_in_menu=False)
+        self.add_setting("LOD_NEAR_RADIUS", 1500.0, show_in_menu=False)
+        self.add_setting("LOD_FAR_RADIUS", 4000.0, show_in_menu=False)
+        self.add_setting("LOD_MID_INTERVAL", 4, show_in_menu=False)
+        # Run the AI of all the UFOs at once with NumPy
+        self.add_setting("UFO_SQUADRON", True, show_in_menu=False)
+        # Ticks a UFO's line of sight to its target is reused for
+        self.add_setting("LOS_CACHE_TICKS", 10, show_in_menu=False)
+        # UFOs aim where their target will be, not where it is
+        self.add_setting("UFO_LEAD_TARGETING", True, show_in_menu=False)
+        # Bugs in the flocking swarm spawned around the center, 0 for none
+        self.add_setting("BUG_SWARM_SIZE", 0, show_in_menu=False)
+        # Add and remove UFOs and bugs during the match instead of spawning
+        # them all at the start. Every SPAWN_INTERVAL seconds the director
+        # works towards the counts for the difficulty, keeping at most
+        # SPAWN_ENTITY_BUDGET enemies and backing off when ticks take longer
+        # than SPAWN_TARGET_TICK_TIME seconds. Enemies appear between
+        # SPAWN_MIN_DISTANCE and SPAWN_MAX_DISTANCE from a player.
+        self.add_setting("SPAWN_DIRECTOR", False, show_in_menu=False)
+        self.add_setting("SPAWN_INTERVAL", 1.0, show_in_menu=False)
+        self.add_setting("SPAWN_ENTITY_BUDGET", 500, show_in_menu=False)
+        self.add_setting("SPAWN_TARGET_TICK_TIME", 0.008, show_in_menu=False)
+        self.add_setting("SPAWN_MIN_DISTANCE", 1200.0, show_in_menu=False)
+        self.add_setting("SPAWN_MAX_DISTANCE", 2500.0, show_in_menu=False)
+        self.add_setting("CHUNK_SIZE", 2048.0, show_in_menu=False)
+        self.add_setting("CHUNK_LOAD_RADIUS", 1, show_in_menu=False)
+        self.add_setting("CHUNK_STREAM_INTERVAL", 30, show_in_menu=False)
+
     def __getitem__(self, key):
         return self.settings[key].value
 
@@ -214,6 +279,10 @@ class SettingsButton(arcade.gui.widgets.buttons.UIFlatButton):
 
 class SettingsMenu(arcade.View):
     def __init__(self, back_view, settings : SettingsManager):
+        # Imported here so the game types (and headless simulations) can
+        # import the settings without pulling in every menu and game mode.
+        from SpaceGame.menus.buttons import BackButton
+
         super().__init__()
         self.back_view = back_view
         self.settings = settings
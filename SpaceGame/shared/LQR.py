@@ -1,13 +1,26 @@
+import math
+
 import numpy as np
 
+# Gains are cached per yaw bucket, 1024 buckets is ~0.35 degrees each.
+YAW_RESOLUTION = 2.0 * math.pi / 1024
+# and per dt bucket, a tenth of a 60Hz tick each
+DT_RESOLUTION = 1.0 / 600.0
+
+
 class Lqr:
-    def __init__(self, max_velocity):
+    def __init__(self, max_velocity, yaw_resolution=YAW_RESOLUTION, dt_resolution=DT_RESOLUTION):
         self.max_velocity = max_velocity
         self.n = 75
         self.A = self.getA()
         self.R = self.getR()
         self.q = self.getQ()
         self.B = None
+        self.yaw_resolution = yaw_resolution
+        self._yaw_buckets = int(round(2.0 * math.pi / yaw_resolution))
+        self.dt_resolution = dt_resolution
+        # (yaw bucket, dt bucket) -> gain
+        self._gains = {}
 
     def getA(self):
         return np.array([[1.0, 0, 0],
@@ -28,27 +41,48 @@ class Lqr:
                         [np.sin(yaw) * delta_t, 0],
                         [0, delta_t]])
 
+    def compute_gain(self, B):
+        # The control applied is the one for the last step of the n step
+        # horizon, whose gain only depends on p[n] = Q, so the backward
+        # Riccati recursion isn't needed to compute it.
+        return -np.linalg.pinv(self.R + B.T @ self.q @ B) @ B.T @ self.q @ self.A
 
-    def lqr(self, setpoint, measured, dt):
-        self.B = self.getB(measured[2], dt)
+    def yaw_bucket(self, yaw):
+        return int(round(yaw / self.yaw_resolution)) % self._yaw_buckets
 
-        error = setpoint - measured
-        print(error)
-        p = [None] * (self.n + 1)
+    def dt_bucket(self, dt):
+        return max(1, int(round(dt / self.dt_resolution)))
+
+    def gain(self, yaw, dt):
+        """Return the (cached) gain for ``yaw`` and ``dt`` rounded to their resolutions."""
+        return self._gain(self.yaw_bucket(yaw), self.dt_bucket(dt))
 
-        qf = self.q
-        p[self.n] = qf
+    def _gain(self, yaw_bucket, dt_bucket):
+        key = (yaw_bucket, dt_bucket)
+        k = self._gains.get(key)
+        if k is None:
+            k = self.compute_gain(self.getB(yaw_bucket * self.yaw_resolution, dt_bucket * self.dt_resolution))
+            self._gains[key] = k
+        return k
 
-        for i in range(self.n, 0, -1):
-            p[i - 1] = self.q + self.A.T @ p[i] @ self.A - (self.A.T @ p[i] @ self.B) @ np.linalg.pinv(
-                self.R + self.B.T @ p[i] @ self.B) @ (self.B.T @ p[i] @ self.A)
+    def lqr(self, setpoint, measured, dt):
+        self.B = self.getB(measured[2], dt)
+        error = setpoint - measured
+        return self.gain(measured[2], dt) @ error
 
-        k = [None] * self.n
-        u = [None] * self.n
+    def lqr_batch(self, setpoints, measured, dt):
+        """
+        Control for N agents at once. ``setpoints`` and ``measured`` are
+        (N, 3) arrays of (x, y, yaw), returns an (N, 2) array of controls.
+        Uses the same cached gains as ``lqr``.
+        """
+        setpoints = np.asarray(setpoints, dtype=float)
+        measured = np.asarray(measured, dtype=float)
 
-        for i in range(self.n):
-            k[i] = -np.linalg.pinv(self.R + self.B.T @ p[i + 1] @ self.B) @ self.B.T @ p[i + 1] @ self.A
-            u[i] = k[i] @ error
+        buckets = np.rint(measured[:, 2] / self.yaw_resolution).astype(int) % self._yaw_buckets
+        unique, index = np.unique(buckets, return_inverse=True)
+        dt_bucket = self.dt_bucket(dt)
+        gains = np.stack([self._gain(int(bucket), dt_bucket) for bucket in unique])
 
-        u_star = u[self.n - 1]
-        return u_star
\ No newline at end of file
+        error = setpoints - measured
+        return np.einsum('nij,nj->ni', gains[index], error)
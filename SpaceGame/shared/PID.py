@@ -1,4 +1,7 @@
 from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
 
 
 @dataclass
@@ -71,3 +74,114 @@ class Pid:
         self.data.errorAccum = self.data.integrator
 
         return output
+
+
+class PidBank:
+    """
+    N PID controllers with their state and limits held in numpy arrays.
+
+    ``update`` steps every controller in the bank, or the ones at
+    ``index``, at once and gives the same outputs as calling ``Pid.update``
+    on each of them. Slots are handed out with ``allocate`` and given back
+    with ``release``, the arrays grow as needed. Released slots are left
+    alone by ``update`` until they are handed out again.
+    """
+    def __init__(self, pid_input: PidInput, capacity=0):
+        self.input = pid_input
+        self.size = 0
+        self._free = []
+
+        self.kp = np.zeros(capacity)
+        self.ki = np.zeros(capacity)
+        self.kd = np.zeros(capacity)
+        self.lim_min = np.zeros(capacity)
+        self.lim_max = np.zeros(capacity)
+
+        self.integrator = np.zeros(capacity)
+        self.prev_error = np.zeros(capacity)
+        self.differentiator = np.zeros(capacity)
+        self.active = np.zeros(capacity, dtype=bool)
+
+    def __len__(self) -> int:
+        return self.size - len(self._free)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.kp)
+
+    def _grow(self):
+        new_capacity = max(2 * self.capacity, 16)
+        for name in ('kp', 'ki', 'kd', 'lim_min', 'lim_max',
+                     'integrator', 'prev_error', 'differentiator', 'active'):
+            old = getattr(self, name)
+            array = np.zeros(new_capacity, dtype=old.dtype)
+            array[:self.size] = old[:self.size]
+            setattr(self, name, array)
+
+    def allocate(self, pid_input: Optional[PidInput] = None) -> int:
+        """Return the index of a fresh controller, tuned with ``pid_input`` or the bank's input."""
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow()
+            index = self.size
+            self.size += 1
+
+        pid_input = pid_input or self.input
+        self.kp[index] = pid_input.kp
+        self.ki[index] = pid_input.ki
+        self.kd[index] = pid_input.kd
+        self.lim_min[index] = pid_input.lim_min
+        self.lim_max[index] = pid_input.lim_max
+        self.active[index] = True
+        self.reset(index)
+        return index
+
+    def release(self, index: int):
+        self.reset(index)
+        self.active[index] = False
+        self._free.append(index)
+
+    def reset(self, index: int):
+        self.integrator[index] = 0.0
+        self.prev_error[index] = 0.0
+        self.differentiator[index] = 0.0
+
+    def update(self, setpoint, measurement, dt, index=None) -> np.ndarray:
+        """
+        Step the controllers at ``index``, by default the first ``size``
+        with released slots masked out (their outputs are 0).
+        ``setpoint``, ``measurement`` and ``dt`` are scalars or arrays as
+        long as ``index``, returns the outputs.
+        """
+        if index is not None:
+            return self._step(np.asarray(index, dtype=int), setpoint, measurement, dt)
+
+        live = np.flatnonzero(self.active[:self.size])
+        outputs = np.zeros(self.size)
+
+        def select(values):
+            values = np.asarray(values, dtype=float)
+            return values[live] if values.ndim > 0 else values
+
+        outputs[live] = self._step(live, select(setpoint), select(measurement), select(dt))
+        return outputs
+
+    def _step(self, index: np.ndarray, setpoint, measurement, dt) -> np.ndarray:
+        error = np.asarray(setpoint, dtype=float) - np.asarray(measurement, dtype=float)
+
+        proportion = self.kp[index] * error
+        integrator = self.integrator[index] + self.ki[index] * error * dt
+        differentiator = self.kd[index] * (error - self.prev_error[index]) / dt
+
+        output = proportion + integrator + differentiator
+        lim_min = self.lim_min[index]
+        lim_max = self.lim_max[index]
+        output = np.where(output > lim_max, lim_max, np.where(output < lim_min, lim_min, output))
+
+        self.integrator[index] = integrator
+        self.differentiator[index] = differentiator
+        self.prev_error[index] = error
+
+        return output
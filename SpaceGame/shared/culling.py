@@ -0,0 +1,172 @@
+import math
+import weakref
+from typing import Dict, List, Sequence, Set, Tuple
+
+import arcade
+
+DEFAULT_CULL_CELL_SIZE = 512.0
+
+Rect = Tuple[float, float, float, float]
+
+
+class CulledSpriteList:
+    """
+    Draws, for each view, only the sprites of ``source`` whose bounds
+    intersect that view's (left, bottom, right, top) world rectangle.
+
+    The sprites are bucketed by cell and ``sync`` only moves the ones that
+    changed cell since the last frame. Each view keeps its own SpriteList of
+    the sprites in view, sprites are appended and removed from it as they
+    come in and out of view rather than rebuilding it every frame.
+    """
+    def __init__(self, source: arcade.SpriteList,
+                 cell_size: float = DEFAULT_CULL_CELL_SIZE,
+                 static: bool = False):
+        self.source = source
+        self.cell_size = cell_size
+        self.static = static
+
+        self._cells: Dict[Tuple[int, int], Set[arcade.Sprite]] = {}
+        # sprite -> [cell, half extent, frame last seen]
+        self._entries: Dict[arcade.Sprite, list] = {}
+        self._max_extent = 0.0
+        self._frame = 0
+        self._synced_size = -1
+
+        self.views: List[arcade.SpriteList] = []
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def _remove(self, sprite):
+        cell = self._entries.pop(sprite)[0]
+        bucket = self._cells[cell]
+        bucket.discard(sprite)
+        if not bucket:
+            del self._cells[cell]
+
+    def sync(self):
+        """Bring the buckets up to date with the source list."""
+        if self.static and self._synced_size == len(self.source):
+            return
+
+        self._frame += 1
+        frame = self._frame
+        entries = self._entries
+        cells = self._cells
+        for sprite in self.source:
+            cell = self._cell(sprite.center_x, sprite.center_y)
+            entry = entries.get(sprite)
+            if entry is None:
+                # Half the diagonal, covers the sprite whatever its angle
+                extent = math.hypot(sprite.width, sprite.height) / 2.0
+                self._max_extent = max(self._max_extent, extent)
+                entries[sprite] = [cell, extent, frame]
+                cells.setdefault(cell, set()).add(sprite)
+                continue
+
+            entry[2] = frame
+            if entry[0] != cell:
+                old = cells[entry[0]]
+                old.discard(sprite)
+                if not old:
+                    del cells[entry[0]]
+                cells.setdefault(cell, set()).add(sprite)
+                entry[0] = cell
+
+        # Every sprite in the source is in entries now, anything extra has
+        # been removed from the source since the last sync.
+        if len(entries) != len(self.source):
+            for sprite in [s for s, entry in entries.items() if entry[2] != frame]:
+                self._remove(sprite)
+
+        self._synced_size = len(self.source)
+
+    def query(self, rect: Rect) -> Set[arcade.Sprite]:
+        left, bottom, right, top = rect
+        margin = self._max_extent
+        min_cx, min_cy = self._cell(left - margin, bottom - margin)
+        max_cx, max_cy = self._cell(right + margin, top + margin)
+
+        found = set()
+        cells = self._cells
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(cells):
+            keys = [key for key in cells
+                    if min_cx <= key[0] <= max_cx and min_cy <= key[1] <= max_cy]
+        else:
+            keys = [(i, j) for i in range(min_cx, max_cx + 1) for j in range(min_cy, max_cy + 1)]
+
+        entries = self._entries
+        for key in keys:
+            bucket = cells.get(key)
+            if bucket is None:
+                continue
+
+            for sprite in bucket:
+                extent = entries[sprite][1]
+                x = sprite.center_x
+                y = sprite.center_y
+                if (x + extent >= left and x - extent <= right
+                        and y + extent >= bottom and y - extent <= top):
+                    found.add(sprite)
+        return found
+
+    def update_views(self, view_rects: Sequence[Rect]):
+        self.sync()
+
+        while len(self.views) < len(view_rects):
+            self.views.append(arcade.SpriteList())
+
+        for view, rect in zip(self.views, view_rects):
+            visible = self.query(rect)
+
+            # Membership is checked against the SpriteList itself because
+            # remove_from_sprite_lists (pooled bullets and explosions) also
+            # takes sprites out of the view lists behind our back.
+            stale = [sprite for sprite in view if sprite not in visible]
+            for sprite in stale:
+                view.remove(sprite)
+            for sprite in visible:
+                if sprite not in view:
+                    view.append(sprite)
+
+    def draw(self, view: int):
+        self.views[view].draw()
+
+
+class Culler:
+    """
+    Per camera culling for any number of SpriteLists. Call ``begin_frame``
+    with the camera rectangles once per frame, then ``draw(spritelist,
+    view)`` in place of ``spritelist.draw()``. The culled copy of each list
+    is created the first time it is drawn and updated once per frame.
+    """
+    def __init__(self, cell_size: float = DEFAULT_CULL_CELL_SIZE, enabled: bool = True):
+        self.cell_size = cell_size
+        self.enabled = enabled
+        self.view_rects: List[Rect] = []
+        self._frame = 0
+        self._lists = weakref.WeakKeyDictionary()
+
+    def begin_frame(self, view_rects: Sequence[Rect]):
+        self.view_rects = list(view_rects)
+        self._frame += 1
+
+    def culled(self, spritelist: arcade.SpriteList, static=False) -> CulledSpriteList:
+        entry = self._lists.get(spritelist)
+        if entry is None:
+            entry = [CulledSpriteList(spritelist, self.cell_size, static=static), -1]
+            self._lists[spritelist] = entry
+
+        culled, updated_at = entry
+        if updated_at != self._frame:
+            culled.update_views(self.view_rects)
+            entry[1] = self._frame
+        return culled
+
+    def draw(self, spritelist: arcade.SpriteList, view: int, static=False):
+        if not self.enabled or view >= len(self.view_rects):
+            spritelist.draw()
+            return
+
+        self.culled(spritelist, static=static).draw(view)
@@ -0,0 +1,143 @@
+import logging
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger('space_game')
+
+NEAR = 'near'
+MID = 'mid'
+FAR = 'far'
+TIERS = (NEAR, MID, FAR)
+
+LOD_NEAR_RADIUS = 1500.0
+LOD_FAR_RADIUS = 4000.0
+# Mid tier entities are updated every this many ticks
+LOD_MID_INTERVAL = 4
+
+
+class LodScheduler:
+    """
+    Level of detail updates for the enemies. Every ``mid_interval`` ticks
+    each entity is put in a tier by its distance to the nearest focus
+    position (the players, the cameras follow them):
+
+    - near, closer than ``near_radius``, updated every tick
+    - mid, closer than ``far_radius``, updated every ``mid_interval`` ticks
+      with the time accumulated since its last update. Mid entities are
+      spread over the ticks so they aren't all updated on the same one.
+    - far, frozen, not updated at all. pymunk keeps moving their bodies.
+
+    ``touch`` moves an entity to the near tier until the next regrouping,
+    for anything that has to react straight away (like being damaged).
+    Entities are never given more than ``mid_interval`` ticks of time, so
+    far ones don't catch up when they come back into range. ``counts``
+    holds the number of entities in each tier.
+    """
+    def __init__(self,
+                 near_radius: float = LOD_NEAR_RADIUS,
+                 far_radius: float = LOD_FAR_RADIUS,
+                 mid_interval: int = LOD_MID_INTERVAL):
+        self.near_radius = near_radius
+        self.far_radius = far_radius
+        self.mid_interval = max(1, int(mid_interval))
+
+        self.near: List = []
+        # One bucket of mid tier entities per tick of the interval
+        self.mid: List[List] = [[] for _ in range(self.mid_interval)]
+        self.far: List = []
+        self.touched = set()
+        # Touched since the last update, kept over a regroup
+        self._fresh = set()
+        # entity -> time of its last update
+        self._updated_at: Dict = {}
+        self.time = 0.0
+        self._tick = 0
+        self._max_delta_time = 0.0
+        self.counts = {tier: 0 for tier in TIERS}
+
+    def regroup(self, spritelists: Iterable, focus: Sequence[Tuple[float, float]]):
+        entities = [entity for spritelist in spritelists for entity in spritelist]
+        self.near = []
+        self.mid = [[] for _ in range(self.mid_interval)]
+        self.far = []
+        # Touches made since the last update still have to be seen by it
+        self.touched = set(self._fresh)
+
+        if entities and len(focus) > 0:
+            positions = np.array([(entity.center_x, entity.center_y) for entity in entities])
+            focus = np.asarray(focus, dtype=float)
+            # Squared distance to the nearest focus position
+            distances = ((positions[:, None, :] - focus[None, :, :]) ** 2).sum(axis=2).min(axis=1)
+            near = distances < self.near_radius ** 2
+            far = distances >= self.far_radius ** 2
+        else:
+            # Nothing to focus on, update everything
+            near = [True] * len(entities)
+            far = [False] * len(entities)
+
+        updated_at = {}
+        for i, entity in enumerate(entities):
+            updated_at[entity] = self._updated_at.get(entity, self.time)
+            if near[i]:
+                self.near.append(entity)
+            elif far[i]:
+                self.far.append(entity)
+            else:
+                self.mid[i % self.mid_interval].append(entity)
+        self._updated_at = updated_at
+
+        self.counts = {NEAR: len(self.near),
+                       MID: sum(len(bucket) for bucket in self.mid),
+                       FAR: len(self.far)}
+
+    def touch(self, entity):
+        self.touched.add(entity)
+        self._fresh.add(entity)
+
+    def clear(self):
+        """Forget every entity, for when LOD updates are turned off."""
+        if not self._updated_at and not self.touched and not self._fresh:
+            return
+        self.near = []
+        self.mid = [[] for _ in range(self.mid_interval)]
+        self.far = []
+        self.touched = set()
+        self._fresh = set()
+        self._updated_at = {}
+        self._tick = 0
+        self.counts = {tier: 0 for tier in TIERS}
+
+    def update(self, spritelists: Iterable, focus: Sequence[Tuple[float, float]], delta_time: float):
+        if self._tick % self.mid_interval == 0:
+            self.regroup(spritelists, focus)
+        bucket = self.mid[self._tick % self.mid_interval]
+        self._tick += 1
+        self.time += delta_time
+        self._max_delta_time = self.mid_interval * delta_time
+
+        for entity in self.near:
+            self._update(entity)
+        for entity in bucket:
+            if entity not in self.touched:
+                self._update(entity)
+        for entity in list(self.touched):
+            if entity not in self.near:
+                self._update(entity)
+        self._fresh = set()
+
+    def _update(self, entity):
+        # Dead entities have been removed from their lists since the
+        # last regroup
+        if not entity.sprite_lists:
+            return
+
+        delta_time = min(self.time - self._updated_at.get(entity, self.time), self._max_delta_time)
+        if delta_time <= 0.0:
+            return
+
+        self._updated_at[entity] = self.time
+        entity.update(delta_time)
+
+    def report(self):
+        logger.info(f"LOD tiers: {self.counts[NEAR]} near, {self.counts[MID]} mid, {self.counts[FAR]} far")
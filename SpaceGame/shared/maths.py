@@ -1,6 +1,7 @@
 import math
 
 import arcade
+import numpy as np
 from pymunk.vec2d import Vec2d
 
 def squared_distance_sprite(a: arcade.Sprite, b: arcade.Sprite) -> float:
@@ -13,3 +14,58 @@ def distance_sprite(a: arcade.Sprite, b: arcade.Sprite) -> float:
 
 def x_y_distance_sprite(a: arcade.Sprite, b: arcade.Sprite):
     return (a.center_x - b.center_x), (a.center_y - b.center_y)
+
+
+def intercept_times(offsets: np.ndarray, velocities: np.ndarray, speed: float, start_offset: float = 0.0) -> np.ndarray:
+    """
+    Time for a projectile fired at ``speed`` to reach each target, for
+    targets at ``offsets`` from the shooters moving at ``velocities`` (both
+    (N, 2) arrays). The projectile starts ``start_offset`` from the shooter
+    in the direction it is fired, so it has to cover ``start_offset +
+    speed * t`` to meet the target at ``offset + velocity * t``. NaN where
+    the target can't be caught.
+    """
+    offsets = np.asarray(offsets, dtype=float)
+    velocities = np.asarray(velocities, dtype=float)
+
+    # |D + V t| = o + s t  ->  (V.V - s^2) t^2 + 2 (D.V - s o) t + (D.D - o^2) = 0
+    a = (velocities ** 2).sum(axis=1) - speed ** 2
+    b = 2.0 * ((offsets * velocities).sum(axis=1) - speed * start_offset)
+    c = (offsets ** 2).sum(axis=1) - start_offset ** 2
+
+    times = np.full(len(offsets), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        linear = np.abs(a) < 1e-9
+        linear_times = -c / b
+        times[linear] = linear_times[linear]
+
+        discriminant = b ** 2 - 4.0 * a * c
+        root = np.sqrt(discriminant)
+        first = (-b - root) / (2.0 * a)
+        second = (-b + root) / (2.0 * a)
+        # Smallest positive root
+        first = np.where(first > 0.0, first, np.inf)
+        second = np.where(second > 0.0, second, np.inf)
+        quadratic = np.minimum(first, second)
+        quadratic[~np.isfinite(quadratic)] = np.nan
+        times[~linear] = quadratic[~linear]
+
+    times[~(times > 0.0)] = np.nan
+    return times
+
+
+def lead_points(offsets: np.ndarray, velocities: np.ndarray, speed: float, start_offset: float = 0.0) -> np.ndarray:
+    """
+    Where (offsets from the shooters) each target will be hit, see
+    ``intercept_times``. A target that can't be caught is aimed at where
+    it is.
+    """
+    offsets = np.asarray(offsets, dtype=float)
+    times = intercept_times(offsets, velocities, speed, start_offset)
+    return offsets + np.nan_to_num(times)[:, None] * np.asarray(velocities, dtype=float)
+
+
+def lead_angles(offsets: np.ndarray, velocities: np.ndarray, speed: float, start_offset: float = 0.0) -> np.ndarray:
+    """Angles (radians from +x) to fire at to hit each target, see ``lead_points``."""
+    aim = lead_points(offsets, velocities, speed, start_offset)
+    return np.arctan2(aim[:, 1], aim[:, 0])
@@ -9,49 +9,156 @@ from SpaceGame.gametypes.UFOs import UFO
 from SpaceGame.gametypes.enemies.Bug import Bug
 
 import arcade
-
+import numpy as np
+
+# Kinds of collision event held in a CollisionQueue
+HIT_SHIP = 0
+HIT_SPACE_JUNK = 1
+HIT_UFO = 2
+HIT_BUG = 3
+HIT_BULLET = 4
+HIT_BOUNDARY = 5
+
+# What resolving an event did
+_DROPPED = 0
+_RETIRED = 1
+_BULLETS_COLLIDED = 2
+_HIT = 3
+
+COLLISION_QUEUE_SIZE = 64
+
+
+class CollisionQueue:
+    """
+    Collision events recorded by the post-solve handlers during
+    ``space.step`` and resolved in one pass afterwards, so nothing is
+    removed from the space (or damaged, exploded or scored) while pymunk is
+    still stepping.
+
+    The events are kept in preallocated parallel buffers, NumPy arrays for
+    the kinds, positions and outcomes and lists for the bullets and what
+    they hit, that double when a step records more than they hold. The
+    buffers and the set of consumed bullets are reused from step to step.
+    A bullet is only resolved for its first event of the step, later
+    contacts with the same bullet are dropped and counted in
+    ``duplicates``.
+    """
+    def __init__(self, capacity: int = COLLISION_QUEUE_SIZE):
+        self.capacity = capacity
+        self.count = 0
+        self._kinds = np.zeros(capacity, dtype=np.int8)
+        self._positions = np.zeros((capacity, 2))
+        self._outcomes = np.zeros(capacity, dtype=np.int8)
+        self._bullets = [None] * capacity
+        self._others = [None] * capacity
+        self._consumed = set()
+
+        self.resolved = 0
+        self.duplicates = 0
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        extra = self.capacity
+        self._kinds = np.concatenate([self._kinds, np.zeros(extra, dtype=np.int8)])
+        self._positions = np.concatenate([self._positions, np.zeros((extra, 2))])
+        self._outcomes = np.concatenate([self._outcomes, np.zeros(extra, dtype=np.int8)])
+        self._bullets.extend([None] * extra)
+        self._others.extend([None] * extra)
+        self.capacity += extra
+
+    def push(self, kind: int, bullet: Bullet, other=None):
+        if self.count == self.capacity:
+            self._grow()
+
+        i = self.count
+        self._kinds[i] = kind
+        self._positions[i] = bullet.body.position
+        self._bullets[i] = bullet
+        self._others[i] = other
+        self.count += 1
+
+    def clear(self):
+        for i in range(self.count):
+            self._bullets[i] = None
+            self._others[i] = None
+        self._consumed.clear()
+        self.count = 0
+
+    def resolve(self, main):
+        """Apply every queued event once, then empty the queue."""
+        if self.count == 0:
+            return
+
+        consumed = self._consumed
+        outcomes = self._outcomes
+        kinds = self._kinds[:self.count].tolist()
+        for i, kind in enumerate(kinds):
+            bullet = self._bullets[i]
+            other = self._others[i]
+            outcomes[i] = _DROPPED
+
+            if not bullet.active or bullet in consumed:
+                self.duplicates += 1
+                continue
+
+            if kind == HIT_BOUNDARY:
+                # Left the play zone, retired without an explosion
+                outcomes[i] = _RETIRED
+            elif kind == HIT_BULLET:
+                if not other.active or other in consumed:
+                    self.duplicates += 1
+                    continue
+                consumed.add(other)
+                outcomes[i] = _BULLETS_COLLIDED
+            else:
+                other.damage(bullet)
+                outcomes[i] = _HIT
+
+            consumed.add(bullet)
+            self.resolved += 1
+
+        # Effects after every event is resolved, a bullet's creator is
+        # forgotten when it is deactivated
+        for i, outcome in enumerate(outcomes[:self.count].tolist()):
+            if outcome == _HIT:
+                self._bullets[i].creator.add_shot_hit()
+        for bullet in consumed:
+            bullet.deactivate()
+        for i, outcome in enumerate(outcomes[:self.count].tolist()):
+            if outcome == _HIT:
+                main.add_explosion(tuple(self._positions[i]), ExplosionSize.SMALL)
+            elif outcome == _BULLETS_COLLIDED:
+                main.add_explosion(tuple(self._positions[i]), ExplosionSize.BIG)
+
+        self.clear()
+
+
+# Bullets share a pymunk collision group with their creator, so a ship is
+# never reported hitting its own bullets.
 def ship_bullet_hit_handler(bullet: Bullet, ship: Ship, arbiter, space, data):
-    creator = bullet.creator
-
-    if creator == ship:
-        logger.debug("Bullet hit its creator ship, ignoring hit.")
-        return
-
-    bullet.remove_from_sprite_lists()
-    bullet.main.add_explosion(bullet.body.position, ExplosionSize.SMALL)
-
-    creator.add_shot_hit()
-    ship.damage(bullet)
+    bullet.main.collisions.push(HIT_SHIP, bullet, ship)
 
 
 def spaceObject_bullet_hit_handler(bullet: Bullet, junk: SpaceObject, arbiter, space, data):
-    creator = bullet.creator
-
-    bullet.remove_from_sprite_lists()
-    bullet.main.add_explosion(bullet.body.position, ExplosionSize.SMALL)
-    junk.damage(bullet)
-
-    creator.add_shot_hit()
+    bullet.main.collisions.push(HIT_SPACE_JUNK, bullet, junk)
 
 def bullet_ufo_hit_handler(bullet: Bullet, ufo: UFO, arbiter, space, data):
-    creator = bullet.creator
-    bullet.remove_from_sprite_lists()
-    bullet.main.add_explosion(bullet.body.position, ExplosionSize.SMALL)
-    ufo.damage(bullet)
-
-    creator.add_shot_hit()
+    bullet.main.collisions.push(HIT_UFO, bullet, ufo)
 
 
 def bullet_bug_hit_handler(bullet: Bullet, bug: Bug, arbiter, space, data):
-    creator = bullet.creator
-
-    bullet.remove_from_sprite_lists()
-    bullet.main.add_explosion(bullet.body.position, ExplosionSize.SMALL)
-    bug.damage(bullet)
-
-    creator.add_shot_hit()
+    bullet.main.collisions.push(HIT_BUG, bullet, bug)
 
 def bullet_bullet_hit_handler(bullet1: Bullet, bullet2: Bullet, arbiter, space, data):
-    bullet1.remove_from_sprite_lists()
-    bullet2.remove_from_sprite_lists()
-    bullet1.main.add_explosion(bullet1.body.position, ExplosionSize.BIG)
\ No newline at end of file
+    bullet1.main.collisions.push(HIT_BULLET, bullet1, bullet2)
+
+def bullet_boundary_handler(arbiter, space, data):
+    # Registered with pymunk directly, the boundary sensor isn't a sprite
+    bullet_shape = arbiter.shapes[0]
+    simulation = data['simulation']
+    bullet = simulation.bullet_pool.by_shape.get(bullet_shape)
+    if bullet is not None:
+        simulation.collisions.push(HIT_BOUNDARY, bullet)
+    return False
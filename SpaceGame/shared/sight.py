@@ -0,0 +1,121 @@
+import weakref
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pymunk
+
+# Ticks a line of sight result is reused for the same shooter and target
+LOS_CACHE_TICKS = 10
+# Radius (pixels) of the segment query, about the size of a bullet
+LOS_RADIUS = 2.0
+
+
+class LineOfSight:
+    """
+    Whether a shot from one point to a target would hit the target or
+    something in the way, found with a pymunk segment query. Results are
+    kept for ``cache_ticks`` ticks per (shooter, target) pair, so a blocked
+    shooter waiting on its target doesn't query every tick. Call
+    ``begin_tick`` once per tick before the queries.
+
+    The cache only holds weak references to shooters and the ids of their
+    targets, a shooter that has left its sprite lists is dropped from it on
+    the next clean up.
+
+    ``queries``, ``cache_hits`` and ``blocked`` count the segment queries
+    run, the results reused and the shots found to be blocked.
+    """
+    def __init__(self, space: pymunk.Space,
+                 cache_ticks: int = LOS_CACHE_TICKS,
+                 radius: float = LOS_RADIUS):
+        self.space = space
+        self.cache_ticks = cache_ticks
+        self.radius = radius
+        self.tick = 0
+        # shooter -> {id(target): (clear, tick it expires)}
+        self._cache: Dict[object, Dict[int, Tuple[bool, int]]] = weakref.WeakKeyDictionary()
+
+        self.queries = 0
+        self.cache_hits = 0
+        self.blocked = 0
+
+    def begin_tick(self):
+        self.tick += 1
+        if self.tick % self.cache_ticks == 0:
+            self._clean()
+
+    def _clean(self):
+        tick = self.tick
+        for shooter, results in list(self._cache.items()):
+            results = {target: result for target, result in results.items() if result[1] > tick}
+            if results and shooter.sprite_lists:
+                self._cache[shooter] = results
+            else:
+                del self._cache[shooter]
+
+    def _cached(self, shooter, target):
+        results = self._cache.get(shooter)
+        if results is None:
+            return None
+        cached = results.get(id(target))
+        if cached is not None and cached[1] > self.tick:
+            self.cache_hits += 1
+            return cached[0]
+        return None
+
+    def _query(self, shooter, target, start, end, shape_filter: pymunk.ShapeFilter) -> bool:
+        self.queries += 1
+        hit = self.space.segment_query_first(start, end, self.radius, shape_filter)
+        clear = hit is None or hit.shape.body is target.body
+        if not clear:
+            self.blocked += 1
+
+        results = self._cache.get(shooter)
+        if results is None:
+            results = self._cache[shooter] = {}
+        results[id(target)] = (clear, self.tick + self.cache_ticks)
+        return clear
+
+    def is_clear(self, shooter, target, start, shape_filter: pymunk.ShapeFilter, end=None) -> bool:
+        """
+        Would a shot from ``start`` to ``target`` hit it first. ``end`` is
+        where the shot is aimed, the target's position by default, pass the
+        intercept point for a leading shot. The query sees what
+        ``shape_filter`` lets it see, pass one that skips the shooter,
+        bullets and sensors.
+        """
+        cached = self._cached(shooter, target)
+        if cached is not None:
+            return cached
+
+        if end is None:
+            end = (target.center_x, target.center_y)
+        return self._query(shooter, target, start, end, shape_filter)
+
+    def are_clear(self, shooters: Sequence, targets: Sequence,
+                  starts: np.ndarray, ends: np.ndarray, shape_filters: Sequence) -> np.ndarray:
+        """
+        ``is_clear`` for many shots at once, ``starts`` and ``ends`` are
+        (N, 2) arrays. The cached results are looked up first and only the
+        rest are queried, pymunk runs one segment query per shot.
+        """
+        clear = np.zeros(len(shooters), dtype=bool)
+        missed = []
+        for i, (shooter, target) in enumerate(zip(shooters, targets)):
+            cached = self._cached(shooter, target)
+            if cached is None:
+                missed.append(i)
+            else:
+                clear[i] = cached
+
+        if missed:
+            starts = starts[missed].tolist()
+            ends = ends[missed].tolist()
+            for i, start, end in zip(missed, starts, ends):
+                clear[i] = self._query(shooters[i], targets[i], start, end, shape_filters[i])
+        return clear
+
+    def stats(self) -> dict:
+        return {'queries': self.queries,
+                'cache_hits': self.cache_hits,
+                'blocked': self.blocked}
@@ -0,0 +1,218 @@
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+DEFAULT_CELL_SIZE = 256.0
+
+
+class SpatialGrid:
+    """
+    Uniform grid over 2D points used for nearest neighbour and radius queries.
+
+    Items are bucketed by the cell their (x, y) position falls in. The grid
+    is meant to be rebuilt once per simulation step (see ``rebuild``) and
+    then shared by every query made during that step.
+    """
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[Tuple[float, float, Any]]] = {}
+        self._count = 0
+        self._min_cell = (0, 0)
+        self._max_cell = (0, 0)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def clear(self):
+        self._cells = {}
+        self._count = 0
+
+    def insert(self, item, x: float, y: float):
+        key = self.cell(x, y)
+        bucket = self._cells.get(key)
+        if bucket is None:
+            self._cells[key] = [(x, y, item)]
+        else:
+            bucket.append((x, y, item))
+
+        if self._count == 0:
+            self._min_cell = key
+            self._max_cell = key
+        else:
+            self._min_cell = (min(self._min_cell[0], key[0]), min(self._min_cell[1], key[1]))
+            self._max_cell = (max(self._max_cell[0], key[0]), max(self._max_cell[1], key[1]))
+        self._count += 1
+
+    def rebuild(self, sprites: Iterable):
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite, sprite.center_x, sprite.center_y)
+
+    def _ring(self, cx: int, cy: int, ring: int):
+        if ring == 0:
+            yield (cx, cy)
+            return
+
+        for x in range(cx - ring, cx + ring + 1):
+            yield (x, cy - ring)
+            yield (x, cy + ring)
+        for y in range(cy - ring + 1, cy + ring):
+            yield (cx - ring, y)
+            yield (cx + ring, y)
+
+    def _max_ring(self, cx: int, cy: int) -> int:
+        return max(cx - self._min_cell[0], self._max_cell[0] - cx,
+                   cy - self._min_cell[1], self._max_cell[1] - cy, 0)
+
+    def nearest(self, x: float, y: float, k: int = 1,
+                exclude=None,
+                max_distance: float = float('inf')) -> List[Tuple[float, Any]]:
+        """Return up to ``k`` (squared distance, item) pairs sorted nearest first."""
+        if self._count == 0 or k <= 0:
+            return []
+
+        cx, cy = self.cell(x, y)
+        max_ring = self._max_ring(cx, cy)
+        max_distance_sq = max_distance * max_distance
+
+        # Max-heap (by negated distance) of the k best found so far. The
+        # counter breaks ties so items themselves are never compared.
+        best = []
+        counter = 0
+        ring = 0
+        while ring <= max_ring:
+            for key in self._ring(cx, cy, ring):
+                bucket = self._cells.get(key)
+                if bucket is None:
+                    continue
+
+                for sx, sy, item in bucket:
+                    if item is exclude:
+                        continue
+
+                    dis = (sx - x) ** 2 + (sy - y) ** 2
+                    if dis > max_distance_sq:
+                        continue
+
+                    if len(best) < k:
+                        heapq.heappush(best, (-dis, counter, item))
+                    elif dis < -best[0][0]:
+                        heapq.heapreplace(best, (-dis, counter, item))
+                    counter += 1
+
+            # Anything in a ring we have not searched yet is at least
+            # ring * cell_size away from (x, y).
+            reach = ring * self.cell_size
+            if reach * reach > max_distance_sq:
+                break
+            if len(best) == k and -best[0][0] <= reach * reach:
+                break
+            ring += 1
+
+        return [(-dis, item) for dis, _, item in sorted(best, reverse=True)]
+
+    def query_radius(self, x: float, y: float, radius: float, exclude=None) -> List[Any]:
+        """Return every item within ``radius`` of (x, y)."""
+        if self._count == 0:
+            return []
+
+        radius_sq = radius * radius
+        min_cx, min_cy = self.cell(x - radius, y - radius)
+        max_cx, max_cy = self.cell(x + radius, y + radius)
+        min_cx = max(min_cx, self._min_cell[0])
+        min_cy = max(min_cy, self._min_cell[1])
+        max_cx = min(max_cx, self._max_cell[0])
+        max_cy = min(max_cy, self._max_cell[1])
+
+        found = []
+        for i in range(min_cx, max_cx + 1):
+            for j in range(min_cy, max_cy + 1):
+                bucket = self._cells.get((i, j))
+                if bucket is None:
+                    continue
+
+                for sx, sy, item in bucket:
+                    if item is exclude:
+                        continue
+                    if (sx - x) ** 2 + (sy - y) ** 2 <= radius_sq:
+                        found.append(item)
+        return found
+
+
+# Cell coordinates are packed into one int64 key, x in the high bits
+_KEY_SHIFT = 1 << 24
+_KEY_OFFSET = 1 << 23
+
+
+class NeighbourGrid:
+    """
+    Array counterpart of ``SpatialGrid`` for many points at once: every
+    pair of points in an (N, 2) array closer than ``radius``. The points are
+    sorted by cell, so a column of three neighbouring cells is one run of
+    the sorted points found with ``searchsorted``, and the cost is linear in
+    the number of points (and pairs) rather than quadratic. Each pair is
+    only tested once, from the point with the lower cell.
+    """
+    def __init__(self, radius: float):
+        self.radius = radius
+
+    def pairs(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns (i, j, offsets, squared distances) for every ordered pair
+        of different points within ``radius``, ``offsets`` being
+        ``positions[j] - positions[i]``.
+        """
+        positions = np.asarray(positions, dtype=float)
+        n = len(positions)
+        empty = np.zeros(0, dtype=np.int64)
+        if n < 2:
+            return empty, empty, np.zeros((0, 2)), np.zeros(0)
+
+        cells = np.floor(positions / self.radius).astype(np.int64) + _KEY_OFFSET
+        keys = cells[:, 0] * _KEY_SHIFT + cells[:, 1]
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+
+        # The points after each one in its own cell and the cell above it,
+        # then the column of three cells to its right
+        starts = [np.arange(1, n + 1),
+                  np.searchsorted(sorted_keys, sorted_keys + _KEY_SHIFT - 1, side='left')]
+        ends = [np.searchsorted(sorted_keys, sorted_keys + 1, side='right'),
+                np.searchsorted(sorted_keys, sorted_keys + _KEY_SHIFT + 1, side='right')]
+
+        firsts = []
+        seconds = []
+        for start, end in zip(starts, ends):
+            counts = end - start
+            total = int(counts.sum())
+            if total == 0:
+                continue
+
+            # Expand each point's [start, end) range of the sorted points
+            within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            firsts.append(np.repeat(order, counts))
+            seconds.append(order[np.repeat(start, counts) + within])
+
+        if not firsts:
+            return empty, empty, np.zeros((0, 2)), np.zeros(0)
+
+        i = np.concatenate(firsts)
+        j = np.concatenate(seconds)
+        offsets = positions[j] - positions[i]
+        distances = (offsets ** 2).sum(axis=1)
+        close = distances < self.radius ** 2
+        i = i[close]
+        j = j[close]
+        offsets = offsets[close]
+        distances = distances[close]
+
+        # Both ways round
+        return (np.concatenate((i, j)),
+                np.concatenate((j, i)),
+                np.concatenate((offsets, -offsets)),
+                np.concatenate((distances, distances)))
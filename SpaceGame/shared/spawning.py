@@ -0,0 +1,236 @@
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from SpaceGame.shared.spatial import SpatialGrid
+
+logger = logging.getLogger('space_game')
+
+# Extra space (pixels) kept between placed objects
+SPAWN_SPACING = 10.0
+# Candidate positions drawn per object before giving up on placing it
+SPAWN_MAX_ATTEMPTS = 20
+SPAWN_CELL_SIZE = 512.0
+
+# Most enemies the director keeps alive at once
+SPAWN_ENTITY_BUDGET = 500
+# Tick time (seconds) the director keeps the simulation under
+SPAWN_TARGET_TICK_TIME = 0.008
+# Most enemies of each kind added or removed per decision
+SPAWN_BATCH = 20
+# Capacity is grown by SPAWN_GROWTH while ticks take less than
+# SPAWN_HEADROOM of the target and cut to SPAWN_BACKOFF of the live
+# enemies when they take longer than the target
+SPAWN_GROWTH = 1.25
+SPAWN_HEADROOM = 0.75
+SPAWN_BACKOFF = 0.8
+# Weight of the newest sample in the tick time average
+SPAWN_SMOOTHING = 0.1
+
+
+class SpawnPlacer:
+    """
+    Places circles of a given radius inside a rectangle by rejection
+    sampling against a ``SpatialGrid`` of everything placed so far, so
+    nothing starts the match overlapping (and pymunk doesn't spend the first
+    step pushing objects apart). Keep-out circles, like the players' start
+    positions, are added to the grid up front.
+
+    Counts of candidates tried, objects placed and objects that could not be
+    placed are kept in ``attempts``, ``placed`` and ``failures``.
+    """
+    def __init__(self,
+                 bounds: Tuple[float, float, float, float],
+                 spacing: float = SPAWN_SPACING,
+                 max_attempts: int = SPAWN_MAX_ATTEMPTS,
+                 cell_size: float = SPAWN_CELL_SIZE):
+        self.bounds = bounds
+        self.spacing = spacing
+        self.max_attempts = max_attempts
+        self.grid = SpatialGrid(cell_size)
+        self._max_radius = 0.0
+
+        self.attempts = 0
+        self.placed = 0
+        self.failures = 0
+
+    def reserve(self, x: float, y: float, radius: float):
+        """Mark a circle as taken, placed objects will stay out of it."""
+        self.grid.insert((x, y, radius), x, y)
+        self._max_radius = max(self._max_radius, radius)
+
+    def keep_out(self, x: float, y: float, radius: float):
+        self.reserve(x, y, radius)
+
+    def is_clear(self, x: float, y: float, radius: float) -> bool:
+        radius += self.spacing
+        for ox, oy, other_radius in self.grid.query_radius(x, y, radius + self._max_radius):
+            if (ox - x) ** 2 + (oy - y) ** 2 < (radius + other_radius) ** 2:
+                return False
+        return True
+
+    def _candidates(self, n: int, rng) -> np.ndarray:
+        left, bottom, right, top = self.bounds
+        if isinstance(rng, np.random.Generator):
+            unit = rng.uniform(0.0, 1.0, (n, 2))
+        else:
+            unit = np.array([(rng.random(), rng.random()) for _ in range(n)]).reshape(n, 2)
+        return unit * (right - left, top - bottom) + (left, bottom)
+
+    def place(self, radius: float, rng) -> Optional[Tuple[float, float]]:
+        """Return a clear position for a circle of ``radius``, None if there isn't one."""
+        for _ in range(self.max_attempts):
+            self.attempts += 1
+            x, y = self._candidates(1, rng)[0]
+            if self.is_clear(x, y, radius):
+                self.reserve(x, y, radius)
+                self.placed += 1
+                return (float(x), float(y))
+
+        self.failures += 1
+        return None
+
+    def place_many(self, radii: np.ndarray, rng) -> np.ndarray:
+        """
+        Positions for each of ``radii``, candidates are drawn as arrays for
+        every object still waiting to be placed. Objects that can't be
+        placed get a NaN position.
+        """
+        n = len(radii)
+        positions = np.full((n, 2), np.nan)
+
+        for _ in range(self.max_attempts):
+            pending = np.flatnonzero(np.isnan(positions[:, 0]))
+            if len(pending) == 0:
+                break
+
+            candidates = self._candidates(len(pending), rng)
+            self.attempts += len(pending)
+            for i, (x, y) in zip(pending, candidates):
+                if self.is_clear(x, y, radii[i]):
+                    positions[i] = (x, y)
+                    self.reserve(x, y, radii[i])
+
+        missed = int(np.isnan(positions[:, 0]).sum())
+        self.placed += n - missed
+        self.failures += missed
+        return positions
+
+    def stats(self) -> dict:
+        return {'attempts': self.attempts,
+                'placed': self.placed,
+                'failures': self.failures}
+
+    def report(self, name='Spawn placement'):
+        logger.info(f"{name}: placed {self.placed} objects in {self.attempts} attempts, "
+                    f"{self.failures} could not be placed")
+
+
+class SpawnDirector:
+    """
+    Decides how many enemies of each kind to add or remove over a match,
+    so the scene grows while the simulation keeps up and shrinks before it
+    starts dropping frames. The director only counts, the play zone does
+    the spawning.
+
+    ``record`` is given the time each tick took, kept as a moving average.
+    ``plan`` is called every so often with the number of enemies of each
+    kind the difficulty asks for and the number alive, and returns how many
+    to add (positive) or remove (negative) of each. The enemies allowed
+    alive, ``capacity``, starts at ``min_capacity`` and:
+
+    - grows by ``growth`` while ticks take less than ``headroom`` of
+      ``target_tick_time`` and the enemies fill it, up to ``budget``
+    - drops to ``backoff`` of the enemies alive when ticks take longer
+      than ``target_tick_time``
+
+    When the targets don't fit in the capacity each kind gets its share.
+    ``spawned`` and ``despawned`` count the enemies the play zone actually
+    added and sent away, given to ``record_changes``, and ``backoffs`` the
+    times the director backed off.
+    """
+    def __init__(self,
+                 budget: int = SPAWN_ENTITY_BUDGET,
+                 target_tick_time: float = SPAWN_TARGET_TICK_TIME,
+                 min_capacity: int = 0,
+                 max_batch: int = SPAWN_BATCH,
+                 growth: float = SPAWN_GROWTH,
+                 headroom: float = SPAWN_HEADROOM,
+                 backoff: float = SPAWN_BACKOFF,
+                 smoothing: float = SPAWN_SMOOTHING):
+        self.budget = budget
+        self.target_tick_time = target_tick_time
+        self.min_capacity = min(min_capacity, budget)
+        self.max_batch = max_batch
+        self.growth = growth
+        self.headroom = headroom
+        self.backoff = backoff
+        self.smoothing = smoothing
+
+        self.capacity = self.min_capacity
+        self.tick_time: Optional[float] = None
+
+        self.spawned = 0
+        self.despawned = 0
+        self.backoffs = 0
+
+    def set_min_capacity(self, min_capacity: int):
+        """Never back off below ``min_capacity`` enemies, and start with room for them."""
+        self.min_capacity = min(min_capacity, self.budget)
+        self.capacity = max(self.capacity, self.min_capacity)
+
+    def record(self, tick_time: float):
+        if self.tick_time is None:
+            self.tick_time = tick_time
+        else:
+            self.tick_time += self.smoothing * (tick_time - self.tick_time)
+
+    @property
+    def load(self) -> float:
+        """Average tick time as a fraction of the target, 0 before any are recorded."""
+        if self.tick_time is None:
+            return 0.0
+        return self.tick_time / self.target_tick_time
+
+    def plan(self, targets: Dict[str, int], counts: Dict[str, int]) -> Dict[str, int]:
+        alive = sum(counts.values())
+        load = self.load
+        if load > 1.0:
+            self.capacity = max(self.min_capacity, min(self.capacity, int(alive * self.backoff)))
+            self.backoffs += 1
+        elif load < self.headroom and alive >= self.capacity:
+            self.capacity = min(self.budget, int(self.capacity * self.growth) + 1)
+
+        return {kind: max(-self.max_batch, min(self.max_batch, target - counts.get(kind, 0)))
+                for kind, target in self.share(targets).items()}
+
+    def record_changes(self, spawned: int, despawned: int):
+        """The enemies the play zone managed to add and remove for the last ``plan``."""
+        self.spawned += spawned
+        self.despawned += despawned
+
+    def share(self, targets: Dict[str, int]) -> Dict[str, int]:
+        """``targets`` cut down in proportion to fit in the capacity, largest remainders rounded up."""
+        wanted = sum(targets.values())
+        if wanted <= self.capacity:
+            return dict(targets)
+
+        shares = {kind: target * self.capacity // wanted for kind, target in targets.items()}
+        left = self.capacity - sum(shares.values())
+        by_remainder = sorted(targets, key=lambda kind: (targets[kind] * self.capacity) % wanted, reverse=True)
+        for kind in by_remainder[:left]:
+            shares[kind] += 1
+        return shares
+
+    def stats(self) -> dict:
+        return {'capacity': self.capacity,
+                'tick_time': self.tick_time,
+                'spawned': self.spawned,
+                'despawned': self.despawned,
+                'backoffs': self.backoffs}
+
+    def report(self, name='Spawn director'):
+        tick_time = 0.0 if self.tick_time is None else self.tick_time * 1000.0
+        logger.info(f"{name}: capacity {self.capacity}, ticks {tick_time:.2f} ms, "
+                    f"spawned {self.spawned}, despawned {self.despawned}, backed off {self.backoffs} times")
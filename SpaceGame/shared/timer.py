@@ -1,23 +1,149 @@
+import heapq
+import itertools
 from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+class ScheduledTimer:
+    """Handle for a callback scheduled on a ``Scheduler``."""
+    __slots__ = ('callback', 'interval', 'repeat', 'deadline', 'remaining',
+                 'paused', 'cancelled', 'generation')
+
+    def __init__(self, callback: Callable, interval: float, repeat: bool, deadline: float):
+        self.callback = callback
+        self.interval = interval
+        self.repeat = repeat
+        self.deadline = deadline
+        self.remaining = interval
+        self.paused = False
+        self.cancelled = False
+        # Bumped whenever the timer is re-queued so stale heap entries can
+        # be skipped instead of searched for and removed.
+        self.generation = 0
+
+    @property
+    def active(self) -> bool:
+        return not self.cancelled
+
+
+class Scheduler:
+    """
+    Priority queue of timers driven by an explicit clock.
+
+    ``advance`` moves the clock forward and fires every timer whose deadline
+    has passed, so each call costs O(k log n) for the k timers that fire,
+    not O(n) for every timer that exists. The simulation advances one shared
+    scheduler per step; nothing here depends on the pyglet clock.
+    """
+    def __init__(self):
+        self.time = 0.0
+        self._heap = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _push(self, timer: ScheduledTimer):
+        timer.generation += 1
+        heapq.heappush(self._heap, (timer.deadline, next(self._counter), timer.generation, timer))
+
+    def schedule(self, delay: float, callback: Callable, repeat=False, paused=False) -> ScheduledTimer:
+        if repeat and delay <= 0:
+            raise ValueError("Repeating timers need an interval greater than 0")
+
+        timer = ScheduledTimer(callback, delay, repeat, self.time + delay)
+        if paused:
+            timer.paused = True
+        else:
+            self._push(timer)
+        return timer
+
+    def cancel(self, timer: ScheduledTimer):
+        timer.cancelled = True
+        timer.generation += 1
+
+    def pause(self, timer: ScheduledTimer):
+        if timer.paused or timer.cancelled:
+            return
+
+        timer.remaining = timer.deadline - self.time
+        timer.paused = True
+        timer.generation += 1
+
+    def resume(self, timer: ScheduledTimer):
+        if not timer.paused or timer.cancelled:
+            return
+
+        timer.paused = False
+        timer.deadline = self.time + timer.remaining
+        self._push(timer)
+
+    def reschedule(self, timer: ScheduledTimer, delay: Optional[float] = None):
+        """Restart ``timer`` so it fires ``delay`` (default: its interval) from now."""
+        if delay is not None:
+            timer.interval = delay
+        timer.cancelled = False
+        timer.remaining = timer.interval
+        timer.deadline = self.time + timer.interval
+        if timer.paused:
+            timer.generation += 1
+        else:
+            self._push(timer)
+
+    def time_left(self, timer: ScheduledTimer) -> float:
+        if timer.paused:
+            return timer.remaining
+        return max(timer.deadline - self.time, 0.0)
+
+    def advance(self, delta_time: float):
+        self.time += delta_time
+
+        heap = self._heap
+        while heap and heap[0][0] <= self.time:
+            deadline, _, generation, timer = heapq.heappop(heap)
+            if generation != timer.generation or timer.cancelled or timer.paused:
+                continue
+
+            if timer.repeat:
+                timer.deadline = deadline + timer.interval
+                self._push(timer)
+            else:
+                timer.cancelled = True
 
-import pyglet.clock
+            timer.callback()
 
 
 @dataclass
 class Timer:
     name: str
-    duration: int
-    time: int
-    pause: bool
+    duration: float
     elapsed: bool
     restart: bool
+    handle: Optional[ScheduledTimer] = None
 
 
 class TimerManager:
-    def __init__(self):
+    """
+    Named timers on top of a ``Scheduler``. Pass the simulation's scheduler
+    to share it, otherwise the manager gets a scheduler of its own that is
+    driven by ``update_timers``. A shared scheduler is advanced by its
+    owner, ``update_timers`` leaves it alone.
+    """
+    def __init__(self, scheduler: Optional[Scheduler] = None):
+        self._owns_scheduler = scheduler is None
+        if scheduler is None:
+            scheduler = Scheduler()
+        self.scheduler = scheduler
         self._timers = {}
         self.elapsed_timers = {}
-        pyglet.clock.schedule(self.on_update)
+
+    def _on_elapsed(self, name):
+        timer = self._timers.get(name)
+        if timer is None:
+            return
+
+        timer.elapsed = True
+        self.elapsed_timers[name] = timer
 
     def clear_elapsed(self, name):
         self.elapsed_timers.pop(name)
@@ -34,61 +160,60 @@ class TimerManager:
             return False
 
         self.clear_elapsed(name)
-        self.restart(name)
         return True
 
     def restart(self, name):
         timer = self._timers[name]
-        timer.time = timer.duration
         timer.elapsed = False
+        self.scheduler.reschedule(timer.handle, timer.duration)
 
     def on_update(self, delta_time):
-        for _ in self._timers:
-            self.update_timers(delta_time)
+        self.update_timers(delta_time)
 
     def update_timers(self, delta_time):
-        for timer_name in self._timers:
-
-            timer = self._timers[timer_name]
-            if not timer.pause and not timer.elapsed:
-                timer.time -= delta_time
-
-            if timer.time <= 0:
-                self.elapsed_timers[timer.name] = timer
-                timer.elapsed = True
+        # Advancing a shared scheduler would fire everyone else's timers
+        if self._owns_scheduler:
+            self.scheduler.advance(delta_time)
 
     def get(self, timer_name) -> int:
         if timer_name not in self._timers:
             return -1
 
-        return self._timers[timer_name].time
+        return self.scheduler.time_left(self._timers[timer_name].handle)
 
     def add(self, name, duration, pause=False, restart=False) -> bool:
         if name in self._timers:
             return False
 
-        self._timers[name] = Timer(name=name,
-                                   duration=duration,
-                                   time=duration,
-                                   pause=pause,
-                                   elapsed=False,
-                                   restart=restart)
+        timer = Timer(name=name,
+                      duration=duration,
+                      elapsed=False,
+                      restart=restart)
+        timer.handle = self.scheduler.schedule(duration,
+                                               lambda: self._on_elapsed(name),
+                                               paused=pause)
+        self._timers[name] = timer
         return True
 
-
     def pause(self, timer_name) -> bool:
         if timer_name not in self._timers:
             return False
 
-        self._timers[timer_name].pause = not self._timers[timer_name].pause
+        self.scheduler.pause(self._timers[timer_name].handle)
         return True
 
     def unpause(self, timer_name) -> bool:
-        self.pause(timer_name)
+        if timer_name not in self._timers:
+            return False
+
+        self.scheduler.resume(self._timers[timer_name].handle)
+        return True
 
     def remove(self, timer_name) -> bool:
         if timer_name not in self._timers:
             return False
 
-        self._timers.pop(timer_name)
+        timer = self._timers.pop(timer_name)
+        self.scheduler.cancel(timer.handle)
+        self.elapsed_timers.pop(timer_name, None)
         return True
@@ -0,0 +1,38 @@
+import os
+import unittest
+
+import arcade
+
+from SpaceGame.gametypes.PlayZoneTypes import Background, TiledBackground
+
+RESOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "resources")
+
+
+class TestTiledBackground(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+        self.background = TiledBackground(Background(":sprites:png/backgrounds/stars.png", 1024, 1024, 1.0),
+                                          (40, 40))
+
+    def test_tile_range(self):
+        self.assertEqual(self.background.tile_range((1600, 1700, 2400, 2300)), (2, 2, 2, 2))
+        self.assertEqual(self.background.tile_range((0, 0, 1920, 1080)), (0, 0, 2, 1))
+        # Clamped to the padded play zone
+        self.assertEqual(self.background.tile_range((-1e6, -1e6, 1e6, 1e6)), (-2, -2, 42, 42))
+
+    def test_only_visible_tiles(self):
+        tiles = self.background.visible_tiles((0, 0, 1920, 1080))
+        self.assertEqual(len(tiles), 6)
+        self.assertIn((2048, 1024), [tile.position for tile in tiles])
+
+        moved = self.background.visible_tiles((20000, 20000, 21920, 21080))
+        self.assertIs(moved, tiles)
+        self.assertEqual(len(moved), 4)
+        self.assertIn((20480, 20480), [tile.position for tile in moved])
+
+    def test_views(self):
+        first = self.background.visible_tiles((0, 0, 100, 100), view=0)
+        second = self.background.visible_tiles((5000, 5000, 6000, 6000), view=1)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 4)
@@ -0,0 +1,69 @@
+import unittest
+
+import arcade
+
+from SpaceGame.shared.culling import CulledSpriteList, Culler
+
+
+def make_sprite(x, y, size=10):
+    sprite = arcade.SpriteSolidColor(size, size, color=arcade.color.WHITE)
+    sprite.position = (x, y)
+    return sprite
+
+
+class TestCulledSpriteList(unittest.TestCase):
+    def setUp(self):
+        self.source = arcade.SpriteList()
+        self.left = make_sprite(100, 100)
+        self.right = make_sprite(2000, 100)
+        self.edge = make_sprite(1005, 500)
+        for sprite in (self.left, self.right, self.edge):
+            self.source.append(sprite)
+
+        self.culled = CulledSpriteList(self.source, cell_size=256.0)
+        self.rects = [(0, 0, 1000, 1000), (1000, 0, 3000, 1000)]
+
+    def test_views(self):
+        self.culled.update_views(self.rects)
+
+        self.assertEqual(set(self.culled.views[0]), {self.left, self.edge})
+        self.assertEqual(set(self.culled.views[1]), {self.right, self.edge})
+
+    def test_moving_sprite(self):
+        self.culled.update_views(self.rects)
+        self.left.position = (2500, 500)
+        self.culled.update_views(self.rects)
+
+        self.assertNotIn(self.left, self.culled.views[0])
+        self.assertIn(self.left, self.culled.views[1])
+
+    def test_removed_sprite(self):
+        self.culled.update_views(self.rects)
+        self.right.remove_from_sprite_lists()
+        self.culled.update_views(self.rects)
+
+        self.assertNotIn(self.right, self.culled.views[1])
+        self.assertEqual(len(self.culled.query((0, 0, 5000, 5000))), 2)
+
+    def test_readded_sprite(self):
+        # Pooled sprites are taken out of every list, view lists included,
+        # and can be back in the source by the next frame.
+        self.culled.update_views(self.rects)
+        self.left.remove_from_sprite_lists()
+        self.source.append(self.left)
+        self.culled.update_views(self.rects)
+
+        self.assertIn(self.left, self.culled.views[0])
+
+    def test_culler_updates_once_per_frame(self):
+        culler = Culler(cell_size=256.0)
+        culler.begin_frame(self.rects)
+        culled = culler.culled(self.source)
+        self.left.position = (2500, 500)
+
+        self.assertIs(culler.culled(self.source), culled)
+        self.assertIn(self.left, culled.views[0])
+
+        culler.begin_frame(self.rects)
+        culler.culled(self.source)
+        self.assertNotIn(self.left, culled.views[0])
@@ -0,0 +1,86 @@
+import unittest
+
+import arcade
+
+from SpaceGame.shared.lod import FAR, MID, NEAR, LodScheduler
+
+DT = 1.0 / 60.0
+
+
+class Entity(arcade.Sprite):
+    def __init__(self, x, y):
+        super().__init__()
+        self.position = (x, y)
+        self.updates = []
+
+    def update(self, delta_time):
+        self.updates.append(delta_time)
+
+
+class TestLodScheduler(unittest.TestCase):
+    def setUp(self):
+        self.lod = LodScheduler(near_radius=100.0, far_radius=1000.0, mid_interval=4)
+        self.near = Entity(50.0, 0.0)
+        self.mid = Entity(500.0, 0.0)
+        self.far = Entity(5000.0, 0.0)
+        self.entities = arcade.SpriteList()
+        for entity in (self.near, self.mid, self.far):
+            self.entities.append(entity)
+        self.focus = [(0.0, 0.0)]
+
+    def run_ticks(self, ticks):
+        for _ in range(ticks):
+            self.lod.update([self.entities], self.focus, DT)
+
+    def test_tiers(self):
+        self.run_ticks(1)
+        self.assertEqual(self.lod.counts, {NEAR: 1, MID: 1, FAR: 1})
+
+    def test_update_rates(self):
+        self.run_ticks(8)
+        self.assertEqual(len(self.near.updates), 8)
+        self.assertEqual(len(self.mid.updates), 2)
+        self.assertEqual(self.far.updates, [])
+
+        # Mid tier updates get the time since their last update
+        self.assertAlmostEqual(self.mid.updates[1], 4 * DT)
+
+    def test_touch(self):
+        self.run_ticks(1)
+        self.lod.touch(self.far)
+        self.run_ticks(2)
+        self.assertEqual(len(self.far.updates), 2)
+        # Never more than mid_interval ticks of time
+        self.assertLessEqual(max(self.far.updates), 4 * DT + 1e-9)
+
+    def test_touch_on_regroup_tick(self):
+        self.run_ticks(4)
+        # Touched just before the tick that regroups
+        self.lod.touch(self.far)
+        self.run_ticks(1)
+        self.assertEqual(len(self.far.updates), 1)
+
+    def test_clear(self):
+        self.lod.update([self.entities], self.focus, DT)
+        self.lod.touch(self.far)
+        self.lod.clear()
+        self.assertEqual(self.lod.touched, set())
+        self.assertEqual(self.lod.near, [])
+        self.assertEqual(self.lod.counts, {NEAR: 0, MID: 0, FAR: 0})
+
+        # Starts over with a regroup
+        self.lod.update([self.entities], self.focus, DT)
+        self.assertEqual(self.lod.counts, {NEAR: 1, MID: 1, FAR: 1})
+
+    def test_removed_entities_are_skipped(self):
+        self.run_ticks(1)
+        self.near.remove_from_sprite_lists()
+        self.run_ticks(1)
+        self.assertEqual(len(self.near.updates), 1)
+
+    def test_no_focus_updates_everything(self):
+        self.focus = []
+        self.run_ticks(2)
+        self.assertEqual(self.lod.counts[NEAR], 3)
+        self.assertEqual(len(self.far.updates), 2)
+
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from SpaceGame.shared.LQR import Lqr
+
+
+def reference_lqr(lqr, setpoint, measured, dt):
+    # The control the original implementation returned, the gain of the
+    # last step of the horizon after the full backward Riccati recursion.
+    A, B, Q, R = lqr.A, lqr.getB(measured[2], dt), lqr.q, lqr.R
+    p = [None] * (lqr.n + 1)
+    p[lqr.n] = Q
+    for i in range(lqr.n, 0, -1):
+        p[i - 1] = Q + A.T @ p[i] @ A - (A.T @ p[i] @ B) @ np.linalg.pinv(R + B.T @ p[i] @ B) @ (B.T @ p[i] @ A)
+    k = -np.linalg.pinv(R + B.T @ p[lqr.n] @ B) @ B.T @ p[lqr.n] @ A
+    return k @ (setpoint - measured)
+
+
+class TestLqr(unittest.TestCase):
+    def setUp(self):
+        self.lqr = Lqr(max_velocity=10.0)
+        rng = np.random.default_rng(1)
+        self.setpoints = rng.uniform(-500, 500, (20, 3))
+        self.measured = rng.uniform(-500, 500, (20, 3))
+
+    def test_batch_matches_lqr(self):
+        controls = self.lqr.lqr_batch(self.setpoints, self.measured, 1.0 / 60.0)
+
+        self.assertEqual(controls.shape, (20, 2))
+        for i in range(20):
+            expected = self.lqr.lqr(self.setpoints[i], self.measured[i], 1.0 / 60.0)
+            np.testing.assert_allclose(controls[i], expected, rtol=1e-12)
+
+    def test_cached_gain_is_close(self):
+        for i in range(20):
+            expected = reference_lqr(self.lqr, self.setpoints[i], self.measured[i], 1.0 / 60.0)
+            control = self.lqr.lqr(self.setpoints[i], self.measured[i], 1.0 / 60.0)
+            np.testing.assert_allclose(control, expected, rtol=0.01, atol=1.0)
+
+    def test_gain_cache(self):
+        first = self.lqr.gain(0.5, 1.0 / 60.0)
+        self.assertIs(self.lqr.gain(0.5 + 1e-6, 1.0 / 60.0), first)
+        self.assertIs(self.lqr.gain(0.5 + 2.0 * np.pi, 1.0 / 60.0), first)
+        self.assertIsNot(self.lqr.gain(0.5, 1.0 / 30.0), first)
+
+    def test_dt_is_quantized(self):
+        # LOD updates hand out slightly different dts, they share gains
+        for i in range(100):
+            self.lqr.gain(0.5, 4.0 / 60.0 + i * 1e-6)
+        self.assertEqual(len(self.lqr._gains), 1)
+        np.testing.assert_allclose(self.lqr.lqr(self.setpoints[0], self.measured[0], 4.0 / 60.0 + 1e-4),
+                                   reference_lqr(self.lqr, self.setpoints[0], self.measured[0], 4.0 / 60.0),
+                                   rtol=0.01, atol=1.0)
@@ -0,0 +1,48 @@
+import math
+import unittest
+
+import numpy as np
+
+from SpaceGame.shared.maths import intercept_times, lead_angles
+
+SPEED = 1000.0
+
+
+class TestIntercept(unittest.TestCase):
+    def test_stationary_target(self):
+        times = intercept_times([(1000.0, 0.0)], [(0.0, 0.0)], SPEED)
+        self.assertAlmostEqual(times[0], 1.0)
+        self.assertAlmostEqual(lead_angles([(0.0, 500.0)], [(0.0, 0.0)], SPEED)[0], math.pi / 2)
+
+    def test_moving_targets_are_hit(self):
+        rng = np.random.default_rng(1)
+        offsets = rng.uniform(-2000.0, 2000.0, (100, 2))
+        velocities = rng.uniform(-400.0, 400.0, (100, 2))
+        start_offset = 100.0
+
+        times = intercept_times(offsets, velocities, SPEED, start_offset)
+        angles = lead_angles(offsets, velocities, SPEED, start_offset)
+        self.assertFalse(np.isnan(times).any())
+
+        # The projectile and the target end up in the same place
+        directions = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        projectiles = directions * (start_offset + SPEED * times)[:, None]
+        targets = offsets + velocities * times[:, None]
+        np.testing.assert_allclose(projectiles, targets, atol=1e-6)
+
+    def test_no_solution_falls_back_to_direct_aim(self):
+        # Running away faster than the projectile
+        offsets = [(1000.0, 0.0), (0.0, 50.0)]
+        velocities = [(2000.0, 0.0), (0.0, 0.0)]
+        times = intercept_times(offsets, velocities, SPEED, start_offset=100.0)
+        self.assertTrue(np.isnan(times).all())
+
+        angles = lead_angles(offsets, velocities, SPEED, start_offset=100.0)
+        np.testing.assert_allclose(angles, [0.0, math.pi / 2])
+
+    def test_same_speed(self):
+        # Target as fast as the projectile, the linear case
+        times = intercept_times([(1000.0, 0.0)], [(0.0, SPEED)], SPEED)
+        self.assertTrue(np.isnan(times[0]))
+        times = intercept_times([(1000.0, 0.0)], [(-SPEED, 0.0)], SPEED)
+        self.assertAlmostEqual(times[0], 0.5)
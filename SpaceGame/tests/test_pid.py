@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+
+from SpaceGame.shared.PID import Pid, PidBank, PidInput
+
+
+def pid_input(kp=0.5, lim_min=-200, lim_max=200):
+    return PidInput(kp=kp,
+                    ki=0.00002,
+                    kd=75.0,
+                    tau=0.0,
+                    lim_min=lim_min,
+                    lim_max=lim_max,
+                    lim_min_init=0.0,
+                    lim_max_init=5.0)
+
+
+class TestPidBank(unittest.TestCase):
+    def test_matches_pid(self):
+        rng = np.random.default_rng(1)
+        inputs = [pid_input(kp=kp) for kp in rng.uniform(0.1, 2.0, 50)]
+        pids = [Pid(i) for i in inputs]
+        bank = PidBank(inputs[0])
+        for i in inputs:
+            bank.allocate(i)
+
+        for _ in range(100):
+            measurements = rng.uniform(-1000, 1000, 50)
+            dt = rng.uniform(0.01, 1.0)
+
+            outputs = bank.update(100, measurements, dt)
+            expected = [pid.update(100, m, dt) for pid, m in zip(pids, measurements)]
+            np.testing.assert_allclose(outputs, expected, rtol=1e-12)
+
+    def test_clamping(self):
+        bank = PidBank(pid_input(lim_min=-5, lim_max=5))
+        bank.allocate()
+        bank.allocate()
+
+        outputs = bank.update(0.0, np.array([-1000.0, 1000.0]), 1.0)
+        np.testing.assert_array_equal(outputs, [5.0, -5.0])
+
+    def test_release_reuses_slot(self):
+        bank = PidBank(pid_input())
+        first = bank.allocate()
+        bank.allocate()
+        bank.update(0.0, np.array([10.0, 10.0]), 1.0)
+
+        bank.release(first)
+        self.assertEqual(len(bank), 1)
+        self.assertEqual(bank.allocate(), first)
+        self.assertEqual(bank.prev_error[first], 0.0)
+        self.assertEqual(bank.size, 2)
+
+    def test_grows(self):
+        bank = PidBank(pid_input(), capacity=2)
+        for _ in range(40):
+            bank.allocate()
+
+        self.assertEqual(len(bank), 40)
+        self.assertEqual(bank.update(0.0, np.zeros(40), 1.0).shape, (40,))
+
+    def test_released_slots_are_not_stepped(self):
+        bank = PidBank(pid_input())
+        first = bank.allocate()
+        bank.allocate()
+        bank.release(first)
+
+        outputs = bank.update(0.0, np.array([10.0, 10.0]), 1.0)
+        self.assertEqual(outputs[first], 0.0)
+        self.assertEqual(bank.prev_error[first], 0.0)
+        self.assertNotEqual(outputs[1], 0.0)
+
+    def test_update_index(self):
+        inputs = [pid_input(kp=kp) for kp in (0.5, 1.0, 1.5)]
+        pids = [Pid(i) for i in inputs]
+        bank = PidBank(inputs[0])
+        for i in inputs:
+            bank.allocate(i)
+
+        outputs = bank.update(100, np.array([20.0, -30.0]), np.array([1.0, 2.0]), index=[2, 0])
+        np.testing.assert_allclose(outputs, [pids[2].update(100, 20.0, 1.0), pids[0].update(100, -30.0, 2.0)])
+        self.assertEqual(bank.prev_error[1], 0.0)
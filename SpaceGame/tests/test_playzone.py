@@ -0,0 +1,404 @@
+import math
+import os
+import random
+import unittest
+
+import arcade
+import numpy as np
+
+from SpaceGame.gamemodes.simulation import PVP_START_POSITIONS, setup_headless_pvp
+from SpaceGame.PlayZone import CHUNK_OBJECT_KINDS, ChunkedPlayZone, is_touching
+from SpaceGame.gametypes.PlayZoneTypes import SpaceObject
+from SpaceGame.gametypes.SpaceStations import stations_small
+from SpaceGame.settings import SettingsManager
+from SpaceGame.shared.spawning import SpawnDirector, SpawnPlacer
+
+RESOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "resources")
+
+
+def chunked_simulation_settings():
+    settings = SettingsManager()
+    settings['PLAY_ZONE_MODE'] = 'chunked'
+    return settings
+
+
+def chunked_simulation(seed=1):
+    return setup_headless_pvp(chunked_simulation_settings(), seed=seed)
+
+
+def world(simulation):
+    play_zone = simulation.play_zone
+    return ([(obj.spritefile, tuple(obj.body.position), tuple(obj.body.velocity), obj.body.angular_velocity)
+             for obj in play_zone.spacejunk]
+            + [(ufo.spritefile, ufo.name, tuple(ufo.body.position)) for ufo in play_zone.ufos])
+
+
+def chunk_contents(play_zone, chunk):
+    return sorted((obj.chunk_kind, round(obj.center_x, 3), round(obj.center_y, 3))
+                  for spritelist in (play_zone.spacejunk, play_zone.ufos)
+                  for obj in spritelist
+                  if play_zone.chunk_of(obj.center_x, obj.center_y) == chunk)
+
+
+class TestPlayZoneGeneration(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+
+    def test_same_seed_same_world(self):
+        first = world(setup_headless_pvp(SettingsManager(), seed=1234))
+        # Nothing outside the generator can perturb it
+        random.seed(99)
+        random.random()
+        second = world(setup_headless_pvp(SettingsManager(), seed=1234))
+
+        self.assertEqual(repr(first), repr(second))
+
+    def test_global_random_untouched(self):
+        for settings in (SettingsManager(), chunked_simulation_settings()):
+            random.seed(99)
+            state = random.getstate()
+            setup_headless_pvp(settings, seed=1234)
+            self.assertEqual(random.getstate(), state)
+
+    def test_different_seed_different_world(self):
+        first = world(setup_headless_pvp(SettingsManager(), seed=1))
+        second = world(setup_headless_pvp(SettingsManager(), seed=2))
+
+        self.assertNotEqual(first, second)
+
+
+class TestBatchGeneration(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+        self.simulation = setup_headless_pvp(SettingsManager(), seed=1)
+        self.generator = self.simulation.play_zone.generator
+
+    def generate(self, n):
+        return self.generator.generate_batch(n, SpaceObject, stations_small, (-20, 20), (-2, 2), 'test')
+
+    def test_batch(self):
+        placer = self.generator.placer
+        placed = placer.placed
+        objects = self.generate(200)
+
+        self.assertEqual(len(objects), placer.placed - placed)
+        self.assertGreater(len(objects), 150)
+        for obj in objects:
+            self.assertIn(obj, self.simulation.physics_engine.sprites)
+            self.assertEqual(tuple(obj.body.position), tuple(obj.position))
+            self.assertIn(obj.body, self.simulation.physics_engine.space.bodies)
+
+    def test_no_overlaps(self):
+        objects = list(self.simulation.play_zone.spacejunk) + self.generate(200)
+        for i, a in enumerate(objects):
+            for b in objects[i + 1:]:
+                distance = math.dist(a.position, b.position)
+                self.assertGreater(distance, (math.hypot(a.width, a.height) + math.hypot(b.width, b.height)) / 2.0)
+
+    def test_deterministic(self):
+        first = [tuple(obj.position) for obj in self.generate(50)]
+        other = setup_headless_pvp(SettingsManager(), seed=1).play_zone.generator
+        second = [tuple(obj.position) for obj in
+                  other.generate_batch(50, SpaceObject, stations_small, (-20, 20), (-2, 2), 'test')]
+        self.assertEqual(first, second)
+
+    def test_batch_world(self):
+        play_zone = self.simulation.play_zone
+        data = play_zone.generator.spacejunk_data
+        self.assertEqual(len(play_zone.spacejunk), data.num_stations_small + data.num_stations_big)
+        self.simulation.run(10)
+
+
+class TestSpawnPlacement(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+
+    def test_keep_out(self):
+        settings = SettingsManager()
+        for seed in range(5):
+            simulation = setup_headless_pvp(settings, seed=seed)
+            play_zone = simulation.play_zone
+            for obj in list(play_zone.spacejunk) + list(play_zone.ufos):
+                for start in PVP_START_POSITIONS:
+                    self.assertGreater(math.dist(obj.position, start), settings['SPAWN_KEEP_OUT_RADIUS'])
+
+    def test_placer_stats(self):
+        placer = SpawnPlacer((0.0, 0.0, 100.0, 100.0), spacing=0.0, max_attempts=5)
+        rng = random.Random(1)
+
+        self.assertIsNotNone(placer.place(10.0, rng))
+        placer.keep_out(50.0, 50.0, 1000.0)
+        self.assertIsNone(placer.place(10.0, rng))
+
+        self.assertEqual(placer.placed, 1)
+        self.assertEqual(placer.failures, 1)
+        self.assertEqual(placer.attempts, placer.stats()['attempts'])
+        self.assertGreaterEqual(placer.attempts, 6)
+
+    def test_place_many(self):
+        placer = SpawnPlacer((0.0, 0.0, 1000.0, 1000.0))
+        positions = placer.place_many(np.full(10, 20.0), np.random.default_rng(1))
+
+        self.assertFalse(np.isnan(positions).any())
+        for i in range(10):
+            for j in range(i + 1, 10):
+                self.assertGreaterEqual(math.dist(positions[i], positions[j]), 40.0)
+
+
+class TestSleeping(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+        self.simulation = setup_headless_pvp(SettingsManager(), seed=1)
+        self.play_zone = self.simulation.play_zone
+
+    def move_players_away(self):
+        for player in self.simulation.players:
+            player.body.position = (-100000.0, -100000.0)
+            player.position = (-100000.0, -100000.0)
+
+    def test_far_junk_sleeps(self):
+        for junk in self.play_zone.spacejunk:
+            junk.body.velocity = (1.0, 0.0)
+        self.move_players_away()
+        self.play_zone.update_sleeping()
+
+        self.assertTrue(len(self.play_zone.spacejunk) > 0)
+        # Everything but junk that is touching something is asleep
+        self.assertTrue(all(junk.body.is_sleeping or is_touching(junk.body)
+                            for junk in self.play_zone.spacejunk))
+
+    def test_far_drifting_junk_keeps_moving(self):
+        junk = self.play_zone.spacejunk[0]
+        junk.body.velocity = (50.0, 0.0)
+        self.move_players_away()
+        self.play_zone.update_sleeping()
+
+        self.assertFalse(junk.body.is_sleeping)
+        x = junk.body.position.x
+        self.simulation.step()
+        self.assertGreater(junk.body.position.x, x)
+
+    def test_near_junk_wakes(self):
+        self.simulation.run(60)
+        junk = next(junk for junk in self.play_zone.spacejunk if junk.body.is_sleeping)
+
+        player = self.simulation.players_list[0]
+        player.body.position = (junk.center_x + 500.0, junk.center_y)
+        player.position = (junk.center_x + 500.0, junk.center_y)
+        self.play_zone.update_sleeping()
+        self.assertFalse(junk.body.is_sleeping)
+
+    def test_only_damaged_junk_is_updated(self):
+        junk = self.play_zone.spacejunk[0]
+        ship = self.simulation.players_list[0]
+        bullet = self.simulation.bullet_pool.fire((ship.center_x, ship.center_y), 0.0, ship)
+        bullet.damage = junk.health
+
+        junk.damage(bullet)
+        self.assertIn(junk, self.play_zone.damaged)
+        self.simulation.step()
+        self.assertNotIn(junk, self.play_zone.spacejunk)
+        self.assertEqual(len(self.play_zone.damaged), 0)
+
+
+class TestLodOff(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+        self.simulation = setup_headless_pvp(SettingsManager(), seed=1)
+        self.play_zone = self.simulation.play_zone
+
+    def test_touches_are_not_kept(self):
+        self.simulation.settings['LOD'] = False
+        ufo = self.play_zone.ufos[0]
+        ufo.hitpoints = 0
+        self.play_zone.touch(ufo)
+        self.simulation.step()
+
+        self.assertNotIn(ufo, self.play_zone.ufos)
+        self.assertEqual(self.play_zone.lod.touched, set())
+        self.assertEqual(self.play_zone.lod._fresh, set())
+
+    def test_turning_lod_off_forgets_entities(self):
+        self.simulation.run(4)
+        self.play_zone.touch(self.play_zone.ufos[0])
+        self.assertTrue(self.play_zone.lod.touched)
+
+        self.simulation.settings['LOD'] = False
+        self.simulation.step()
+        self.assertEqual(self.play_zone.lod.touched, set())
+        self.assertEqual(self.play_zone.lod.near, [])
+
+
+class TestChunkedPlayZone(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+        self.simulation = chunked_simulation()
+        self.play_zone = self.simulation.play_zone
+
+    def move_players(self, position):
+        for player in self.simulation.players:
+            player.body.position = position
+            player.position = position
+
+    def test_chunked_setup(self):
+        self.assertIsInstance(self.play_zone, ChunkedPlayZone)
+        self.assertEqual(self.play_zone.walls, [])
+        self.assertEqual(len(self.play_zone.loaded), 9)
+
+    def test_deterministic_chunks(self):
+        other = chunked_simulation().play_zone
+        for chunk in self.play_zone.loaded:
+            self.assertEqual(chunk_contents(self.play_zone, chunk), chunk_contents(other, chunk))
+
+    def test_no_overlaps_across_chunks(self):
+        # Many objects per chunk, so some end up near the borders
+        for seed in range(3):
+            settings = chunked_simulation_settings()
+            settings['CHUNK_SIZE'] = 600.0
+            play_zone = setup_headless_pvp(settings, seed=seed).play_zone
+            objects = list(play_zone.spacejunk) + list(play_zone.ufos)
+            for i, a in enumerate(objects):
+                for b in objects[i + 1:]:
+                    self.assertGreater(math.dist(a.position, b.position),
+                                       (math.hypot(a.width, a.height) + math.hypot(b.width, b.height)) / 2.0)
+
+    def test_placer_sees_frozen_neighbours(self):
+        chunk_size = self.play_zone.chunk_size
+        # A station frozen at the edge of the chunk next to one not generated yet
+        kind = next(kind for kind, (Object, _) in enumerate(CHUNK_OBJECT_KINDS) if Object is SpaceObject)
+        x, y = 50.0 * chunk_size - 10.0, 50.5 * chunk_size
+        self.play_zone.frozen[(49, 50)] = [(kind, x, y, 0.0, 0.0, 0.0, 0.0, 1, None, None)]
+
+        placer = self.play_zone.chunk_placer((50, 50))
+        self.assertFalse(placer.is_clear(x + 20.0, y, 10.0))
+
+    def test_far_chunks_are_frozen(self):
+        originals = list(self.play_zone.spacejunk) + list(self.play_zone.ufos)
+        self.assertTrue(len(originals) > 0)
+
+        self.move_players((100000.0, 100000.0))
+        self.play_zone.stream()
+
+        self.assertNotIn((0, 0), self.play_zone.loaded)
+        self.assertEqual(self.play_zone.num_frozen(), len(originals))
+        space_bodies = set(self.simulation.physics_engine.space.bodies)
+        for obj in originals:
+            self.assertNotIn(obj.body, space_bodies)
+            self.assertNotIn(obj, self.simulation.physics_engine.sprites)
+
+    def test_thawed_objects_keep_their_state(self):
+        obj = self.play_zone.spacejunk[0]
+        chunk = self.play_zone.chunk_of(obj.center_x, obj.center_y)
+        obj.body.velocity = (0.0, 0.0)
+        state = (obj.chunk_kind, obj.body.position.x, obj.body.position.y)
+
+        self.move_players((100000.0, 100000.0))
+        self.play_zone.stream()
+        self.assertNotIn(obj, self.play_zone.spacejunk)
+
+        self.move_players((0.0, 0.0))
+        self.play_zone.stream()
+        self.assertIn(chunk, self.play_zone.loaded)
+        restored = [(o.chunk_kind, o.body.position.x, o.body.position.y) for o in self.play_zone.spacejunk]
+        self.assertIn(state, restored)
+
+    def test_stepping(self):
+        self.simulation.run(60)
+        self.assertEqual(self.simulation.ticks, 60)
+
+
+class TestSpawnDirector(unittest.TestCase):
+    def setUp(self):
+        self.director = SpawnDirector(budget=20, target_tick_time=0.01, max_batch=5)
+        self.targets = {'ufos': 6, 'bugs': 10}
+
+    def test_grows_while_there_is_headroom(self):
+        self.director.record(0.001)
+        counts = {'ufos': 0, 'bugs': 0}
+        for _ in range(20):
+            changes = self.director.plan(self.targets, counts)
+            counts = {kind: counts[kind] + changes[kind] for kind in counts}
+        self.assertEqual(counts, self.targets)
+        self.assertEqual(self.director.backoffs, 0)
+
+    def test_budget(self):
+        self.director.record(0.001)
+        self.director.capacity = 20
+        changes = self.director.plan({'ufos': 10, 'bugs': 30}, {'ufos': 0, 'bugs': 0})
+        self.assertEqual(changes, {'ufos': 5, 'bugs': 5})
+        self.assertEqual(self.director.share({'ufos': 10, 'bugs': 30}), {'ufos': 5, 'bugs': 15})
+
+    def test_backs_off_when_ticks_are_slow(self):
+        self.director.capacity = 16
+        self.director.record(0.02)
+        changes = self.director.plan(self.targets, self.targets)
+        self.assertEqual(self.director.capacity, 12)
+        self.assertEqual(sum(changes.values()), -4)
+        self.assertEqual(self.director.backoffs, 1)
+
+    def test_min_capacity(self):
+        self.director.set_min_capacity(8)
+        self.assertEqual(self.director.capacity, 8)
+        self.director.record(0.02)
+        self.director.plan(self.targets, {'ufos': 2, 'bugs': 2})
+        self.assertEqual(self.director.capacity, 8)
+
+    def test_counts_reported_changes(self):
+        self.director.record(0.001)
+        self.director.plan(self.targets, {'ufos': 0, 'bugs': 0})
+        self.assertEqual(self.director.spawned, 0)
+        self.director.record_changes(3, 1)
+        self.assertEqual((self.director.spawned, self.director.despawned), (3, 1))
+
+    def test_tick_time_average(self):
+        self.assertEqual(self.director.load, 0.0)
+        self.director.record(0.01)
+        self.director.record(0.02)
+        self.assertAlmostEqual(self.director.tick_time, 0.011)
+
+
+class TestDirectedSpawning(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+        self.settings = SettingsManager()
+        self.settings['SPAWN_DIRECTOR'] = True
+        self.simulation = setup_headless_pvp(self.settings, seed=1)
+        self.play_zone = self.simulation.play_zone
+
+    def test_spawns_during_the_match(self):
+        self.assertEqual(len(self.play_zone.ufos), 0)
+        self.assertEqual(len(self.play_zone.bugs), 0)
+
+        self.simulation.run(600)
+        self.assertGreater(len(self.play_zone.ufos), 0)
+        self.assertGreater(len(self.play_zone.bugs), 0)
+        self.assertGreater(self.play_zone.director.spawned, 0)
+
+    def test_starts_with_the_difficulty_minimum(self):
+        self.assertEqual(self.play_zone.director.capacity, sum(self.play_zone.spawn_minimums().values()))
+        self.assertGreater(self.play_zone.director.capacity, 0)
+
+    def test_counts_only_placed_spawns(self):
+        self.play_zone.director_position = lambda: None
+        self.play_zone.direct_spawns()
+        self.assertEqual(len(self.play_zone.ufos), 0)
+        self.assertEqual(self.play_zone.director.spawned, 0)
+
+    def test_spawns_out_of_sight(self):
+        self.assertEqual(self.play_zone.spawn_enemies('bugs', 5), 5)
+        self.assertEqual(len(self.play_zone.bugs), 5)
+        for bug in self.play_zone.bugs:
+            self.assertTrue(self.play_zone.in_bounds(bug.center_x, bug.center_y))
+            for player in self.simulation.players:
+                self.assertGreaterEqual(math.dist(bug.position, player.position),
+                                        self.settings['SPAWN_MIN_DISTANCE'])
+
+    def test_despawns_furthest(self):
+        self.play_zone.spawn_enemies('ufos', 4)
+        ufos = list(self.play_zone.ufos)
+        player = self.simulation.players[0]
+        furthest = max(ufos, key=lambda ufo: math.dist(ufo.position, player.position))
+
+        self.assertEqual(self.play_zone.despawn_enemies('ufos', 1), 1)
+        self.assertEqual(len(self.play_zone.ufos), 3)
+        self.assertNotIn(furthest, self.play_zone.ufos)
@@ -0,0 +1,452 @@
+import gc
+import math
+import os
+import unittest
+
+import arcade
+import numpy as np
+
+from SpaceGame.gamemodes.simulation import setup_headless_pvp
+from SpaceGame.gametypes.Explosion import ExplosionSize
+from SpaceGame.gametypes.Bullet import BULLET_SPEED
+from SpaceGame.gametypes.UFOs import UFO, UFOS, UFO_BULLET_SPAWN_OFFSET, UFO_GUN_COOLDOWN
+from SpaceGame.gametypes.enemies.Bug import BUG_PID_INPUT, PID_SETPOINT
+from SpaceGame.gametypes.enemies.BugSwarm import SWARM_MAX_SPEED
+from SpaceGame.settings import SettingsManager
+from SpaceGame.shared.maths import lead_points
+from SpaceGame.shared.PID import Pid
+from SpaceGame.shared.physics import HIT_BOUNDARY, HIT_SHIP, HIT_SPACE_JUNK
+
+RESOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "resources")
+
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+        self.simulation = setup_headless_pvp(SettingsManager(), seed=1)
+
+    def test_headless_setup(self):
+        self.assertEqual(self.simulation.num_players(), 2)
+        self.assertTrue(len(self.simulation.play_zone.spacejunk) > 0)
+        self.assertTrue(len(self.simulation.play_zone.ufos) > 0)
+
+    def test_step(self):
+        self.simulation.run(60)
+        self.assertEqual(self.simulation.ticks, 60)
+        self.assertAlmostEqual(self.simulation.elapsed_time, 1.0)
+
+    def test_step_follows_tick_rate(self):
+        self.simulation.settings['TICK_RATE'] = 120
+        self.simulation.run(120)
+        self.assertAlmostEqual(self.simulation.elapsed_time, 1.0)
+
+    def test_shoot(self):
+        self.simulation.players_list[0].shoot()
+        self.assertEqual(len(self.simulation.bullets), 1)
+        self.simulation.run(10)
+
+    def test_bullet_pool_reuse(self):
+        pool = self.simulation.bullet_pool
+        ship = self.simulation.players_list[0]
+
+        bullet = pool.fire((ship.center_x, ship.center_y), 0.0, ship)
+        self.assertIn(bullet.body, self.simulation.physics_engine.space.bodies)
+
+        bullet.deactivate()
+        self.assertNotIn(bullet.body, self.simulation.physics_engine.space.bodies)
+        self.assertEqual(len(self.simulation.bullets), 0)
+
+        self.assertIs(pool.fire((ship.center_x, ship.center_y), 0.0, ship), bullet)
+        self.assertEqual(pool.hits, 2)
+        self.assertEqual(pool.misses, 0)
+
+    def test_bullet_filters(self):
+        pool = self.simulation.bullet_pool
+        ship, other = self.simulation.players_list[:2]
+
+        bullet = pool.fire((ship.center_x, ship.center_y), 0.0, ship)
+        other_bullet = pool.fire((other.center_x, other.center_y), 0.0, other)
+
+        # A ship and its own bullets share a group, pymunk never pairs them
+        self.assertNotEqual(bullet.shape.filter.group, 0)
+        self.assertEqual(ship.shape.filter.group, bullet.shape.filter.group)
+        self.assertNotEqual(bullet.shape.filter.group, other_bullet.shape.filter.group)
+        self.assertTrue(other_bullet.shape.filter.mask & bullet.shape.filter.categories)
+
+    def test_bullet_pool_forgets_dead_shooters(self):
+        pool = self.simulation.bullet_pool
+        ufo = UFO(UFOS[0], self.simulation)
+        ufo.position = (1000.0, 1000.0)
+        ufo.setup()
+        self.simulation.play_zone.ufos.append(ufo)
+
+        pool.fire((ufo.center_x, ufo.center_y), 0.0, ufo).deactivate()
+        group = pool.shooter_filter(ufo).group
+        shooters = len(pool._groups)
+
+        ufo.despawn()
+        del ufo
+        # pymunk holds on to removed shapes until its next step
+        self.simulation.step()
+        gc.collect()
+        self.assertEqual(len(pool._groups), shooters - 1)
+
+        # Its group is handed out again
+        ship = self.simulation.players_list[0]
+        pool._groups.pop(ship, None)
+        self.assertEqual(pool.shooter_filter(ship).group, group)
+
+    def test_bullets_pass_through_each_other(self):
+        settings = SettingsManager()
+        settings['BULLETS_COLLIDE'] = False
+        simulation = setup_headless_pvp(settings, seed=1)
+        ship, other = simulation.players_list[:2]
+
+        bullet = simulation.bullet_pool.fire((ship.center_x, ship.center_y), 0.0, ship)
+        other_bullet = simulation.bullet_pool.fire((other.center_x, other.center_y), 0.0, other)
+        self.assertFalse(other_bullet.shape.filter.mask & bullet.shape.filter.categories)
+        # Bullets still hit ships
+        self.assertTrue(bullet.shape.filter.mask & other.shape.filter.categories)
+
+        # Overlapping bullets are filtered out by pymunk itself
+        space = simulation.physics_engine.space
+        bullet.body.position = other_bullet.body.position
+        space.reindex_shapes_for_body(bullet.body)
+        touching = [info.shape for info in space.shape_query(bullet.shape)]
+        self.assertNotIn(other_bullet.shape, touching)
+
+    def test_collisions_resolved_once(self):
+        ship, other = self.simulation.players_list[:2]
+        junk = self.simulation.play_zone.spacejunk[0]
+        bullet = self.simulation.bullet_pool.fire((ship.center_x, ship.center_y), 0.0, ship)
+        hitpoints = other.hitpoints
+        health = junk._data.health
+
+        # One bullet reported hitting two things in the same step
+        collisions = self.simulation.collisions
+        collisions.push(HIT_SHIP, bullet, other)
+        collisions.push(HIT_SPACE_JUNK, bullet, junk)
+        collisions.push(HIT_SHIP, bullet, other)
+        collisions.resolve(self.simulation)
+
+        self.assertEqual(len(collisions), 0)
+        self.assertEqual(collisions.resolved, 1)
+        self.assertEqual(collisions.duplicates, 2)
+        self.assertFalse(bullet.active)
+        self.assertEqual(other.hitpoints, hitpoints - bullet.damage)
+        self.assertEqual(junk._data.health, health)
+
+    def test_collision_buffers_are_reused(self):
+        ship, other = self.simulation.players_list[:2]
+        collisions = self.simulation.collisions
+        capacity = collisions.capacity
+        kinds = collisions._kinds
+        consumed = collisions._consumed
+
+        for _ in range(2):
+            for _ in range(capacity):
+                bullet = self.simulation.bullet_pool.fire((ship.center_x, ship.center_y), 0.0, ship)
+                collisions.push(HIT_BOUNDARY, bullet)
+            collisions.resolve(self.simulation)
+
+        self.assertEqual(collisions.resolved, 2 * capacity)
+        self.assertEqual(collisions.capacity, capacity)
+        self.assertIs(collisions._kinds, kinds)
+        self.assertIs(collisions._consumed, consumed)
+        self.assertEqual(len(self.simulation.bullets), 0)
+
+    def test_bullet_leaves_play_zone(self):
+        ship = self.simulation.players_list[0]
+        width, height = self.simulation.play_zone.dimensions
+        bullet = self.simulation.bullet_pool.fire((width / 2.0, height - 100.0), 0.0, ship)
+
+        # Up out of the play zone, retired by the boundary sensor
+        self.simulation.run(10)
+        self.assertFalse(bullet.active)
+        self.assertNotIn(bullet, self.simulation.bullets)
+
+    def test_boundary_sensor_only_sees_bullets(self):
+        ship = self.simulation.players_list[0]
+        bullet = self.simulation.bullet_pool.fire((ship.center_x, ship.center_y), 0.0, ship)
+        junk = self.simulation.play_zone.spacejunk[0]
+        def collide(a, b):
+            return bool(a.categories & b.mask and b.categories & a.mask)
+
+        for segment in self.simulation.play_zone.bullet_sensor.segments:
+            self.assertTrue(collide(segment.filter, bullet.shape.filter))
+            self.assertFalse(collide(segment.filter, ship.shape.filter))
+            self.assertFalse(collide(segment.filter, junk.shape.filter))
+
+    def test_bullet_speed_independent_of_tick_rate(self):
+        ship = self.simulation.players_list[0]
+        for tick_rate in (30, 60, 120):
+            self.simulation.settings['TICK_RATE'] = tick_rate
+            bullet = self.simulation.bullet_pool.fire((-5000.0, -5000.0), 0.0, ship)
+            start = bullet.body.position.y
+            self.simulation.run(tick_rate // 10)
+            self.assertAlmostEqual((bullet.body.position.y - start) * 10.0, BULLET_SPEED, places=3)
+            bullet.deactivate()
+
+    def test_bullet_lifetime(self):
+        ship = self.simulation.players_list[0]
+        bullet = self.simulation.bullet_pool.fire((ship.center_x, ship.center_y), 0.0, ship)
+        # Parked out of the way so it can't hit anything
+        bullet.body.velocity = (0.0, 0.0)
+        bullet.body.position = (-5000.0, -5000.0)
+
+        lifetime = self.simulation.settings['BULLET_LIFETIME']
+        self.simulation.run(int(lifetime * self.simulation.settings['TICK_RATE']) - 1)
+        self.assertTrue(bullet.active)
+        self.simulation.run(2)
+        self.assertFalse(bullet.active)
+
+    def test_explosion_pool(self):
+        pool = self.simulation.explosion_pool
+        explosion = pool.spawn((500, 500), ExplosionSize.SMALL)
+        self.assertIn(explosion, self.simulation.explosions)
+
+        # The animation lasts one second whatever the frame rate. Other
+        # explosions may happen during the match, so only track this one.
+        self.simulation.run(29, delta_time=1.0 / 30.0)
+        self.assertIn(explosion, self.simulation.explosions)
+        self.simulation.run(2, delta_time=1.0 / 30.0)
+        self.assertNotIn(explosion, self.simulation.explosions)
+        self.assertEqual(pool.misses, 0)
+
+    def test_explosion_off_camera(self):
+        explosion = self.simulation.explosion_pool.spawn((500, 500), ExplosionSize.SMALL)
+        self.simulation.explosions.update(0.5)
+        self.assertEqual(explosion.current_texture, 0)
+
+        self.simulation.view_rects = [(0, 0, 1000, 1000)]
+        self.simulation.explosions.update(0.1)
+        self.assertEqual(explosion.current_texture, 36)
+
+    def test_space_objects_share_texture(self):
+        junk = self.simulation.play_zone.spacejunk
+        by_file = {}
+        for obj in junk:
+            by_file.setdefault(obj.spritefile, obj)
+            self.assertIs(obj.texture, by_file[obj.spritefile].texture)
+
+    def test_fixed_timestep(self):
+        tick = self.simulation.tick_delta_time
+
+        self.assertEqual(self.simulation.advance(tick * 0.5), 0)
+        self.assertEqual(self.simulation.advance(tick * 0.75), 1)
+        self.assertAlmostEqual(self.simulation.alpha, 0.25)
+        self.assertEqual(self.simulation.ticks, 1)
+
+        # A long frame runs at most MAX_SUBSTEPS ticks and drops the rest
+        self.assertEqual(self.simulation.advance(1.0), self.simulation.settings['MAX_SUBSTEPS'])
+        self.assertLess(self.simulation.accumulator, tick)
+
+    def test_interpolated(self):
+        tick = self.simulation.tick_delta_time
+        ship = self.simulation.players_list[0]
+        ship.body.velocity = (600.0, 0.0)
+
+        self.simulation.advance(tick)
+        before = ship.center_x
+        self.simulation.advance(tick * 1.5)
+        after = ship.center_x
+
+        with self.simulation.interpolated():
+            self.assertAlmostEqual(ship.center_x, before + (after - before) * 0.5, places=3)
+        self.assertEqual(ship.center_x, after)
+
+
+class TestUFOSquadron(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+        self.simulation = setup_headless_pvp(SettingsManager(), seed=1)
+        self.play_zone = self.simulation.play_zone
+        self.squadron = self.play_zone.squadron
+        for ufo in list(self.play_zone.ufos):
+            ufo.remove_from_sprite_lists()
+
+    def add_ufo(self, x, y):
+        ufo = UFO(UFOS[0], self.simulation)
+        ufo.position = (x, y)
+        ufo.setup()
+        self.play_zone.ufos.append(ufo)
+        return ufo
+
+    def bullets_from(self, ufo):
+        return [bullet for bullet in self.simulation.bullets if bullet.creator is ufo]
+
+    def test_fires_at_players_in_range(self):
+        player = self.simulation.players_list[1]
+        near = self.add_ufo(player.center_x + 300.0, player.center_y)
+        far = self.add_ufo(player.center_x + 3000.0, player.center_y + 3000.0)
+
+        self.squadron.update(1.0 / 60.0)
+        self.assertEqual(len(self.bullets_from(near)), 1)
+        self.assertEqual(self.bullets_from(far), [])
+        # Aimed along -x, UFO angles are measured from +y
+        self.assertIs(near.target, player)
+        self.assertAlmostEqual(near.target_angle, math.pi / 2.0)
+
+        # Then waits for its gun to cool down
+        self.squadron.update(1.0 / 60.0)
+        self.assertEqual(len(self.bullets_from(near)), 1)
+        self.assertAlmostEqual(self.squadron.cooldowns[0], UFO_GUN_COOLDOWN - 2.0 / 60.0)
+
+    def test_line_of_sight(self):
+        player = self.simulation.players_list[1]
+        ufo = self.add_ufo(player.center_x + 400.0, player.center_y)
+
+        # Park a station between the UFO and its target
+        junk = self.play_zone.spacejunk[0]
+        junk.body.position = (player.center_x + 200.0, player.center_y)
+        junk.body.velocity = (0.0, 0.0)
+        self.simulation.physics_engine.space.reindex_shapes_for_body(junk.body)
+
+        sight = self.play_zone.sight
+        sight.begin_tick()
+        self.squadron.update(1.0 / 60.0)
+        self.assertEqual(self.bullets_from(ufo), [])
+        self.assertEqual(sight.stats(), {'queries': 1, 'cache_hits': 0, 'blocked': 1})
+
+        # Still ready to fire, the blocked result is reused
+        sight.begin_tick()
+        self.squadron.update(1.0 / 60.0)
+        self.assertEqual(sight.stats(), {'queries': 1, 'cache_hits': 1, 'blocked': 1})
+
+    def test_line_of_sight_forgets_despawned_shooters(self):
+        player = self.simulation.players_list[1]
+        ufo = self.add_ufo(player.center_x + 400.0, player.center_y)
+        sight = self.play_zone.sight
+        sight.begin_tick()
+        sight.is_clear(ufo, player, ufo.position, self.simulation.bullet_pool.sight_filter(ufo))
+        self.assertIn(ufo, sight._cache)
+
+        # Cleaned up before its result expires once it has left the play zone
+        ufo.remove_from_sprite_lists()
+        for _ in range(sight.cache_ticks - 1):
+            sight.begin_tick()
+        self.assertNotIn(ufo, sight._cache)
+
+    def test_line_of_sight_follows_the_lead(self):
+        player = self.simulation.players_list[1]
+        player.body.velocity = (0.0, 800.0)
+        ufo = self.add_ufo(player.center_x + 400.0, player.center_y)
+        aim = lead_points([(-400.0, 0.0)], [(0.0, 800.0)],
+                          BULLET_SPEED, UFO_BULLET_SPAWN_OFFSET)[0]
+
+        # A station in the way of the leading shot, but not of the direct line
+        junk = self.play_zone.spacejunk[0]
+        junk.body.position = (ufo.center_x + 0.75 * aim[0], ufo.center_y + 0.75 * aim[1])
+        junk.body.velocity = (0.0, 0.0)
+        space = self.simulation.physics_engine.space
+        space.reindex_shapes_for_body(junk.body)
+        direct = space.segment_query_first(ufo.position, player.position, 2.0,
+                                           self.simulation.bullet_pool.sight_filter(ufo))
+        self.assertIs(direct.shape.body, player.body)
+
+        self.play_zone.sight.begin_tick()
+        self.squadron.update(1.0 / 60.0)
+        self.assertEqual(self.bullets_from(ufo), [])
+        self.assertEqual(self.play_zone.sight.blocked, 1)
+
+    def test_lead_ignores_tick_rate(self):
+        player = self.simulation.players_list[1]
+        player.body.velocity = (0.0, 800.0)
+        ufo = self.add_ufo(player.center_x + 400.0, player.center_y)
+
+        angle = ufo.find_lead_angle_to_target(player)
+        self.simulation.settings['TICK_RATE'] = 120
+        self.assertAlmostEqual(ufo.find_lead_angle_to_target(player), angle)
+
+    def test_membership_changes(self):
+        first = self.add_ufo(0.0, 0.0)
+        second = self.add_ufo(100.0, 0.0)
+        self.squadron.update(1.0 / 60.0)
+        self.assertEqual(len(self.squadron), 2)
+
+        self.squadron.cooldowns[1] = 2.5
+        first.remove_from_sprite_lists()
+        self.squadron.update(1.0 / 60.0)
+        self.assertEqual(self.squadron.members, [second])
+        self.assertAlmostEqual(self.squadron.cooldowns[0], 2.5 - 1.0 / 60.0)
+
+    def test_destroyed_when_damaged(self):
+        ufo = self.add_ufo(0.0, 0.0)
+        ship = self.simulation.players_list[0]
+        bullet = self.simulation.bullet_pool.fire((ship.center_x, ship.center_y), 0.0, ship)
+        bullet.damage = ufo.hitpoints
+
+        ufo.damage(bullet)
+        self.squadron.update(1.0 / 60.0)
+        self.assertNotIn(ufo, self.play_zone.ufos)
+
+
+class TestBugSwarm(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+        settings = SettingsManager()
+        settings['BUG_SWARM_SIZE'] = 50
+        self.simulation = setup_headless_pvp(settings, seed=1)
+        self.swarm = self.simulation.play_zone.swarm
+
+    def test_spawn(self):
+        self.assertEqual(len(self.swarm), 50)
+        bug = self.swarm.bugs[0]
+        self.assertIsNone(bug.pid_slots)
+        # Swarm bugs don't collide with each other
+        self.assertFalse(bug.shape.filter.categories & bug.shape.filter.mask)
+
+    def test_homing(self):
+        player = self.simulation.players_list[0]
+        def mean_distance():
+            return sum(math.hypot(bug.center_x - player.center_x, bug.center_y - player.center_y)
+                       for bug in self.swarm.bugs) / len(self.swarm)
+
+        before = mean_distance()
+        self.simulation.run(60)
+        self.assertLess(mean_distance(), before)
+        for bug in self.swarm.bugs:
+            self.assertLessEqual(bug.body.velocity.length, SWARM_MAX_SPEED + 1.0)
+
+    def test_separation(self):
+        # Two bugs on top of each other are pushed apart
+        positions = [(100.0, 100.0), (105.0, 100.0)]
+        desired = self.swarm.steering(np.array(positions), np.zeros((2, 2)), np.zeros((0, 2)))
+        self.assertLess(desired[0][0], 0.0)
+        self.assertGreater(desired[1][0], 0.0)
+
+    def test_damaged_bug_explodes(self):
+        bug = self.swarm.bugs[0]
+        bug.hitpoints = 0
+        self.simulation.play_zone.touch(bug)
+        self.simulation.run(1)
+        self.assertNotIn(bug, self.swarm)
+        self.assertEqual(len(self.swarm), 49)
+
+
+class TestBugSteering(unittest.TestCase):
+    def setUp(self):
+        arcade.resources.add_resource_handle("sprites", RESOURCE_DIR)
+        self.simulation = setup_headless_pvp(SettingsManager(), seed=1)
+        self.steering = self.simulation.play_zone.bug_steering
+        self.bug = self.simulation.play_zone.bugs[0]
+
+    def test_bugs_share_a_bank(self):
+        self.assertEqual(len(self.steering), len(self.simulation.play_zone.bugs))
+        self.assertIsNotNone(self.bug.pid_slots)
+
+    def test_matches_scalar_pids(self):
+        x_pid = Pid(BUG_PID_INPUT)
+        y_pid = Pid(BUG_PID_INPUT)
+        for x_dist, y_dist in [(300.0, -50.0), (280.0, -40.0), (250.0, -20.0)]:
+            self.bug.move_towards(None, (x_dist, y_dist), 1.0 / 60.0)
+            self.steering.apply()
+            self.assertAlmostEqual(self.bug.dx, x_pid.update(PID_SETPOINT, x_dist, 1.0))
+            self.assertAlmostEqual(self.bug.dy, y_pid.update(PID_SETPOINT, y_dist, 1.0))
+
+    def test_explode_releases_controllers(self):
+        self.bug.hitpoints = 0
+        self.bug.update(1.0 / 60.0)
+        self.assertIsNone(self.bug.pid_slots)
+        self.assertEqual(len(self.steering), 0)
+        self.simulation.step()
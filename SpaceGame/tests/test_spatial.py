@@ -0,0 +1,63 @@
+import random
+import unittest
+
+import numpy as np
+
+from SpaceGame.shared.spatial import NeighbourGrid, SpatialGrid
+
+
+class TestSpatialGrid(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.points = [(rng.uniform(-500, 4500), rng.uniform(-500, 4500)) for _ in range(300)]
+        self.grid = SpatialGrid(cell_size=256.0)
+        for i, (x, y) in enumerate(self.points):
+            self.grid.insert(i, x, y)
+
+    def brute_force(self, x, y):
+        return sorted(((px - x) ** 2 + (py - y) ** 2, i) for i, (px, py) in enumerate(self.points))
+
+    def test_empty_grid(self):
+        grid = SpatialGrid()
+        self.assertEqual(grid.nearest(0, 0), [])
+        self.assertEqual(grid.query_radius(0, 0, 100), [])
+
+    def test_nearest(self):
+        for x, y in [(0, 0), (2048, 2048), (10000, -3000), (123.4, 3999.0)]:
+            dis, item = self.grid.nearest(x, y)[0]
+            self.assertEqual(item, self.brute_force(x, y)[0][1])
+
+    def test_nearest_k(self):
+        nearest = self.grid.nearest(1000, 1000, k=5)
+        self.assertEqual([item for _, item in nearest],
+                         [item for _, item in self.brute_force(1000, 1000)[:5]])
+
+    def test_nearest_exclude(self):
+        x, y = self.points[10]
+        dis, item = self.grid.nearest(x, y, exclude=10)[0]
+        self.assertNotEqual(item, 10)
+
+    def test_query_radius(self):
+        found = sorted(self.grid.query_radius(2000, 2000, 600))
+        expected = sorted(i for dis, i in self.brute_force(2000, 2000) if dis <= 600 ** 2)
+        self.assertEqual(found, expected)
+
+
+class TestNeighbourGrid(unittest.TestCase):
+    def test_pairs(self):
+        rng = np.random.default_rng(7)
+        positions = rng.uniform(-300.0, 300.0, (300, 2))
+        i, j, offsets, distances = NeighbourGrid(50.0).pairs(positions)
+
+        squared = ((positions[:, None, :] - positions[None, :, :]) ** 2).sum(axis=2)
+        expected = {(a, b) for a in range(len(positions)) for b in range(len(positions))
+                    if a != b and squared[a, b] < 50.0 ** 2}
+        self.assertEqual(set(zip(i.tolist(), j.tolist())), expected)
+        self.assertEqual(len(i), len(expected))
+        np.testing.assert_allclose(offsets, positions[j] - positions[i])
+        np.testing.assert_allclose(distances, squared[i, j])
+
+    def test_too_few_points(self):
+        i, j, offsets, distances = NeighbourGrid(50.0).pairs(np.zeros((1, 2)))
+        self.assertEqual(len(i), 0)
+        self.assertEqual(offsets.shape, (0, 2))
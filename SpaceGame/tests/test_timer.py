@@ -1,6 +1,6 @@
 import unittest
 
-from SpaceGame.shared.timer import TimerManager
+from SpaceGame.shared.timer import Scheduler, TimerManager
 
 
 class TestTimer(unittest.TestCase):
@@ -121,3 +121,96 @@ class TestTimer(unittest.TestCase):
         self.assertTrue("elapse_timer_2" in elapsed_timers)
         self.assertTrue("elapse_timer_3" not in elapsed_timers)
 
+
+    def test_restart_timer(self):
+        timers = TimerManager()
+        timers.add("restart_timer", 5, restart=True)
+
+        timers.update_timers(5)
+        self.assertTrue(timers.is_elapsed("restart_timer"))
+        self.assertEqual(timers.get("restart_timer"), 5)
+
+        timers.update_timers(5)
+        self.assertTrue("restart_timer" in timers.get_elapsed())
+
+    def test_shared_scheduler(self):
+        scheduler = Scheduler()
+        one = TimerManager(scheduler)
+        two = TimerManager(scheduler)
+        one.add("timer", 5)
+        two.add("timer", 10)
+
+        scheduler.advance(5)
+        self.assertTrue("timer" in one.get_elapsed())
+        self.assertTrue("timer" not in two.get_elapsed())
+
+    def test_shared_scheduler_not_advanced(self):
+        scheduler = Scheduler()
+        one = TimerManager(scheduler)
+        two = TimerManager(scheduler)
+        two.add("timer", 5)
+
+        one.update_timers(10)
+        self.assertEqual(scheduler.time, 0.0)
+        self.assertTrue("timer" not in two.get_elapsed())
+
+
+class TestScheduler(unittest.TestCase):
+    def test_one_shot(self):
+        scheduler = Scheduler()
+        fired = []
+        scheduler.schedule(2, lambda: fired.append(scheduler.time))
+
+        scheduler.advance(1)
+        self.assertEqual(fired, [])
+        scheduler.advance(1)
+        scheduler.advance(5)
+        self.assertEqual(fired, [2])
+
+    def test_repeating(self):
+        scheduler = Scheduler()
+        fired = []
+        scheduler.schedule(1, lambda: fired.append(1), repeat=True)
+
+        scheduler.advance(3.5)
+        self.assertEqual(len(fired), 3)
+        self.assertEqual(len(scheduler), 1)
+
+    def test_fire_order(self):
+        scheduler = Scheduler()
+        fired = []
+        for delay in [3, 1, 2]:
+            scheduler.schedule(delay, lambda delay=delay: fired.append(delay))
+
+        scheduler.advance(3)
+        self.assertEqual(fired, [1, 2, 3])
+
+    def test_cancel(self):
+        scheduler = Scheduler()
+        fired = []
+        timer = scheduler.schedule(1, lambda: fired.append(1), repeat=True)
+
+        scheduler.advance(1)
+        scheduler.cancel(timer)
+        scheduler.advance(5)
+        self.assertEqual(fired, [1])
+        self.assertEqual(len(scheduler), 0)
+
+    def test_pause_resume(self):
+        scheduler = Scheduler()
+        fired = []
+        timer = scheduler.schedule(2, lambda: fired.append(scheduler.time))
+
+        scheduler.advance(1)
+        scheduler.pause(timer)
+        scheduler.advance(10)
+        self.assertEqual(fired, [])
+        self.assertEqual(scheduler.time_left(timer), 1)
+
+        scheduler.resume(timer)
+        scheduler.advance(1)
+        self.assertEqual(fired, [12])
+
+    def test_repeat_needs_interval(self):
+        with self.assertRaises(ValueError):
+            Scheduler().schedule(0, lambda: None, repeat=True)
@@ -0,0 +1,52 @@
+import os
+import time
+from pathlib import Path
+
+import arcade
+
+from SpaceGame.gamemodes.simulation import setup_headless_pvp
+from SpaceGame.settings import SettingsManager
+
+import argparse
+
+
+def add_resource_handlers():
+    resource_dir = os.path.join(Path(__file__).parent.resolve(), "resources")
+    arcade.resources.add_resource_handle("sprites", resource_dir)
+
+
+def benchmark(sizes, ticks):
+    """Print the milliseconds per tick of the swarm update and of a whole simulation step."""
+    for size in sizes:
+        settings = SettingsManager()
+        settings['BUG_SWARM_SIZE'] = size
+        simulation = setup_headless_pvp(settings, seed=1)
+        swarm = simulation.play_zone.swarm
+        delta_time = simulation.tick_delta_time
+
+        start = time.perf_counter()
+        for _ in range(ticks):
+            swarm.update(delta_time)
+        swarm_time = (time.perf_counter() - start) / ticks
+
+        start = time.perf_counter()
+        simulation.run(ticks, delta_time)
+        step_time = (time.perf_counter() - start) / ticks
+
+        print(f"{size:>5} bugs: swarm update {swarm_time * 1000.0:.2f} ms/tick, "
+              f"simulation step {step_time * 1000.0:.2f} ms/tick")
+
+
+if __name__ == "__main__":
+    argparse = argparse.ArgumentParser(description="Bug swarm benchmark")
+    argparse.add_argument('sizes',
+                          help="Swarm sizes to time, default: 100 1000 5000",
+                          type=int, nargs='*', default=[100, 1000, 5000])
+    argparse.add_argument('--ticks',
+                          help="Ticks to time each size over, default: 60",
+                          type=int, default=60)
+
+    args = argparse.parse_args()
+
+    add_resource_handlers()
+    benchmark(args.sizes, args.ticks)